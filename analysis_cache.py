@@ -0,0 +1,154 @@
+import os
+import time
+import json
+import sqlite3
+import hashlib
+import threading
+from config import get_setting, get_int_setting, get_float_setting, get_flag
+
+# 캐시 설정 (환경 변수로 변경 가능, 사용할 때 읽음)
+# - ANALYSIS_CACHE_PATH: 캐시 파일 경로
+# - ANALYSIS_CACHE_MAX_BYTES: 캐시 전체 최대 크기 (기본값 50MB)
+# - ANALYSIS_CACHE_MAX_AGE_DAYS: 항목 보관 기간 (기본값 30일)
+# - ANALYSIS_CACHE_DISABLED: 1로 설정하면 캐시를 사용하지 않음
+def get_cache_path():
+    """분석 캐시 파일 경로를 반환합니다."""
+    return get_setting("ANALYSIS_CACHE_PATH", os.path.join(".cache", "analysis_cache.sqlite3"))
+
+def make_cache_key(prompt, model):
+    """
+    모델 이름과 프롬프트(프롬프트 템플릿 + 회의록 텍스트)로 캐시 키를 만듭니다.
+    템플릿이나 모델이 바뀌면 키도 달라지므로 이전 분석 결과가 재사용되지 않습니다.
+    """
+    digest = hashlib.sha256()
+    digest.update(model.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+class AnalysisCache:
+    """
+    Claude 분석 결과를 SQLite 파일에 저장하는 내용 주소 기반 캐시입니다.
+    전체 크기(max_bytes)와 보관 기간(max_age)을 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다.
+    """
+
+    def __init__(self, path=None, max_bytes=None, max_age=None):
+        path = path or get_cache_path()
+        if max_bytes is None:
+            max_bytes = get_int_setting("ANALYSIS_CACHE_MAX_BYTES", 50 * 1024 * 1024)
+        if max_age is None:
+            max_age = get_float_setting("ANALYSIS_CACHE_MAX_AGE_DAYS", 30) * 24 * 60 * 60
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analyses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_accessed ON analyses (accessed_at)")
+
+    def _connect(self):
+        # 스레드마다 별도 연결을 사용하므로 배치 작업자에서도 안전합니다.
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key):
+        """캐시된 분석 결과 문자열을 반환합니다. 없거나 만료되었으면 None을 반환합니다."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT result, created_at FROM analyses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+
+            result, created_at = row
+            if self.max_age and now - created_at > self.max_age:
+                conn.execute("DELETE FROM analyses WHERE key = ?", (key,))
+                return None
+
+            conn.execute("UPDATE analyses SET accessed_at = ? WHERE key = ?", (now, key))
+            return result
+
+    def set(self, key, model, result):
+        """분석 결과를 저장하고 필요하면 오래된 항목을 정리합니다."""
+        now = time.time()
+        size = len(result.encode("utf-8"))
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO analyses (key, model, result, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, result, size, now, now),
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        """보관 기간이 지난 항목을 지우고, 크기 제한을 넘으면 LRU 순서로 삭제합니다."""
+        if self.max_age:
+            conn.execute("DELETE FROM analyses WHERE created_at < ?", (now - self.max_age,))
+
+        if not self.max_bytes:
+            return
+
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM analyses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for key, size in conn.execute("SELECT key, size FROM analyses ORDER BY accessed_at ASC").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM analyses WHERE key = ?", (key,))
+            total -= size
+
+    def clear(self):
+        """캐시를 모두 비웁니다."""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM analyses")
+
+    def stats(self):
+        """저장된 항목 수와 전체 크기를 반환합니다."""
+        with self._connect() as conn:
+            count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM analyses").fetchone()
+        return {"entries": count, "bytes": total}
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_default_cache():
+    """
+    기본 설정의 캐시 인스턴스를 반환합니다.
+    캐시가 비활성화되었거나 파일을 열 수 없으면 None을 반환합니다.
+    """
+    global _default_cache
+    if get_flag("ANALYSIS_CACHE_DISABLED"):
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            try:
+                _default_cache = AnalysisCache()
+            except (sqlite3.Error, OSError) as e:
+                print(f"분석 캐시를 열 수 없어 캐시 없이 진행합니다: {e}")
+                return None
+        return _default_cache
+
+def is_cacheable_result(result):
+    """JSON으로 파싱되는 응답만 캐시하여, 잘못된 응답이 재시도 때 재사용되지 않게 합니다."""
+    try:
+        json.loads(result)
+        return True
+    except (TypeError, ValueError):
+        return False
@@ -0,0 +1,272 @@
+import re
+import json
+import threading
+from partial_json import parse_partial_json
+
+# 값이 없을 때 Claude가 돌려주는 빈 문자열 (프롬프트의 약속)
+EMPTY = {"const": ""}
+TEXT = {"type": "string"}
+TEXT_LIST = {"type": "array", "items": TEXT}
+
+def _or_empty(schema):
+    return {"anyOf": [schema, EMPTY]}
+
+def _text_object(*keys):
+    return {"type": "object", "properties": {key: TEXT for key in keys}}
+
+# Claude 분석 결과(claude_analyzer.ANALYSIS_FIELDS) JSON 스키마
+# 값이 없는 항목은 빈 문자열("")을 허용하고, 정의하지 않은 추가 항목(회의 제목 등)은 그대로 둠
+ANALYSIS_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "required": [
+        "회의 리드", "참석자", "일자", "진행 단계", "아젠다 사전 공유", "회의 목적",
+        "회의 아젠다", "주요 논의 내용", "주요 결정 사항", "후속 액션", "회의 피드백", "다음 회의 일정",
+    ],
+    "properties": {
+        "회의 제목": TEXT,
+        "회의 리드": TEXT,
+        "참석자": {"anyOf": [TEXT, TEXT_LIST]},
+        "일자": {"type": "string", "pattern": r"^(\d{4}-\d{2}-\d{2}.*)?$"},
+        "진행 단계": {"enum": ["시작 전", "시작 후", ""]},
+        "아젠다 사전 공유": _or_empty(TEXT_LIST),
+        "회의 목적": TEXT,
+        "회의 아젠다": _or_empty({
+            "type": "array",
+            "items": dict(_text_object("항목 제목", "소요시간", "관련 자료"), required=["항목 제목"]),
+        }),
+        "주요 논의 내용": _or_empty({
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["아젠다 제목"],
+                "properties": {"아젠다 제목": TEXT, "논의 내용": {"anyOf": [TEXT, TEXT_LIST]}},
+            },
+        }),
+        "주요 결정 사항": _or_empty({"type": "array", "items": {"anyOf": [TEXT, _text_object("제목", "세부 내용")]}}),
+        "후속 액션": _or_empty({"type": "array", "items": {"anyOf": [TEXT, {"type": "object"}]}}),
+        "회의 피드백": _or_empty(_text_object("좋았던 점", "개선할 점", "다음 회의 제안 사항")),
+        "다음 회의 일정": _or_empty(_text_object("일시", "장소", "주요 아젠다")),
+    },
+}
+
+# 응답을 감싼 마크다운 코드 펜스 (```json ... ```)
+CODE_FENCE = re.compile(r"```[\w-]*\s*\n?(.*?)(?:```|$)", re.DOTALL)
+
+# 문자열 밖에 나온 파이썬 리터럴
+PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+IDENTIFIER = re.compile(r"[A-Za-z_]\w*")
+
+# 문자열 안에 그대로 들어가면 안 되는 제어 문자
+CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+_validator = None
+_validator_lock = threading.Lock()
+
+def get_validator():
+    """
+    ANALYSIS_SCHEMA로 컴파일한 jsonschema 검증기를 반환합니다.
+    처음 호출할 때 한 번만 만들고 이후에는 재사용합니다 (jsonschema도 이때 불러옴).
+    """
+    global _validator
+    if _validator is None:
+        with _validator_lock:
+            if _validator is None:
+                from jsonschema import Draft7Validator
+                Draft7Validator.check_schema(ANALYSIS_SCHEMA)
+                _validator = Draft7Validator(ANALYSIS_SCHEMA)
+    return _validator
+
+def strip_code_fences(text):
+    """응답이 코드 펜스로 감싸져 있으면 JSON이 들어 있는 펜스 안쪽만 반환합니다."""
+    for match in CODE_FENCE.finditer(text):
+        if "{" in match.group(1):
+            return match.group(1)
+    return text
+
+def _next_significant(text, start):
+    for char in text[start:]:
+        if not char.isspace():
+            return char
+    return ""
+
+def repair_json(text):
+    """
+    모델이 자주 만드는 JSON 오류를 고친 텍스트를 반환합니다.
+    - 문자열 안의 줄바꿈·탭 같은 제어 문자와 닫히지 않은 것처럼 보이는 따옴표 이스케이프
+    - 닫는 괄호 앞의 쉼표, // 및 /* */ 주석, True/False/None 제거·변환
+    - 값 사이에 빠진 쉼표 추가
+    잘린 괄호는 닫지 않습니다 (parse_json_response에서 partial_json으로 처리).
+    """
+    out = []
+    in_string = False
+    i = 0
+    length = len(text)
+
+    while i < length:
+        char = text[i]
+
+        if in_string:
+            if char == "\\" and i + 1 < length:
+                out.append(text[i:i + 2])
+                i += 2
+                continue
+            if char == '"':
+                # 뒤에 구분자가 오지 않는 따옴표는 값 안의 따옴표로 보고 이스케이프
+                if _next_significant(text, i + 1) in (",", ":", "}", "]", ""):
+                    in_string = False
+                    out.append(char)
+                else:
+                    out.append('\\"')
+            elif char in CONTROL_ESCAPES:
+                out.append(CONTROL_ESCAPES[char])
+            elif ord(char) < 0x20:
+                out.append(f"\\u{ord(char):04x}")
+            else:
+                out.append(char)
+            i += 1
+            continue
+
+        if text.startswith("//", i):
+            end = text.find("\n", i)
+            i = length if end == -1 else end
+            continue
+        if text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = length if end == -1 else end + 2
+            continue
+
+        if char in "}]":
+            # 닫는 괄호 앞의 쉼표 제거
+            while out and (out[-1].isspace() or out[-1] == ","):
+                removed = out.pop()
+                if removed == ",":
+                    break
+        elif char in '"{[':
+            # 값과 값 사이에 빠진 쉼표 추가 ("a" "b", } {, ] [)
+            previous = next((piece for piece in reversed(out) if not piece.isspace()), "")
+            if previous[-1:] in ('"', "}", "]"):
+                out.append(",")
+            if char == '"':
+                in_string = True
+        else:
+            match = IDENTIFIER.match(text, i)
+            if match:
+                word = match.group(0)
+                out.append(PYTHON_LITERALS.get(word, word))
+                i = match.end()
+                continue
+
+        out.append(char)
+        i += 1
+
+    return "".join(out)
+
+def _decode_object(text):
+    start = text.find("{")
+    if start == -1:
+        return None
+    try:
+        # 뒤에 붙은 설명 문구는 raw_decode로 무시
+        value, _ = json.JSONDecoder().raw_decode(text[start:])
+        return value
+    except json.JSONDecodeError:
+        return None
+
+def _parse(text):
+    # (객체, 잘린 응답을 괄호를 닫아 파싱했는지 여부)
+    if not text:
+        return None, False
+    if isinstance(text, dict):
+        return text, False
+
+    text = strip_code_fences(text)
+    value = _decode_object(text)
+    truncated = False
+    if value is None:
+        start = text.find("{")
+        if start == -1:
+            return None, False
+        repaired = repair_json(text[start:])
+        value = _decode_object(repaired)
+        if value is None:
+            value = parse_partial_json(repaired)
+            truncated = True
+    return (value, truncated) if isinstance(value, dict) else (None, False)
+
+def parse_json_response(text):
+    """
+    Claude 응답 문자열에서 JSON 객체를 꺼냅니다.
+    코드 펜스와 앞뒤 설명 문구를 걷어내고, 흔한 문법 오류를 고치고, 잘린 응답은 괄호를 닫아 가능한 만큼 파싱합니다.
+    API를 다시 호출하지 않고 로컬에서만 처리하며, 객체를 얻지 못하면 None을 반환합니다.
+    """
+    return _parse(text)[0]
+
+def invalid_fields(meeting_data):
+    """스키마 검증에서 빠졌거나 형식이 잘못된 최상위 항목 이름 목록을 반환합니다 (스키마 순서)."""
+    fields = set()
+    for error in get_validator().iter_errors(meeting_data):
+        if error.validator == "required" and not error.path:
+            fields.update(key for key in error.validator_value if key not in error.instance)
+        elif error.path:
+            fields.add(error.path[0])
+    order = list(ANALYSIS_SCHEMA["properties"])
+    return sorted(fields, key=lambda field: order.index(field) if field in order else len(order))
+
+def extract_analysis(text):
+    """
+    응답 문자열을 파싱·검증하여 (회의록 딕셔너리, 다시 요청할 항목 목록)을 반환합니다.
+    형식이 잘못된 항목은 딕셔너리에서 제거하며, JSON 객체를 전혀 얻지 못하면 딕셔너리는 None이고 모든 필수 항목을 반환합니다.
+    """
+    meeting_data, truncated = _parse(text)
+    if meeting_data is None:
+        return None, list(ANALYSIS_SCHEMA["required"])
+
+    fields = invalid_fields(meeting_data)
+    if truncated and meeting_data:
+        # 잘린 응답의 마지막 항목은 형식이 맞아도 내용이 덜 왔을 수 있으므로 다시 요청
+        last = list(meeting_data)[-1]
+        if last not in fields:
+            fields.append(last)
+    for field in fields:
+        meeting_data.pop(field, None)
+    return meeting_data, fields
+
+def validate_analysis(text):
+    """
+    완성된 분석 결과(문자열 또는 딕셔너리)를 노션에 쓰기 전에 스키마로 엄격하게 검증합니다.
+    CLI, 배치 백필, 작업 큐가 같은 기준을 쓰도록 형식이 잘못된 항목이 하나라도 있으면 실패로 처리합니다.
+
+    Returns:
+        tuple: (회의록 딕셔너리, 실패 사유, 오류 설명) - 통과하면 실패 사유와 오류 설명은 None이고,
+            실패하면 회의록 딕셔너리가 None이며 실패 사유는 "분석 결과 JSON 파싱 실패" 또는 "분석 결과 스키마 검증 실패"
+    """
+    meeting_data, fields = extract_analysis(text)
+    if meeting_data is None:
+        return None, "분석 결과 JSON 파싱 실패", "분석 결과를 JSON으로 파싱하지 못했습니다."
+    if fields:
+        return None, "분석 결과 스키마 검증 실패", f"분석 결과가 스키마와 맞지 않습니다: {', '.join(fields)}"
+    return meeting_data, None, None
+
+def merge_fields(meeting_data, patch, fields, fill_empty=True):
+    """
+    다시 요청한 항목(patch)을 회의록 딕셔너리에 합칩니다.
+    그래도 빠지거나 잘못된 항목은 빈 문자열로 채우고 그 목록을 반환합니다.
+    fill_empty가 False이면 해당 항목을 채우지 않고 빼 두어 다시 요청할 수 있게 합니다.
+
+    Returns:
+        tuple: (회의록 딕셔너리, 빈 값으로 채운(또는 아직 얻지 못한) 항목 목록)
+    """
+    meeting_data = dict(meeting_data or {})
+    patch = parse_json_response(patch) or {}
+    for field in fields:
+        if field in patch:
+            meeting_data[field] = patch[field]
+
+    unresolved = invalid_fields(meeting_data)
+    for field in unresolved:
+        if fill_empty:
+            meeting_data[field] = ""
+        else:
+            meeting_data.pop(field, None)
+    return meeting_data, unresolved
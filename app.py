@@ -1,14 +1,13 @@
 import streamlit as st
-import json
 import os
 
-# 전역 변수 초기화
-ANTHROPIC_AVAILABLE = False
-NOTION_AVAILABLE = False
-
 # 세션 상태 초기화
 if "analyzed_data" not in st.session_state:
     st.session_state.analyzed_data = None
+if "job_id" not in st.session_state:
+    st.session_state.job_id = None
+if "finished_job" not in st.session_state:
+    st.session_state.finished_job = None
 
 # 페이지 설정 및 타이틀
 st.set_page_config(
@@ -21,26 +20,119 @@ st.set_page_config(
 st.title("📝 클로바 노트 → 노션 회의록 변환기")
 st.markdown("클로바 노트의 회의록 텍스트를 노션 회의록 템플릿에 자동으로 등록하는 서비스입니다.")
 
-# 모듈 가져오기 시도 (오류 처리 추가)
-try:
-    from claude_analyzer import analyze_meeting_notes_with_claude
-    ANTHROPIC_AVAILABLE = True
-except Exception as e:
-    st.error(f"Claude 모듈 로딩 중 오류 발생: {e}")
-    st.info("API 키 설정을 확인하거나 관리자에게 문의하세요.")
-
-try:
-    from notion_connector import add_meeting_notes_to_notion
-    NOTION_AVAILABLE = True
-except Exception as e:
-    st.error(f"Notion 모듈 로딩 중 오류 발생: {e}")
-    st.info("API 키 설정을 확인하거나 관리자에게 문의하세요.")
-
-# 환경 변수 확인
-api_status = {}
-for key in ["ANTHROPIC_API_KEY", "NOTION_API_KEY", "NOTION_DATABASE_ID"]:
-    # 보안을 위해 키 값 자체는 표시하지 않음
-    api_status[key] = "설정됨" if os.environ.get(key) else "설정되지 않음"
+# 서비스 구성 요소 로딩 (프로세스당 한 번만 실행되고 이후 재실행에서는 캐시 사용)
+@st.cache_resource(show_spinner=False)
+def load_services():
+    """
+    모듈 로딩, API 키 확인, 작업자 풀 시작을 수행하고 상태를 반환합니다.
+    위젯 조작으로 스크립트가 다시 실행될 때마다 반복하지 않도록 캐시합니다.
+    """
+    services = {"anthropic": False, "notion": False, "queue": False, "messages": [], "api_status": {}}
+    
+    # 모듈 수준 설정(요청 예산, 캐시 경로 등)도 .env 값을 쓰도록 모듈을 불러오기 전에 로드
+    from config import load_environment
+    load_environment()
+    
+    # 모듈 가져오기 시도 (오류 처리 추가)
+    try:
+        import claude_analyzer
+        from client_registry import has_credential
+        services["anthropic"] = has_credential("anthropic")
+        if not services["anthropic"]:
+            services["messages"].append(("error", "Anthropic API 키가 설정되지 않았습니다."))
+            services["messages"].append(("info", "환경 변수 ANTHROPIC_API_KEY를 설정하거나 관리자에게 문의하세요."))
+    except Exception as e:
+        services["messages"].append(("error", f"Claude 모듈 로딩 중 오류 발생: {e}"))
+        services["messages"].append(("info", "API 키 설정을 확인하거나 관리자에게 문의하세요."))
+    
+    try:
+        import notion_connector
+        services["notion"] = True
+    except Exception as e:
+        services["messages"].append(("error", f"Notion 모듈 로딩 중 오류 발생: {e}"))
+        services["messages"].append(("info", "API 키 설정을 확인하거나 관리자에게 문의하세요."))
+    
+    # 작업 큐: 분석·노션 등록·슬랙 알림은 작업자 풀이 처리하고 화면은 상태만 조회
+    try:
+        from job_queue import ensure_worker_pool
+        if os.environ.get("JOB_WORKERS_IN_APP", "1") != "0":
+            # 별도 프로세스(python job_queue.py)에서 작업자를 실행하는 경우 0으로 설정
+            ensure_worker_pool()
+        services["queue"] = True
+    except Exception as e:
+        services["messages"].append(("error", f"작업 큐 초기화 중 오류 발생: {e}"))
+    
+    # TRACE_METRICS_PORT가 설정되어 있으면 Prometheus 지표 서버 시작
+    from tracing import ensure_metrics_server
+    ensure_metrics_server()
+    
+    # 환경 변수 확인 (.env 파일 포함)
+    from config import get_setting
+    for key in ["ANTHROPIC_API_KEY", "NOTION_API_KEY", "NOTION_DATABASE_ID"]:
+        # 보안을 위해 키 값 자체는 표시하지 않음
+        services["api_status"][key] = "설정됨" if get_setting(key) else "설정되지 않음"
+    
+    return services
+
+services = load_services()
+for level, message in services["messages"]:
+    getattr(st, level)(message)
+
+ANTHROPIC_AVAILABLE = services["anthropic"]
+NOTION_AVAILABLE = services["notion"]
+QUEUE_AVAILABLE = services["queue"]
+api_status = services["api_status"]
+
+if ANTHROPIC_AVAILABLE and NOTION_AVAILABLE and QUEUE_AVAILABLE:
+    # load_services에서 이미 불러온 모듈이므로 재실행 시 비용 없음
+    from partial_json import parse_partial_json
+    from notion_connector import get_database_id
+    from page_index import lookup_meeting
+    from job_queue import submit_job, get_job, STAGE_LABELS, FINISHED_STATUSES, STATUS_SUCCEEDED
+    from tracing import span
+
+# 이미 처리한 회의록의 분석 결과 조회 (세션 간 공유)
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def load_processed_meeting(meeting_text):
+    """
+    같은 회의록의 노션 페이지 ID와 분석 결과를 반환합니다 (분석 결과가 기록되지 않았으면 analysis는 None).
+    아직 처리되지 않은 회의록은 LookupError를 발생시켜 결과가 캐시되지 않게 합니다.
+    작업이 끝나면 캐시를 비우므로 다시 분석한 회의록도 새 결과를 반환합니다.
+    """
+    _, _, existing = lookup_meeting(meeting_text, get_database_id())
+    if not existing or not existing["page_id"]:
+        raise LookupError("처리되지 않은 회의록")
+    return {"page_id": existing["page_id"], "analysis": existing["analysis"]}
+
+# 최근 처리 기록 요약 (작업자가 같은 프로세스면 메모리에서, 별도 프로세스면 추적 파일에서 읽음)
+@st.cache_data(ttl=5, show_spinner=False)
+def load_trace_summary():
+    from tracing import get_tracer, read_spans, summarize_spans
+    return summarize_spans(get_tracer().recent() or read_spans())
+
+def render_trace_summary():
+    """단계별 처리 시간(p50/p95)과 토큰 사용량을 표시합니다."""
+    from tracing import SPAN_LABELS
+    summary = load_trace_summary()
+    if not summary:
+        st.markdown("아직 처리 기록이 없습니다.")
+        return
+    
+    lines = []
+    for name, label in SPAN_LABELS.items():
+        stats = summary.get(name)
+        if not stats:
+            continue
+        line = f"- {label}: {stats['count']}회, p50 {stats['p50_ms'] / 1000:.1f}초 / p95 {stats['p95_ms'] / 1000:.1f}초"
+        if stats["errors"]:
+            line += f" (실패 {stats['errors']}회)"
+        lines.append(line)
+    input_tokens = sum(stats["input_tokens"] for stats in summary.values())
+    output_tokens = sum(stats["output_tokens"] for stats in summary.values())
+    retries = sum(stats["retries"] for stats in summary.values())
+    lines.append(f"- 토큰: 입력 {input_tokens:,} / 출력 {output_tokens:,}")
+    lines.append(f"- API 재시도: {retries}회")
+    st.markdown("\n".join(lines))
 
 # 사이드바 정보
 with st.sidebar:
@@ -78,9 +170,118 @@ with st.sidebar:
         - NOTION_DATABASE_ID: {api_status['NOTION_DATABASE_ID']}
         """
     )
+    
+    # 처리 시간·토큰 사용량 (최근 처리 기록 기준)
+    with st.expander("처리 시간 · 토큰 사용량", expanded=False):
+        render_trace_summary()
+
+# 진행 중인 작업 상태를 다시 조회하는 간격 (초)
+JOB_POLL_INTERVAL = 0.5
 
 # 기능 사용 가능 여부 확인
-service_available = ANTHROPIC_AVAILABLE and NOTION_AVAILABLE
+service_available = ANTHROPIC_AVAILABLE and NOTION_AVAILABLE and QUEUE_AVAILABLE
+
+# 분석 결과 렌더링 (스트리밍 중간 결과와 최종 결과에 공통 사용)
+def render_analysis(analyzed_data):
+    """분석 결과 딕셔너리를 현재 컨테이너에 표시합니다. 아직 도착하지 않은 필드는 '정보 없음'으로 표시합니다."""
+    # 일반 정보 표시
+    st.subheader("기본 정보")
+    st.markdown(f"**회의 제목:** {analyzed_data.get('회의 제목', '정보 없음')}")
+    st.markdown(f"**일시:** {analyzed_data.get('일자', '정보 없음')}")
+    st.markdown(f"**진행자:** {analyzed_data.get('회의 리드', '정보 없음')}")
+    st.markdown(f"**참석자:** {analyzed_data.get('참석자', '정보 없음')}")
+    
+    # 아젠다 정보 표시
+    st.subheader("회의 아젠다")
+    agenda_items = analyzed_data.get("회의 아젠다", [])
+    if agenda_items:
+        for i, item in enumerate(agenda_items):
+            if isinstance(item, dict):
+                st.markdown(f"**{i+1}. {item.get('항목 제목', '')}**")
+                if item.get('소요시간'):
+                    st.markdown(f"소요시간: {item['소요시간']}")
+            else:
+                st.markdown(f"**{i+1}. {item}**")
+    else:
+        st.markdown("아젠다 정보 없음")
+    
+    # 결정 사항 표시
+    st.subheader("주요 결정 사항")
+    decisions = analyzed_data.get("주요 결정 사항", [])
+    if decisions:
+        for i, decision in enumerate(decisions):
+            if isinstance(decision, dict) and "제목" in decision:
+                st.markdown(f"**{i+1}. {decision['제목']}**")
+                if decision.get("세부 내용"):
+                    st.markdown(f"   {decision['세부 내용']}")
+            else:
+                st.markdown(f"**{i+1}. {decision}**")
+    else:
+        st.markdown("결정 사항 정보 없음")
+    
+    # 액션 아이템 표시
+    st.subheader("후속 액션")
+    actions = analyzed_data.get("후속 액션", [])
+    if actions:
+        for i, action in enumerate(actions):
+            st.markdown(f"**{i+1}.** {action}")
+    else:
+        st.markdown("후속 액션 정보 없음")
+
+# 분석 결과 패널 (프래그먼트: 이 부분만 다시 실행되며, 작업 진행 중에는 주기적으로 갱신)
+@st.fragment(run_every=JOB_POLL_INTERVAL if st.session_state.job_id else None)
+def render_result_panel():
+    """
+    분석 결과 패널을 표시합니다. 작업이 진행 중이면 진행 단계와 스트리밍 중간 결과를 보여주고,
+    작업이 끝나면 결과를 세션 상태에 저장한 뒤 전체 화면을 한 번 다시 그립니다.
+    """
+    if not st.session_state.job_id:
+        finished_job = st.session_state.get("finished_job")
+        if not st.session_state.get("analyzed_data"):
+            if finished_job and finished_job["status"] == STATUS_SUCCEEDED:
+                # 노션 페이지는 있지만 분석 결과가 기록되지 않은 회의록
+                st.info("저장된 분석 결과가 없습니다. 다시 분석하려면 '기존 노션 페이지 갱신'을 선택하고 등록하세요.")
+            else:
+                # 처음에는 안내 메시지 표시
+                st.info("왼쪽에 회의록 텍스트를 입력하고 분석 버튼을 클릭하면 결과가 여기에 표시됩니다.")
+        else:
+            # 분석 결과가 있으면 표시
+            render_analysis(st.session_state.get("analyzed_data"))
+        return
+    
+    job = get_job(st.session_state.job_id)
+    if job is None or job["status"] in FINISHED_STATUSES:
+        st.session_state.job_id = None
+        st.session_state.finished_job = job
+        # 이전 회의록의 결과가 남지 않도록 분석 결과가 없어도 덮어씀
+        st.session_state.analyzed_data = job["analysis"] if job else None
+        if job and job["status"] == STATUS_SUCCEEDED:
+            # 인덱스가 갱신되었으므로 같은 회의록의 캐시된 이전 결과를 버림
+            load_processed_meeting.clear()
+        st.rerun()
+        return
+    
+    st.info(f"⏳ {STAGE_LABELS.get(job['stage'], job['stage'])}...")
+    partial_data = job["analysis"] or parse_partial_json(job["partial_result"] or "")
+    if isinstance(partial_data, dict):
+        render_analysis(partial_data)
+
+# 완료된 작업 결과 메시지 표시
+def render_finished_job(job):
+    """작업 결과(노션 링크 또는 오류)를 표시합니다."""
+    if job["status"] == STATUS_SUCCEEDED:
+        notion_url = f"https://notion.so/{job['page_id'].replace('-', '')}"
+        st.success("노션에 회의록이 성공적으로 등록되었습니다!")
+        st.markdown(f"[노션에서 회의록 보기]({notion_url})")
+        return
+    
+    st.error(job["error"] or "회의록 처리에 실패했습니다.")
+    if job["raw_response"]:
+        st.text("원본 응답:")
+        st.code(job["raw_response"])
+    elif job["analysis"]:
+        st.info("JSON 분석 결과:")
+        st.json(job["analysis"])
 
 # 메인 컨텐츠 영역
 col1, col2 = st.columns([3, 2])
@@ -108,105 +309,68 @@ with col1:
     if button_disabled:
         st.warning("서비스 구성 요소가 올바르게 로드되지 않아 회의록 분석 기능을 사용할 수 없습니다.")
     
-    if st.button("회의록 분석 및 노션에 등록", type="primary", use_container_width=True, disabled=button_disabled):
+    # 이미 등록된 회의록을 다시 처리할지 여부
+    force_update = st.checkbox("이미 등록된 회의록도 다시 분석하여 기존 노션 페이지 갱신", value=False)
+    
+    job_running = bool(st.session_state.job_id)
+    if st.button("회의록 분석 및 노션에 등록", type="primary", use_container_width=True,
+                 disabled=button_disabled or job_running):
         if not meeting_text.strip():
             st.error("회의록 텍스트를 입력해주세요.")
         else:
-            with st.spinner("회의록 분석 중..."):
-                try:
-                    # 1. Claude로 회의록 분석
-                    analysis_result = analyze_meeting_notes_with_claude(meeting_text)
+            try:
+                with span("app.submit", chars=len(meeting_text), force=force_update) as submit_span:
+                    # 이미 처리한 회의록은 캐시된 결과를 바로 표시 (작업 제출 없음)
+                    processed = None
+                    if not force_update:
+                        try:
+                            processed = load_processed_meeting(meeting_text)
+                        except LookupError:
+                            pass
                     
-                    if not analysis_result:
-                        st.error("회의록 분석에 실패했습니다.")
+                    if processed:
+                        submit_span.set(cached=True)
+                        st.session_state.analyzed_data = processed["analysis"]
+                        st.session_state.finished_job = {
+                            "status": STATUS_SUCCEEDED,
+                            "page_id": processed["page_id"],
+                            "analysis": processed["analysis"],
+                            "error": None,
+                            "raw_response": None,
+                        }
                     else:
-                        try:
-                            # 2. JSON 분석 결과 파싱
-                            meeting_data = json.loads(analysis_result)
-                            st.success("회의록 분석 완료!")
-                            
-                            # 세션 상태에 분석 결과 저장
-                            st.session_state.analyzed_data = meeting_data
-                            
-                            # 3. Notion에 회의록 등록
-                            with st.spinner("노션에 회의록 등록 중..."):
-                                try:
-                                    page_id = add_meeting_notes_to_notion(meeting_data)
-                                    
-                                    if page_id:
-                                        notion_url = f"https://notion.so/{page_id.replace('-', '')}"
-                                        st.success(f"노션에 회의록이 성공적으로 등록되었습니다!")
-                                        st.markdown(f"[노션에서 회의록 보기]({notion_url})")
-                                    else:
-                                        st.error("노션 회의록 등록에 실패했습니다.")
-                                except Exception as e:
-                                    st.error(f"노션 등록 중 오류 발생: {e}")
-                                    st.info("JSON 분석 결과:")
-                                    st.json(meeting_data)
-                                    
-                        except json.JSONDecodeError as e:
-                            st.error(f"분석 결과를 JSON으로 파싱하는 중 오류 발생: {e}")
-                            st.text("원본 응답:")
-                            st.code(analysis_result)
-                except Exception as e:
-                    st.error(f"회의록 분석 중 예상치 못한 오류 발생: {e}")
+                        # 작업을 제출하고 바로 반환 (브라우저를 닫아도 작업은 계속 진행됨)
+                        st.session_state.job_id = submit_job(meeting_text, force=force_update)
+                        submit_span.set(cached=False, job_id=st.session_state.job_id)
+                        st.session_state.finished_job = None
+                        if force_update:
+                            load_processed_meeting.clear()
+                st.rerun()
+            except Exception as e:
+                st.error(f"작업 제출 중 오류 발생: {e}")
+    
+    if st.session_state.finished_job:
+        render_finished_job(st.session_state.finished_job)
 
 with col2:
     st.header("분석 결과")
-    
-    # 처음에는 안내 메시지 표시
-    if not st.session_state.get("analyzed_data"):
-        st.info("왼쪽에 회의록 텍스트를 입력하고 분석 버튼을 클릭하면 결과가 여기에 표시됩니다.")
-    else:
-        # 분석 결과가 있으면 표시
-        analyzed_data = st.session_state.get("analyzed_data")
-        
-        # 일반 정보 표시
-        st.subheader("기본 정보")
-        st.markdown(f"**회의 제목:** {analyzed_data.get('회의 제목', '정보 없음')}")
-        st.markdown(f"**일시:** {analyzed_data.get('일자', '정보 없음')}")
-        st.markdown(f"**진행자:** {analyzed_data.get('회의 리드', '정보 없음')}")
-        st.markdown(f"**참석자:** {analyzed_data.get('참석자', '정보 없음')}")
-        
-        # 아젠다 정보 표시
-        st.subheader("회의 아젠다")
-        agenda_items = analyzed_data.get("회의 아젠다", [])
-        if agenda_items:
-            for i, item in enumerate(agenda_items):
-                if isinstance(item, dict):
-                    st.markdown(f"**{i+1}. {item.get('항목 제목', '')}**")
-                    if item.get('소요시간'):
-                        st.markdown(f"소요시간: {item['소요시간']}")
-                else:
-                    st.markdown(f"**{i+1}. {item}**")
-        else:
-            st.markdown("아젠다 정보 없음")
-        
-        # 결정 사항 표시
-        st.subheader("주요 결정 사항")
-        decisions = analyzed_data.get("주요 결정 사항", [])
-        if decisions:
-            for i, decision in enumerate(decisions):
-                if isinstance(decision, dict) and "제목" in decision:
-                    st.markdown(f"**{i+1}. {decision['제목']}**")
-                    if decision.get("세부 내용"):
-                        st.markdown(f"   {decision['세부 내용']}")
-                else:
-                    st.markdown(f"**{i+1}. {decision}**")
-        else:
-            st.markdown("결정 사항 정보 없음")
-        
-        # 액션 아이템 표시
-        st.subheader("후속 액션")
-        actions = analyzed_data.get("후속 액션", [])
-        if actions:
-            for i, action in enumerate(actions):
-                st.markdown(f"**{i+1}.** {action}")
-        else:
-            st.markdown("후속 액션 정보 없음")
+    render_result_panel()
 
 # 앱 실행 방법 안내 (로컬 실행 시에만 표시)
 if os.environ.get("STREAMLIT_DEPLOYMENT") != "cloud":
     st.markdown("---")
     st.markdown("### 앱 실행 방법")
-    st.code("streamlit run app.py") 
\ No newline at end of file
+    st.code("streamlit run app.py") 
+
+# 화면을 모두 그린 뒤 SDK 로딩과 API 연결을 백그라운드에서 미리 준비 (첫 요청의 지연 감소)
+@st.cache_resource(show_spinner=False)
+def start_client_warm_up():
+    """프로세스당 한 번 클라이언트 예열 스레드를 시작합니다. CLIENT_WARM_UP=0이면 건너뜁니다."""
+    from config import get_setting
+    if get_setting("CLIENT_WARM_UP", "1") == "0":
+        return None
+    from client_registry import warm_up_clients
+    return warm_up_clients()
+
+if ANTHROPIC_AVAILABLE and NOTION_AVAILABLE:
+    start_client_warm_up()
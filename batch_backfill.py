@@ -0,0 +1,357 @@
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import get_setting, get_int_setting, get_float_setting
+from client_registry import get_anthropic_client
+from rate_limiter import call_with_rate_limit
+from claude_analyzer import (
+    build_analysis_prompt,
+    build_request_params,
+    response_analysis,
+    extract_with_rules,
+    finish_extraction,
+    complete_analysis,
+    get_cached_analysis,
+    store_analysis,
+    record_usage,
+)
+from analysis_parser import validate_analysis
+from long_transcript import analysis_units, merge_analysis_results
+from notion_connector import get_database_id, add_meeting_notes_to_notion, update_meeting_notes_in_notion
+from page_index import lookup_meeting
+import slack_notifier
+from tracing import span, mark_error
+
+# 메시지 배치 설정 (환경 변수로 변경 가능, 사용할 때 읽음)
+# - ANTHROPIC_BATCH_SIZE: 배치 하나에 담을 최대 요청 수 (API 제한: 배치당 100,000건·256MB)
+#   배치는 전체가 끝나야 결과를 받을 수 있으므로, 작게 나누면 먼저 끝난 배치부터 노션 등록을 시작함
+# - ANTHROPIC_BATCH_POLL_INTERVAL: 배치 상태 확인 간격(초)
+# - ANTHROPIC_BATCH_STATE_PATH: 제출한 배치 기록 (중단된 백필을 다시 실행하면 새로 제출하지 않고 결과를 이어 받음)
+def get_batch_state_path():
+    """제출한 메시지 배치 기록 파일 경로를 반환합니다."""
+    return get_setting("ANTHROPIC_BATCH_STATE_PATH", os.path.join(".cache", "message_batches.json"))
+
+DEFAULT_WRITER_WORKERS = 4
+
+class BatchState:
+    """
+    제출한 메시지 배치 ID → 배치에 담은 회의록 파일 목록을 JSON 파일에 기록합니다.
+    결과를 모두 처리한 배치는 기록에서 지웁니다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or get_batch_state_path()
+        self._lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"메시지 배치 기록을 읽을 수 없어 무시합니다: {e}")
+            return {}
+
+    def _save(self, batches):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(batches, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+
+    def add(self, batch_id, files):
+        with self._lock:
+            batches = self.load()
+            batches[batch_id] = files
+            self._save(batches)
+
+    def remove(self, batch_id):
+        with self._lock:
+            batches = self.load()
+            if batches.pop(batch_id, None) is not None:
+                self._save(batches)
+
+def _new_result(path):
+    return {"file": path, "status": "failed", "page_id": None, "error": None, "batch_id": None, "timings": {}}
+
+def prepare_item(path, force=False):
+    """
+    회의록 파일을 읽고 처리할 항목을 만듭니다.
+
+    Returns:
+        dict: 분석 단위(units), 캐시에서 찾은 응답(responses), 이전 분석 결과(analysis) 등을 담은 항목.
+              빈 파일이거나 이미 등록된 회의록이면 status가 정해진 보고서 결과만 담김
+    """
+    result = _new_result(path)
+    item = {"file": path, "result": result, "started": time.perf_counter()}
+    with open(path, "r", encoding="utf-8") as f:
+        meeting_text = f.read()
+
+    if not meeting_text.strip():
+        result["status"] = "skipped"
+        result["error"] = "빈 회의록 파일"
+        return item
+
+    index, fingerprint, existing = lookup_meeting(meeting_text, get_database_id())
+    item.update(index=index, fingerprint=fingerprint, existing=existing)
+    if existing and existing["page_id"] and not force:
+        result["status"] = "unchanged"
+        result["page_id"] = existing["page_id"]
+        return item
+    if existing and existing["analysis"] and not force:
+        # 분석은 끝났지만 노션 등록에 실패했던 회의록
+        item["analysis"] = existing["analysis"]
+        return item
+
+    # 분석 단위별로 규칙 기반 추출과 캐시를 확인하고, 둘 다 없는 단위만 배치에 담음
+    # (규칙으로 일부 항목만 찾은 단위는 publish_item에서 나머지 항목만 바로 요청)
+    item["units"] = analysis_units(meeting_text)
+    item["responses"] = [None] * len(item["units"])
+    item["cached"] = set()
+    for i, unit in enumerate(item["units"]):
+        status, extracted = extract_with_rules(unit)
+        cached = finish_extraction(extracted) if status == "complete" else extracted if status == "partial" else None
+        if cached is None and not force:
+            cached = get_cached_analysis(build_analysis_prompt(unit))
+        if cached is not None:
+            item["responses"][i] = cached
+            item["cached"].add(i)
+    item["pending"] = [i for i in range(len(item["units"])) if i not in item["cached"]]
+    return item
+
+def _custom_id(item, unit_index):
+    # 지문 기반이라 다시 실행해도 같은 ID가 되어, 이전 실행의 배치 결과를 같은 회의록에 연결할 수 있음
+    return f"{item['fingerprint'][:40]}-{unit_index}"
+
+def build_batch_requests(item):
+    """항목에서 아직 분석하지 않은 단위들의 메시지 배치 요청 목록을 만듭니다."""
+    return [
+        {
+            "custom_id": _custom_id(item, i),
+            "params": build_request_params(build_analysis_prompt(item["units"][i])),
+        }
+        for i in item["pending"]
+    ]
+
+def group_batches(items, size=None):
+    """한 회의록의 분석 단위가 여러 배치로 나뉘지 않도록 항목을 요청 size개 이하의 묶음으로 나눕니다."""
+    size = size or get_int_setting("ANTHROPIC_BATCH_SIZE", 100)
+    groups = []
+    current = []
+    count = 0
+    for item in items:
+        requests = len(item["pending"])
+        if current and count + requests > size:
+            groups.append(current)
+            current = []
+            count = 0
+        current.append(item)
+        count += requests
+    if current:
+        groups.append(current)
+    return groups
+
+def submit_batch(client, items):
+    """항목들의 분석 요청을 메시지 배치 하나로 제출하고 배치 ID를 반환합니다."""
+    requests = [request for item in items for request in build_batch_requests(item)]
+    with span("batch", requests=len(requests)):
+        batch = call_with_rate_limit("anthropic", client.messages.batches.create, requests=requests, idempotent=False)
+    print(f"메시지 배치 제출: {batch.id} (회의록 {len(items)}건, 요청 {len(requests)}건)")
+    return batch.id
+
+def collect_batch_results(client, batch_id, items_by_key, on_complete):
+    """
+    끝난 배치의 결과를 읽어 항목별 응답을 채우고, 모든 단위의 응답이 모인 항목을 on_complete로 넘깁니다.
+    결과는 요청 순서와 다를 수 있으므로 custom_id로 항목을 찾습니다.
+    """
+    with span("batch", batch_id=batch_id) as batch_span:
+        entries = call_with_rate_limit("anthropic", client.messages.batches.results, batch_id)
+        for entry in entries:
+            key, _, unit_index = entry.custom_id.rpartition("-")
+            item = items_by_key.get(key)
+            if item is None or not unit_index.isdigit() or int(unit_index) not in item.get("pending", []):
+                # 이번 실행에서 처리하지 않는 회의록 (이미 등록되었거나 캐시로 처리됨)
+                continue
+            unit_index = int(unit_index)
+            if entry.result.type == "succeeded":
+                record_usage(batch_span, entry.result.message.usage)
+                item["responses"][unit_index] = response_analysis(entry.result.message)
+            else:
+                item["errors"].append(f"{unit_index + 1}번째 분석 요청 {entry.result.type}")
+            item["pending"].remove(unit_index)
+            if not item["pending"]:
+                on_complete(item)
+
+def publish_item(item, force=False):
+    """
+    배치 응답(또는 캐시·이전 분석 결과)으로 분석을 마무리하고 노션에 등록합니다.
+    응답 복구·부족한 항목 재요청도 여기서 하므로 작업자 스레드에서 실행합니다.
+    """
+    result = item["result"]
+    with span("meeting", batch=True):
+        try:
+            meeting_data = item.get("analysis")
+            if meeting_data is None:
+                with span("parse", units=len(item["units"])):
+                    analyses = []
+                    for i, (unit, response) in enumerate(zip(item["units"], item["responses"])):
+                        analysis = complete_analysis(unit, response) if response is not None else None
+                        if analysis and i not in item["cached"]:
+                            store_analysis(build_analysis_prompt(unit), analysis)
+                        analyses.append(analysis)
+                    merged = merge_analysis_results(analyses)
+                if not merged:
+                    result["error"] = "; ".join(item.get("errors") or []) or "회의록 분석에 실패했습니다."
+                    mark_error("회의록 분석 실패")
+                    return result
+                # CLI·작업 큐와 같은 기준으로 검증하여 스키마에 맞지 않는 결과는 노션에 쓰지 않음
+                meeting_data, reason, error = validate_analysis(merged)
+                if meeting_data is None:
+                    result["error"] = error
+                    mark_error(reason)
+                    return result
+                if item["index"]:
+                    item["index"].record(item["fingerprint"], analysis=meeting_data)
+
+            started = time.perf_counter()
+            existing = item["existing"]
+            with span("notion"):
+                if existing and existing["page_id"]:
+                    page_id = update_meeting_notes_in_notion(existing["page_id"], meeting_data)
+                else:
+                    page_id = add_meeting_notes_to_notion(meeting_data)
+            result["timings"]["notion"] = round(time.perf_counter() - started, 3)
+            if not page_id:
+                result["error"] = "노션 회의록 등록에 실패했습니다."
+                mark_error("노션 등록 실패")
+                return result
+
+            if item["index"]:
+                item["index"].record(item["fingerprint"], page_id=page_id)
+            result["status"] = "success"
+            result["page_id"] = page_id
+
+            # 대량 백필에서는 회의록마다 알림을 보내지 않고 다이제스트 모드일 때만 모아서 보냄
+            if slack_notifier.get_active_digest() is not None:
+                slack_notifier.notify_slack_meeting_notes(meeting_data, page_id)
+        except Exception as e:
+            result["error"] = str(e)
+            mark_error(e)
+        finally:
+            result["timings"]["total"] = round(time.perf_counter() - item["started"], 3)
+    return result
+
+def run_backfill(paths, report_path, workers=DEFAULT_WRITER_WORKERS, force=False,
+                 batch_size=None, poll_interval=None, state_path=None):
+    """
+    여러 회의록을 Anthropic 메시지 배치 API로 분석하고 노션에 등록합니다 (대화형이 아닌 대량 백필용).
+    요청을 batch_size개씩 배치로 제출한 뒤 poll_interval초마다 상태를 확인하고,
+    끝난 배치의 결과는 기다리지 않고 바로 노션 등록 작업자(workers개)에게 넘깁니다.
+    이전 실행에서 제출하고 결과를 받지 못한 배치는 다시 제출하지 않고 결과를 이어 받습니다.
+
+    Returns:
+        list: 파일별 결과 딕셔너리 목록 (완료 순서)
+    """
+    batch_size = batch_size or get_int_setting("ANTHROPIC_BATCH_SIZE", 100)
+    if poll_interval is None:
+        poll_interval = get_float_setting("ANTHROPIC_BATCH_POLL_INTERVAL", 30)
+    state = BatchState(state_path)
+    pending_batches = state.load()
+    batch_of = {path: batch_id for batch_id, files in pending_batches.items() for path in files}
+    resumed_files = list(batch_of)
+    new_files = [path for path in paths if path not in batch_of]
+    if not resumed_files and not new_files:
+        print("처리할 회의록 파일이 없습니다.")
+        return []
+
+    results = []
+    report_lock = threading.Lock()
+    started = time.perf_counter()
+
+    with open(report_path, "a", encoding="utf-8") as report, \
+            ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+
+        def record(result):
+            with report_lock:
+                results.append(result)
+                report.write(json.dumps(result, ensure_ascii=False) + "\n")
+                report.flush()
+
+        def publish(item):
+            executor.submit(publish_item, item, force).add_done_callback(lambda future: record(future.result()))
+
+        # 1. 회의록 준비: 이미 등록된 회의록은 건너뛰고, 캐시·이전 분석 결과가 있으면 바로 노션 등록
+        items_by_key = {}
+        items_by_file = {}
+        to_submit = []
+        for path in resumed_files + new_files:
+            try:
+                item = prepare_item(path, force)
+            except OSError as e:
+                result = _new_result(path)
+                result["error"] = str(e)
+                record(result)
+                continue
+            item["result"]["batch_id"] = batch_of.get(path)
+            if item["result"]["status"] in ("skipped", "unchanged"):
+                record(item["result"])
+                continue
+            key = item["fingerprint"][:40]
+            if key in items_by_key:
+                item["result"].update(status="skipped", error=f"같은 내용의 회의록이 이미 있습니다: {items_by_key[key]['file']}")
+                record(item["result"])
+                continue
+            items_by_key[key] = item
+            items_by_file[path] = item
+            item["errors"] = []
+            if "analysis" in item or not item["pending"]:
+                publish(item)
+            elif path not in batch_of:
+                to_submit.append(item)
+
+        # 2. 새 회의록을 배치로 제출 (제출 직후 기록하여 중단되어도 결과를 이어 받을 수 있게 함)
+        client = get_anthropic_client()
+        for group in group_batches(to_submit, max(1, batch_size)):
+            batch_id = submit_batch(client, group)
+            files = [item["file"] for item in group]
+            for item in group:
+                item["result"]["batch_id"] = batch_id
+            state.add(batch_id, files)
+            pending_batches[batch_id] = files
+
+        if pending_batches:
+            print(f"메시지 배치 {len(pending_batches)}개의 처리가 끝나기를 기다립니다 (확인 간격 {poll_interval:.0f}초)...")
+
+        # 3. 끝난 배치부터 결과를 읽어 노션 등록 작업자에게 넘김
+        while pending_batches:
+            for batch_id in list(pending_batches):
+                batch = call_with_rate_limit("anthropic", client.messages.batches.retrieve, batch_id)
+                if batch.processing_status != "ended":
+                    continue
+
+                counts = batch.request_counts
+                print(f"메시지 배치 완료: {batch_id} (성공 {counts.succeeded}, 오류 {counts.errored}, 만료 {counts.expired})")
+                collect_batch_results(client, batch_id, items_by_key, publish)
+
+                # 결과에 빠진 요청이 있는 회의록은 실패로 기록
+                for path in pending_batches.pop(batch_id):
+                    item = items_by_file.get(path)
+                    if item is not None and item.get("pending"):
+                        item["result"]["error"] = "배치 결과에 분석 응답이 없습니다."
+                        item["pending"] = []
+                        record(item["result"])
+                state.remove(batch_id)
+            if pending_batches:
+                time.sleep(poll_interval)
+
+    succeeded = sum(1 for result in results if result["status"] == "success")
+    unchanged = sum(1 for result in results if result["status"] == "unchanged")
+    elapsed = time.perf_counter() - started
+    print(f"\n배치 API 백필 완료: 성공 {succeeded}/{len(results)}건 (변경 없음 {unchanged}건), 소요 시간 {elapsed:.1f}초")
+    print(f"결과 보고서: {report_path}")
+    return results
@@ -0,0 +1,319 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from fake_services import start_fake_services, service_environment
+
+# 처리 방식
+MODES = ["serial", "threaded", "async"]
+
+# 합성 회의록 길이 (목표 글자 수). long은 분할 분석(LONG_TRANSCRIPT_CHUNK_CHARS)을 거치도록 기본 분할 크기보다 길게 설정
+TRANSCRIPT_SIZES = {
+    "short": 1500,
+    "medium": 6000,
+    "long": 20000,
+}
+
+NAMES = ["김민준", "이서연", "박지훈", "최유진", "정하늘", "강도윤", "조수아", "윤지호"]
+TOPICS = [
+    "신제품 출시 일정", "고객 피드백 정리", "분기 매출 리뷰", "채용 계획",
+    "인프라 비용 절감", "마케팅 캠페인", "보안 점검 결과", "온보딩 프로세스 개선",
+]
+SENTENCES = [
+    "{topic} 관련해서 지난주 진행 상황을 공유드리겠습니다.",
+    "현재 일정 기준으로는 {n}주 정도 여유가 있습니다.",
+    "{name}님이 말씀하신 부분은 다음 회의 전까지 확인해 보겠습니다.",
+    "예산은 전 분기 대비 {n}% 정도 늘어날 것 같습니다.",
+    "그럼 이 건은 {name}님이 담당하시는 걸로 정리하겠습니다.",
+    "음, 그 부분은 저도 동의합니다. 다만 리스크가 좀 있어 보여요.",
+    "데이터를 보면 {topic}에서 개선 여지가 분명히 있습니다.",
+    "네, 알겠습니다. 관련 자료는 공유 폴더에 올려두겠습니다.",
+    "혹시 {topic} 일정이 밀리면 다른 팀에도 영향이 있을까요?",
+    "고객사 쪽에서는 {n}월 안에 결과를 받아보길 원하고 있습니다.",
+]
+
+# 서비스별 기본 지연 (초): 분석은 느리고, 노션·슬랙은 비교적 빠름
+DEFAULT_LATENCY = {"anthropic": 0.8, "notion": 0.15, "slack": 0.05}
+
+def _clock(seconds):
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes:02d}:{secs:02d}"
+
+def generate_transcript(rng, size="medium", number=0):
+    """
+    클로바 노트 형식(화자 이름 + 시각 헤더, 안건 제목)의 합성 한국어 회의록을 만듭니다.
+    size는 TRANSCRIPT_SIZES의 키이며, 같은 rng 상태면 같은 회의록이 생성됩니다.
+    """
+    target = TRANSCRIPT_SIZES[size]
+    speakers = rng.sample(NAMES, rng.randint(3, 6))
+    topics = rng.sample(TOPICS, rng.randint(2, 4))
+    date = f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+    lines = [f"{topics[0]} 회의 #{number}", f"{date} 오후 2:00", ""]
+    length = sum(len(line) + 1 for line in lines)
+    seconds = 0
+    agenda = 0
+    while length < target:
+        if agenda < len(topics) and length >= target * agenda / len(topics):
+            lines += [f"## {agenda + 1}. {topics[agenda]}", ""]
+            agenda += 1
+        topic = topics[max(0, agenda - 1)]
+        seconds += rng.randint(5, 90)
+        utterance = " ".join(
+            rng.choice(SENTENCES).format(topic=topic, name=rng.choice(speakers), n=rng.randint(1, 12))
+            for _ in range(rng.randint(1, 4))
+        )
+        block = [f"{rng.choice(speakers)} {_clock(seconds)}", utterance, ""]
+        lines += block
+        length += sum(len(line) + 1 for line in block)
+    return "\n".join(lines)
+
+def generate_corpus(count, sizes=None, seed=0):
+    """길이가 섞인 합성 회의록 count개를 (크기, 텍스트) 목록으로 반환합니다."""
+    rng = random.Random(seed)
+    sizes = sizes or list(TRANSCRIPT_SIZES)
+    return [(sizes[i % len(sizes)], generate_transcript(rng, sizes[i % len(sizes)], i)) for i in range(count)]
+
+def percentile(values, q):
+    """정렬된 값 목록의 q(0~100) 백분위수 (선형 보간)"""
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+def _process_sync(meeting_text):
+    """동기 파이프라인: 분석 → 노션 등록 → 슬랙 알림"""
+    from main import process_meeting_notes
+    return process_meeting_notes(meeting_text)
+
+def _timed_sync(meeting_text):
+    started = time.perf_counter()
+    try:
+        page_id = _process_sync(meeting_text)
+    except Exception:
+        page_id = None
+    return time.perf_counter() - started, bool(page_id)
+
+def _run_serial(texts, workers):
+    return [_timed_sync(text) for text in texts]
+
+def _run_threaded(texts, workers):
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return list(executor.map(_timed_sync, texts))
+
+def _run_async(texts, workers):
+    import asyncio
+    from main import process_meeting_notes_async
+    from client_registry import aclose_async_clients
+
+    async def run():
+        semaphore = asyncio.Semaphore(max(1, workers))
+
+        async def one(text):
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    page_id = await process_meeting_notes_async(text)
+                except Exception:
+                    page_id = None
+                return time.perf_counter() - started, bool(page_id)
+
+        try:
+            return await asyncio.gather(*(one(text) for text in texts))
+        finally:
+            await aclose_async_clients()
+
+    return asyncio.run(run())
+
+MODE_RUNNERS = {
+    "serial": _run_serial,
+    "threaded": _run_threaded,
+    "async": _run_async,
+}
+
+def summarize(mode, results, elapsed, server_stats):
+    """회의록별 (지연 시간, 성공 여부) 목록으로 모드별 결과를 요약합니다."""
+    latencies = sorted(latency * 1000 for latency, _ in results)
+    succeeded = sum(1 for _, ok in results if ok)
+    return {
+        "mode": mode,
+        "meetings": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "elapsed_s": round(elapsed, 3),
+        "meetings_per_sec": round(succeeded / elapsed, 3) if elapsed > 0 else None,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 1) if latencies else None,
+            "p95": round(percentile(latencies, 95), 1) if latencies else None,
+            "p99": round(percentile(latencies, 99), 1) if latencies else None,
+            "mean": round(statistics.fmean(latencies), 1) if latencies else None,
+            "max": round(latencies[-1], 1) if latencies else None,
+        },
+        "server": server_stats,
+    }
+
+def configure_environment(servers, keep_rate_limits=False, work_dir=None):
+    """
+    파이프라인 모듈을 불러오기 전에 가짜 서버 주소와 벤치마크용 설정을 환경 변수에 넣습니다.
+    분석 캐시는 끄고 페이지 인덱스와 노션 미러는 임시 디렉터리를 사용해 실제 .cache를 건드리지 않습니다.
+    """
+    env = service_environment(servers)
+    env["ANALYSIS_CACHE_DISABLED"] = "1"
+    work_dir = work_dir or tempfile.mkdtemp(prefix="bench-")
+    env["PAGE_INDEX_PATH"] = os.path.join(work_dir, "page_index.sqlite3")
+    env["NOTION_MIRROR_PATH"] = os.path.join(work_dir, "notion_mirror.sqlite3")
+    # 회의록별 지연 시간을 재도록 슬랙 다이제스트 모드는 끔
+    env["SLACK_DIGEST"] = "0"
+    if not keep_rate_limits:
+        # 클라이언트 쪽 예산 대신 가짜 서버의 지연·429 응답이 처리량을 결정하도록 예산을 크게 설정
+        env.update({
+            "RATE_LIMIT_NOTION_PER_SEC": "1000", "RATE_LIMIT_NOTION_BURST": "1000",
+            "RATE_LIMIT_ANTHROPIC_PER_MIN": "60000", "RATE_LIMIT_ANTHROPIC_BURST": "1000",
+            "RATE_LIMIT_SLACK_PER_SEC": "1000", "RATE_LIMIT_SLACK_BURST": "1000",
+        })
+    os.environ.update(env)
+
+def run_benchmark(corpus, modes=None, workers=4, servers=None, verbose=False):
+    """
+    모드별로 같은 회의록 묶음을 처리하고 결과 목록을 반환합니다.
+    모드마다 회의록 앞에 모드 이름을 붙여 이전 모드의 중복 등록 기록에 걸리지 않게 합니다.
+    """
+    reports = []
+    for mode in modes or MODES:
+        texts = [f"[벤치마크 {mode}]\n{text}" for _, text in corpus]
+        for server in (servers or {}).values():
+            server.reset_stats()
+
+        print(f"{mode}: 회의록 {len(texts)}개 처리 중...", file=sys.stderr)
+        output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        started = time.perf_counter()
+        with output:
+            results = MODE_RUNNERS[mode](texts, workers)
+        elapsed = time.perf_counter() - started
+
+        server_stats = {service: server.reset_stats() for service, server in (servers or {}).items()}
+        reports.append(summarize(mode, results, elapsed, server_stats))
+    return reports
+
+def compare_with_baseline(report, baseline, tolerance):
+    """기준 결과보다 처리량이 줄었거나 p95 지연이 늘어난 모드 목록을 반환합니다."""
+    previous = {entry["mode"]: entry for entry in baseline.get("modes", [])}
+    regressions = []
+    for entry in report["modes"]:
+        before = previous.get(entry["mode"])
+        if not before:
+            continue
+        if before["meetings_per_sec"] and entry["meetings_per_sec"] is not None \
+                and entry["meetings_per_sec"] < before["meetings_per_sec"] * (1 - tolerance):
+            regressions.append((entry["mode"], "meetings/sec", before["meetings_per_sec"], entry["meetings_per_sec"]))
+        if before["latency_ms"]["p95"] and entry["latency_ms"]["p95"] is not None \
+                and entry["latency_ms"]["p95"] > before["latency_ms"]["p95"] * (1 + tolerance):
+            regressions.append((entry["mode"], "p95(ms)", before["latency_ms"]["p95"], entry["latency_ms"]["p95"]))
+    return regressions
+
+def print_report(report):
+    print(f"회의록 {report['config']['meetings']}개, 동시 처리 {report['config']['workers']}개")
+    print(f"{'모드':<10}{'성공':>8}{'회의록/초':>12}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}  서버 429/500")
+    for entry in report["modes"]:
+        latency = entry["latency_ms"]
+        throttled = " ".join(f"{service}:{stats['rate_limited']}/{stats['errors']}" for service, stats in entry["server"].items())
+        print(f"{entry['mode']:<10}{entry['succeeded']:>5}/{entry['meetings']:<3}{entry['meetings_per_sec'] or 0:>11.2f}"
+              f"{latency['p50'] or 0:>10.0f}{latency['p95'] or 0:>10.0f}{latency['p99'] or 0:>10.0f}  {throttled}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="가짜 Anthropic/Notion/Slack 서버로 회의록 처리 파이프라인 성능 측정")
+    parser.add_argument("--meetings", type=int, default=12, help="처리할 합성 회의록 수 (기본값: 12)")
+    parser.add_argument("--sizes", nargs="+", choices=list(TRANSCRIPT_SIZES), default=list(TRANSCRIPT_SIZES),
+                        help="사용할 회의록 길이 (기본값: short medium long)")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES, help="측정할 처리 방식")
+    parser.add_argument("--workers", type=int, default=4, help="threaded/async 모드의 동시 처리 수 (기본값: 4)")
+    parser.add_argument("--seed", type=int, default=42, help="회의록 생성과 서버 동작의 난수 시드")
+    for service, latency in DEFAULT_LATENCY.items():
+        parser.add_argument(f"--{service}-latency", type=float, default=latency,
+                            help=f"{service} 서버 응답 지연(초, 기본값: {latency})")
+    parser.add_argument("--anthropic-latency-per-kb", type=float, default=0.02,
+                        help="분석 요청 본문 1KB당 추가 지연(초, 기본값: 0.02)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="응답 지연 변동 비율 (기본값: 0.2)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="서버가 500을 반환할 비율")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="서버가 429를 반환할 비율")
+    parser.add_argument("--retry-after", type=float, default=0.5, help="429 응답의 Retry-After(초)")
+    parser.add_argument("--malformed-rate", type=float, default=0.0,
+                        help="분석 응답을 코드 펜스·쉼표 오류·잘림 형태로 망가뜨릴 비율")
+    parser.add_argument("--keep-rate-limits", action="store_true",
+                        help="클라이언트 요청 예산(RATE_LIMIT_*)을 기본값 그대로 사용")
+    parser.add_argument("--json", dest="json_path", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일 경로")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="기준 대비 허용 변화율 (기본값: 0.2 = 20%%)")
+    parser.add_argument("--verbose", action="store_true", help="파이프라인 출력 메시지 표시")
+    return parser.parse_args(argv)
+
+def behaviors_from_args(args):
+    behaviors = {}
+    for service in DEFAULT_LATENCY:
+        behaviors[service] = {
+            "latency": getattr(args, f"{service}_latency"),
+            "jitter": args.jitter,
+            "error_rate": args.error_rate,
+            "rate_limit_rate": args.rate_limit_rate,
+            "retry_after": args.retry_after,
+        }
+    behaviors["anthropic"]["latency_per_kb"] = args.anthropic_latency_per_kb
+    behaviors["anthropic"]["malformed_rate"] = args.malformed_rate
+    return behaviors
+
+if __name__ == "__main__":
+    args = parse_args()
+    behaviors = behaviors_from_args(args)
+    servers = start_fake_services(behaviors, seed=args.seed)
+    try:
+        with tempfile.TemporaryDirectory(prefix="bench-") as work_dir:
+            configure_environment(servers, keep_rate_limits=args.keep_rate_limits, work_dir=work_dir)
+            corpus = generate_corpus(args.meetings, args.sizes, seed=args.seed)
+            modes = run_benchmark(corpus, args.modes, workers=args.workers, servers=servers, verbose=args.verbose)
+    finally:
+        for server in servers.values():
+            server.stop()
+
+    report = {
+        "measured_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "config": {
+            "meetings": args.meetings,
+            "sizes": args.sizes,
+            "workers": args.workers,
+            "seed": args.seed,
+            "keep_rate_limits": args.keep_rate_limits,
+            "corpus_chars": sum(len(text) for _, text in corpus),
+            "behaviors": behaviors,
+        },
+        "modes": modes,
+    }
+    print_report(report)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json_path}")
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_with_baseline(report, json.load(f), args.tolerance)
+        for mode, metric, before, after in regressions:
+            print(f"성능 저하: {mode} {metric} {before} → {after}")
+        if regressions:
+            exit_code = 1
+
+    sys.exit(exit_code)
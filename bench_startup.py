@@ -0,0 +1,132 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+# 시작 시간을 측정할 모듈 (앱과 CLI가 처음 불러오는 모듈)
+DEFAULT_MODULES = [
+    "config",
+    "client_registry",
+    "rate_limiter",
+    "claude_analyzer",
+    "notion_connector",
+    "slack_notifier",
+    "long_transcript",
+    "job_queue",
+    "main",
+]
+
+# 모듈 import만으로 불러와서는 안 되는 무거운 패키지 (처음 사용할 때 불러와야 함)
+LAZY_PACKAGES = ["anthropic", "notion_client", "httpx", "requests", "dotenv", "asyncio", "jsonschema"]
+# 모듈별로 맨 위에서 불러와도 되는 패키지 (main은 --async 파이프라인 때문에 asyncio를 바로 불러옴)
+ALLOWED_IMPORTS = {"main": {"asyncio"}}
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+def measure_module(module, repeat=5):
+    """
+    `python -X importtime`으로 모듈을 새 프로세스에서 repeat번 불러와 측정합니다.
+
+    Returns:
+        dict: 누적 import 시간 중앙값(ms), 프로세스 전체 시간 중앙값(ms), 함께 불러온 무거운 패키지 목록
+    """
+    cumulative = []
+    wall = []
+    loaded = set()
+    for _ in range(repeat):
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+        )
+        wall.append((time.perf_counter() - started) * 1000)
+        if proc.returncode != 0:
+            raise RuntimeError(f"{module} import 실패:\n{proc.stderr.strip().splitlines()[-1]}")
+
+        total_us = None
+        for line in proc.stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            if not match:
+                continue
+            name = match.group(4)
+            if name in LAZY_PACKAGES and name not in ALLOWED_IMPORTS.get(module, ()):
+                loaded.add(name)
+            if name == module:
+                total_us = int(match.group(2))
+        cumulative.append((total_us or 0) / 1000)
+
+    return {
+        "module": module,
+        "import_ms": round(statistics.median(cumulative), 2),
+        "process_ms": round(statistics.median(wall), 2),
+        "heavy_imports": sorted(loaded),
+    }
+
+def run_benchmark(modules=None, repeat=5):
+    """모듈별 시작 시간을 측정하고 결과 딕셔너리를 반환합니다."""
+    results = [measure_module(module, repeat) for module in (modules or DEFAULT_MODULES)]
+    return {
+        "python": sys.version.split()[0],
+        "repeat": repeat,
+        "measured_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "modules": results,
+    }
+
+def compare_with_baseline(report, baseline, tolerance):
+    """기준 결과보다 tolerance(비율) 이상 느려진 모듈 목록을 반환합니다."""
+    previous = {entry["module"]: entry["import_ms"] for entry in baseline.get("modules", [])}
+    regressions = []
+    for entry in report["modules"]:
+        before = previous.get(entry["module"])
+        # 1ms 미만의 차이는 측정 오차로 보고 무시
+        if before and entry["import_ms"] > before * (1 + tolerance) and entry["import_ms"] - before > 1:
+            regressions.append((entry["module"], before, entry["import_ms"]))
+    return regressions
+
+def print_report(report):
+    print(f"Python {report['python']} / 반복 {report['repeat']}회 중앙값")
+    print(f"{'모듈':<20}{'import(ms)':>12}{'프로세스(ms)':>14}  무거운 패키지")
+    for entry in report["modules"]:
+        heavy = ", ".join(entry["heavy_imports"]) or "-"
+        print(f"{entry['module']:<20}{entry['import_ms']:>12.2f}{entry['process_ms']:>14.2f}  {heavy}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="모듈 import 시작 시간 측정 (python -X importtime)")
+    parser.add_argument("modules", nargs="*", help="측정할 모듈 (기본값: 앱/CLI 주요 모듈)")
+    parser.add_argument("--repeat", type=int, default=5, help="모듈별 측정 횟수 (기본값: 5)")
+    parser.add_argument("--json", dest="json_path", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일 경로")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="기준 대비 허용 증가율 (기본값: 0.2 = 20%%)")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = run_benchmark(args.modules, max(1, args.repeat))
+    print_report(report)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json_path}")
+
+    exit_code = 0
+    if any(entry["heavy_imports"] for entry in report["modules"]):
+        print("경고: import 시점에 무거운 패키지를 불러오는 모듈이 있습니다. 함수 안에서 불러오도록 바꿔주세요.")
+        exit_code = 1
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_with_baseline(report, json.load(f), args.tolerance)
+        for module, before, after in regressions:
+            print(f"시작 시간 증가: {module} {before:.2f}ms → {after:.2f}ms")
+        if regressions:
+            exit_code = 1
+
+    sys.exit(exit_code)
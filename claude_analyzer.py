@@ -1,67 +1,441 @@
-import anthropic
-import os
-
-# .env 파일이 있는 경우에만 로드 시도
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    # dotenv 패키지가 설치되지 않았을 경우 무시
-    pass
-
-# Anthropic API 키 가져오기
-API_KEY = os.environ.get("ANTHROPIC_API_KEY")
-
-if not API_KEY:
-    print("Anthropic API 키가 설정되지 않았습니다.")
-    print("환경 변수 ANTHROPIC_API_KEY를 설정하거나 .env 파일에 추가해주세요.")
-    exit()
-
-# Claude 클라이언트 초기화
-try:
-    client = anthropic.Anthropic(api_key=API_KEY)
-    print("Claude 클라이언트가 성공적으로 초기화되었습니다.")
-except Exception as e:
-    print(f"Claude 클라이언트 초기화 중 오류 발생: {e}")
-    exit()
+import json
+from config import load_environment
+from client_registry import get_anthropic_client, get_async_anthropic_client
+from rate_limiter import acquire, call_with_rate_limit, call_with_rate_limit_async
+from analysis_cache import get_default_cache, make_cache_key, is_cacheable_result
+from tracing import span, start_span
+from analysis_parser import ANALYSIS_SCHEMA, extract_analysis, merge_fields, parse_json_response
+from token_budget import get_max_continuations, plan_request
+from rule_extractor import extract_meeting_notes
+
+# Claude 모델과 응답 길이(max_tokens)는 요청마다 token_budget.plan_request로 정합니다.
+# 회의록 토큰 수를 로컬에서 추정하여 예상 출력에 맞는 max_tokens와 모델 단계를 고릅니다.
+
+# Claude 클라이언트는 client_registry에서 처음 사용할 때 생성되어 재사용됩니다.
+# API 키가 없으면 프로세스를 종료하지 않고 MissingCredentialError가 발생합니다.
+# .env 파일도 import 시점이 아니라 API 키를 처음 읽을 때 로드됩니다 (config.get_setting).
+
+class AnalysisStreamError(RuntimeError):
+    """
+    스트리밍 분석이 완료되지 못했을 때 발생합니다.
+    그때까지 받은 조각은 잘린 JSON이므로 최종 결과로 사용하면 안 됩니다.
+    """
+
+# 분석 항목과 설명 (시스템 프롬프트와 도구 입력 스키마에 이 순서대로 들어가며, analysis_parser.ANALYSIS_SCHEMA로 검증)
+ANALYSIS_FIELDS = [
+    ("회의 제목", "회의록에 적힌 제목, 없다면 내용을 요약한 짧은 제목"),
+    ("회의 리드", "회의 진행자 이름"),
+    ("참석자", "쉼표로 구분된 참석자 목록"),
+    ("일자", "YYYY-MM-DD 형식, 알 수 없다면 빈 문자열"),
+    ("진행 단계", "'시작 전' 또는 '시작 후'"),
+    ("아젠다 사전 공유", "체크된 참석자 목록을 배열 형태로"),
+    ("회의 목적", "회의 목적 텍스트"),
+    ("회의 아젠다", "각 아젠다 항목을 객체 배열로 - 항목 제목, 소요시간, 관련 자료 속성 포함"),
+    ("주요 논의 내용", "각 아젠다 항목별 논의 내용을 객체 배열로 - 아젠다 제목, 논의 내용 배열 속성 포함"),
+    ("주요 결정 사항", "결정 사항 목록을 객체 배열로 - 제목, 세부 내용 속성 포함"),
+    ("후속 액션", "후속 조치 목록을 배열로"),
+    ("회의 피드백", "좋았던 점, 개선할 점, 다음 회의 제안 사항을 속성으로 가진 객체"),
+    ("다음 회의 일정", "일시, 장소, 주요 아젠다를 속성으로 가진 객체"),
+]
+
+# 스키마 검증과 별개로 응답에 없으면 항상 다시 요청하는 항목
+# (회의 제목은 이전 형식과의 호환 때문에 스키마 필수 항목이 아니지만 노션 페이지 제목으로 쓰임)
+ALWAYS_REQUESTED_FIELDS = ["회의 제목"]
+
+# 분석 결과를 구조화된 입력으로 받는 도구 이름
+ANALYSIS_TOOL_NAME = "record_meeting_analysis"
+
+def _field_lines(fields=None):
+    selected = [(name, description) for name, description in ANALYSIS_FIELDS if fields is None or name in fields]
+    return "".join(f"- {name}: ({description})\n" for name, description in selected)
+
+def build_analysis_tool(fields=None):
+    """
+    분석 항목을 입력 스키마(analysis_parser.ANALYSIS_SCHEMA)로 정의한 도구를 만듭니다.
+    fields를 주면 해당 항목만 담은 도구를 만듭니다 (부족한 항목 재요청용).
+    """
+    properties = ANALYSIS_SCHEMA["properties"]
+    selected = [(name, description) for name, description in ANALYSIS_FIELDS if fields is None or name in fields]
+    return {
+        "name": ANALYSIS_TOOL_NAME,
+        "description": "회의록에서 추출한 분석 항목을 기록합니다. 값이 없는 항목은 빈 문자열로 채웁니다.",
+        "input_schema": {
+            "type": "object",
+            "properties": {name: dict(properties[name], description=description) for name, description in selected},
+            "required": [name for name, _ in selected if name in ANALYSIS_SCHEMA["required"]],
+        },
+    }
+
+# 모든 요청에 똑같이 들어가는 도구 정의와 지시문 (프롬프트 캐시 대상)
+# 회의록마다 달라지는 내용은 사용자 메시지로만 보내므로, 이 앞부분은 요청마다 다시 처리되지 않음
+ANALYSIS_TOOL = build_analysis_tool()
+SYSTEM_PROMPT = "".join([
+    "너는 회의록 분석 도우미야. 사용자가 보낸 회의록 텍스트를 분석하여 아래 항목들을 추출하고, ",
+    f"{ANALYSIS_TOOL_NAME} 도구의 입력으로 정리해줘.\n",
+    "각 항목의 값이 없다면 빈 문자열(\"\")로 표시하고, 회의록에 없는 내용은 지어내지 마.\n\n",
+    "추출 항목:\n",
+    _field_lines(),
+])
+SYSTEM_BLOCKS = [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+
+# 분석 결과 캐시 키에 함께 넣는 고정 프롬프트 (지시문이나 항목 정의가 바뀌면 이전 결과를 재사용하지 않음)
+CACHE_KEY_PREFIX = SYSTEM_PROMPT + json.dumps(ANALYSIS_TOOL, ensure_ascii=False, sort_keys=True)
+
+# 분석 프롬프트를 생성하는 함수
+def build_analysis_prompt(meeting_text):
+    """회의록 텍스트만 담은 사용자 메시지를 생성합니다 (지시문은 SYSTEM_PROMPT)."""
+    return f"회의록 텍스트:\n\"\"\"\n{meeting_text}\n\"\"\""
+
+# 일부 항목만 다시 요청하는 프롬프트를 생성하는 함수
+def build_field_request_prompt(meeting_text, fields):
+    """응답에서 빠졌거나 형식이 잘못된 항목만 다시 추출하도록 요청하는 사용자 메시지를 생성합니다."""
+    human_msg = build_analysis_prompt(meeting_text) + "\n\n"
+    human_msg += f"이전 응답에서 빠졌거나 형식이 잘못된 다음 항목만 다시 추출해줘: {', '.join(fields)}"
+    return human_msg
+
+# 요청의 모델과 토큰 예산 정하기
+def plan_analysis_request(human_msg, fields=None, attempt=0):
+    """
+    사용자 메시지의 토큰 수를 추정하여 모델과 max_tokens를 정합니다 (token_budget.plan_request).
+    일부 항목만 요청하면 그 비율만큼, 잘린 응답을 이어 받을 때는 attempt만큼 예상 출력을 조정합니다.
+    """
+    field_share = 1.0 if fields is None else len(fields) / len(ANALYSIS_FIELDS)
+    return plan_request(human_msg, field_share=field_share, attempt=attempt)
+
+# Messages API 요청 인자를 생성하는 함수
+def build_request_params(human_msg, fields=None, plan=None):
+    """
+    시스템 프롬프트·도구 정의·사용자 메시지로 Messages API 요청 인자를 만듭니다.
+    도구 사용을 강제하므로 응답은 JSON 텍스트가 아니라 도구 입력(딕셔너리)으로 옵니다.
+    plan을 주지 않으면 plan_analysis_request로 모델과 max_tokens를 정합니다.
+    """
+    plan = plan or plan_analysis_request(human_msg, fields)
+    tool = ANALYSIS_TOOL if fields is None else build_analysis_tool(fields)
+    return {
+        "model": plan["model"],
+        "max_tokens": plan["max_tokens"],
+        "system": SYSTEM_BLOCKS,
+        "tools": [tool],
+        "tool_choice": {"type": "tool", "name": ANALYSIS_TOOL_NAME},
+        "messages": [{"role": "user", "content": human_msg}],
+    }
+
+# 응답 메시지에서 분석 결과 꺼내기
+def response_analysis(response_message):
+    """
+    응답 메시지의 도구 입력(분석 항목 딕셔너리)을 반환합니다. 도구 호출이 없으면 None을 반환합니다.
+    max_tokens로 잘린 응답은 마지막 항목이 덜 왔을 수 있으므로 빼고 반환합니다 (complete_analysis에서 다시 요청).
+    """
+    for block in response_message.content:
+        if block.type == "tool_use" and block.name == ANALYSIS_TOOL_NAME:
+            tool_input = dict(block.input) if isinstance(block.input, dict) else {}
+            if response_message.stop_reason == "max_tokens" and tool_input:
+                print("응답이 max_tokens에서 잘렸습니다. 받은 항목은 두고 나머지 항목을 이어서 요청합니다.")
+                tool_input.pop(list(tool_input)[-1])
+            return tool_input
+    return None
+
+# 캐시에서 분석 결과 조회
+def get_cached_analysis(human_msg):
+    """같은 프롬프트와 모델로 분석한 결과가 캐시에 있으면 반환합니다."""
+    cache = get_default_cache()
+    if cache is None:
+        return None
+    
+    model = plan_analysis_request(human_msg)["model"]
+    cached = cache.get(make_cache_key(CACHE_KEY_PREFIX + human_msg, model))
+    if cached is not None:
+        print("캐시된 분석 결과를 사용합니다.")
+    return cached
+
+# 분석 결과를 캐시에 저장
+def store_analysis(human_msg, analyzed_data):
+    """JSON으로 파싱되는 분석 결과만 캐시에 저장합니다."""
+    cache = get_default_cache()
+    if cache is None or not is_cacheable_result(analyzed_data):
+        return
+    
+    try:
+        model = plan_analysis_request(human_msg)["model"]
+        cache.set(make_cache_key(CACHE_KEY_PREFIX + human_msg, model), model, analyzed_data)
+    except Exception as e:
+        print(f"분석 결과를 캐시에 저장하는 중 오류 발생: {e}")
+
+# 응답의 토큰 사용량을 스팬에 기록
+def record_usage(trace_span, usage):
+    """Claude 응답의 입력/출력 토큰 수와 프롬프트 캐시 읽기/쓰기 토큰 수를 스팬 속성으로 기록합니다."""
+    if usage is None:
+        return
+    trace_span.increment("input_tokens", getattr(usage, "input_tokens", 0) or 0)
+    trace_span.increment("output_tokens", getattr(usage, "output_tokens", 0) or 0)
+    trace_span.increment("cache_read_tokens", getattr(usage, "cache_read_input_tokens", 0) or 0)
+    trace_span.increment("cache_write_tokens", getattr(usage, "cache_creation_input_tokens", 0) or 0)
+
+# Claude API 호출
+def _request_analysis(human_msg, fields=None, attempt=0, **attributes):
+    """사용자 메시지 하나를 보내고 도구 입력(분석 항목 딕셔너리)을 반환합니다. 실패하면 None을 반환합니다."""
+    client = get_anthropic_client()
+    plan = plan_analysis_request(human_msg, fields, attempt)
+    with span("claude", model=plan["model"], max_tokens=plan["max_tokens"], estimated_input_tokens=plan["input_tokens"],
+              payload_bytes=len(human_msg.encode("utf-8")), **attributes) as claude_span:
+        try:
+            response_message = call_with_rate_limit(
+                "anthropic",
+                client.messages.create,
+                **build_request_params(human_msg, fields, plan)
+            )
+            claude_span.set(stop_reason=response_message.stop_reason)
+            record_usage(claude_span, response_message.usage)
+            return response_analysis(response_message)
+        except Exception as e:
+            print(f"Claude API 호출 중 오류 발생: {e}")
+            claude_span.fail(e)
+            return None
+
+# Claude API 비동기 호출
+async def _request_analysis_async(human_msg, fields=None, attempt=0, **attributes):
+    """_request_analysis의 비동기 버전입니다."""
+    async_client = get_async_anthropic_client()
+    plan = plan_analysis_request(human_msg, fields, attempt)
+    with span("claude", model=plan["model"], max_tokens=plan["max_tokens"], estimated_input_tokens=plan["input_tokens"],
+              payload_bytes=len(human_msg.encode("utf-8")), **attributes) as claude_span:
+        try:
+            response_message = await call_with_rate_limit_async(
+                "anthropic",
+                async_client.messages.create,
+                **build_request_params(human_msg, fields, plan)
+            )
+            claude_span.set(stop_reason=response_message.stop_reason)
+            record_usage(claude_span, response_message.usage)
+            return response_analysis(response_message)
+        except Exception as e:
+            print(f"Claude API 호출 중 오류 발생: {e}")
+            claude_span.fail(e)
+            return None
+
+def _fields_to_request(response_text):
+    # (회의록 딕셔너리, 다시 요청할 항목) - 스키마 검증에서 빠진 항목에 ALWAYS_REQUESTED_FIELDS 중 없는 항목을 더함
+    meeting_data, fields = extract_analysis(response_text)
+    if meeting_data is not None:
+        fields = [field for field in ALWAYS_REQUESTED_FIELDS if not meeting_data.get(field)] + fields
+    return meeting_data, fields
+
+def _merge_requested_fields(meeting_data, patch, fields):
+    # (회의록 딕셔너리, 아직 얻지 못한 항목) - 응답을 얻지 못하면 그대로 둠
+    if parse_json_response(patch) is None:
+        return meeting_data, fields
+    return merge_fields(meeting_data, patch, fields, fill_empty=False)
+
+def _finish_analysis(meeting_data, fields):
+    if meeting_data is None:
+        print("분석 결과를 JSON으로 복구하지 못했습니다.")
+        return None
+    meeting_data, unresolved = merge_fields(meeting_data, None, fields)
+    if unresolved:
+        print(f"다시 요청해도 얻지 못한 항목은 빈 값으로 둡니다: {', '.join(unresolved)}")
+    return json.dumps(meeting_data, ensure_ascii=False)
+
+def finish_extraction(extracted):
+    """
+    규칙 기반 추출 결과(complete)를 Claude를 호출하지 않고 스키마로 검증하여 JSON 문자열로 반환합니다.
+    형식이 잘못된 항목은 다시 요청하지 않고 빈 값으로 둡니다.
+    """
+    meeting_data, unresolved = merge_fields(extracted, None, [])
+    if unresolved:
+        print(f"규칙 기반 추출 결과에서 형식이 잘못된 항목은 빈 값으로 둡니다: {', '.join(unresolved)}")
+    return json.dumps(meeting_data, ensure_ascii=False)
+
+# 응답 복구·검증 후 부족한 항목만 다시 요청
+def complete_analysis(meeting_text, response_text):
+    """
+    Claude 응답(도구 입력 딕셔너리 또는 JSON 문자열)을 스키마로 검증하고, 빠졌거나 형식이 잘못된 항목만 다시 요청하여 채웁니다.
+    다시 요청한 응답도 max_tokens에서 잘리면 남은 항목만 더 큰 예산으로 최대 ANALYSIS_CONTINUATIONS번 이어 받습니다.
+    JSON 문자열(캐시된 결과 등)의 코드 펜스, 쉼표 오류, 잘린 괄호 등은 API를 다시 호출하지 않고 고칩니다.
+
+    Returns:
+        str: 검증을 통과한 JSON 문자열, 복구도 다시 요청도 실패하면 None
+    """
+    meeting_data, fields = _fields_to_request(response_text)
+    if not fields:
+        return json.dumps(meeting_data, ensure_ascii=False)
+    
+    for attempt in range(1, get_max_continuations() + 1):
+        print(f"분석 결과에서 빠졌거나 형식이 잘못된 항목을 다시 요청합니다: {', '.join(fields)}")
+        patch = _request_analysis(build_field_request_prompt(meeting_text, fields), fields, attempt,
+                                  requested_fields=len(fields))
+        meeting_data, fields = _merge_requested_fields(meeting_data, patch, fields)
+        if not fields:
+            break
+    return _finish_analysis(meeting_data, fields)
+
+async def complete_analysis_async(meeting_text, response_text):
+    """complete_analysis의 비동기 버전입니다."""
+    meeting_data, fields = _fields_to_request(response_text)
+    if not fields:
+        return json.dumps(meeting_data, ensure_ascii=False)
+    
+    for attempt in range(1, get_max_continuations() + 1):
+        print(f"분석 결과에서 빠졌거나 형식이 잘못된 항목을 다시 요청합니다: {', '.join(fields)}")
+        patch = await _request_analysis_async(build_field_request_prompt(meeting_text, fields), fields, attempt,
+                                              requested_fields=len(fields))
+        meeting_data, fields = _merge_requested_fields(meeting_data, patch, fields)
+        if not fields:
+            break
+    return _finish_analysis(meeting_data, fields)
+
+# 규칙 기반 추출로 Claude 호출을 생략하거나 줄이기
+def extract_with_rules(meeting_text):
+    """
+    "참석자:", "결정 사항:" 같은 표시가 있는 반구조화 회의록을 rule_extractor로 로컬에서 분석합니다.
+
+    Returns:
+        tuple: (상태, 회의록 딕셔너리)
+            - "complete": 신뢰도가 높아 Claude 없이 쓸 결과 (찾지 못한 항목은 빈 문자열)
+            - "partial": 찾은 항목만 담은 결과 (complete_analysis가 나머지 항목만 Claude에 요청)
+            - "none": 규칙으로 분석할 수 없는 회의록 (딕셔너리는 None)
+    """
+    with span("rule_extract", chars=len(meeting_text)) as rule_span:
+        extraction = extract_meeting_notes(meeting_text)
+        rule_span.set(confidence=extraction["confidence"], status=extraction["status"], found=len(extraction["found"]))
+    
+    status = extraction["status"]
+    if status == "complete":
+        print(f"규칙 기반 추출 신뢰도 {extraction['confidence']:.2f}: Claude를 호출하지 않습니다.")
+        return status, extraction["data"]
+    if status == "partial":
+        print(f"규칙 기반 추출 신뢰도 {extraction['confidence']:.2f}: "
+              f"찾지 못한 항목 {len(extraction['missing'])}개만 Claude에 요청합니다.")
+        found = extraction["found"]
+        return status, {field: value for field, value in extraction["data"].items() if field in found}
+    return status, None
 
 # 회의록을 분석하는 함수
-def analyze_meeting_notes_with_claude(meeting_text):
+def analyze_meeting_notes_with_claude(meeting_text, use_cache=True):
+    # 반구조화된 회의록은 규칙 기반 추출 결과만 검증하여 반환
+    status, extracted = extract_with_rules(meeting_text)
+    if status == "complete":
+        return finish_extraction(extracted)
+    
     # 프롬프트 생성
-    human_msg = f"다음 회의록 텍스트를 분석하여 아래 항목들을 추출하고, JSON 형식으로 정리해줘. 각 항목의 값이 없다면 빈 문자열(\"\")로 표시해줘.\n\n"
-    human_msg += f"회의록 텍스트:\n\"\"\"\n{meeting_text}\n\"\"\"\n\n"
-    human_msg += "추출 항목:\n"
-    human_msg += "- 회의 리드: (회의 진행자 이름)\n"
-    human_msg += "- 참석자: (쉼표로 구분된 참석자 목록)\n"
-    human_msg += "- 일자: (YYYY-MM-DD 형식, 알 수 없다면 빈 문자열)\n"
-    human_msg += "- 진행 단계: ('시작 전' 또는 '시작 후')\n"
-    human_msg += "- 아젠다 사전 공유: (체크된 참석자 목록을 배열 형태로)\n"
-    human_msg += "- 회의 목적: (회의 목적 텍스트)\n"
-    human_msg += "- 회의 아젠다: (각 아젠다 항목을 객체 배열로 - 항목 제목, 소요시간, 관련 자료 속성 포함)\n"
-    human_msg += "- 주요 논의 내용: (각 아젠다 항목별 논의 내용을 객체 배열로 - 아젠다 제목, 논의 내용 배열 속성 포함)\n"
-    human_msg += "- 주요 결정 사항: (결정 사항 목록을 객체 배열로 - 제목, 세부 내용 속성 포함)\n"
-    human_msg += "- 후속 액션: (후속 조치 목록을 배열로)\n"
-    human_msg += "- 회의 피드백: (좋았던 점, 개선할 점, 다음 회의 제안 사항을 속성으로 가진 객체)\n"
-    human_msg += "- 다음 회의 일정: (일시, 장소, 주요 아젠다를 속성으로 가진 객체)\n\n"
-    human_msg += "결과는 반드시 JSON 형식으로만 반환해야 하며, 다른 설명은 포함하지 마."
-    
-    # Claude API 호출
+    human_msg = build_analysis_prompt(meeting_text)
+    
+    # 캐시 조회 (동일한 회의록 재요청 시 API 호출 생략)
+    if use_cache:
+        cached = get_cached_analysis(human_msg)
+        if cached is not None:
+            return cached
+    
+    # Claude API 호출 후 응답 복구·검증 (부족한 항목만 다시 요청)
+    # 규칙으로 일부 항목을 찾았으면 전체 분석 없이 나머지 항목만 요청
+    if status == "partial":
+        response = extracted
+    else:
+        response = _request_analysis(human_msg)
+        if response is None:
+            return None
+    analyzed_data = complete_analysis(meeting_text, response)
+    if use_cache and analyzed_data:
+        store_analysis(human_msg, analyzed_data)
+    return analyzed_data
+
+# 회의록 분석 결과를 스트리밍으로 받는 함수
+def stream_meeting_notes_analysis(meeting_text, use_cache=True):
+    """
+    Messages 스트리밍 API로 회의록을 분석하며, 지금까지 받은 도구 입력 JSON 텍스트 전체를
+    조각이 도착할 때마다 반환하는 제너레이터입니다.
+    partial_json.parse_partial_json과 함께 사용하면 필드가 도착하는 대로 화면에 표시할 수 있습니다.
+    스트림이 끝나면 복구·검증한 최종 JSON 문자열을 마지막으로 한 번 더 반환합니다.
+    규칙 기반 추출로 분석한 회의록은 스트리밍 없이 최종 결과만 반환합니다.
+    
+    제너레이터가 예외 없이 끝났을 때만 마지막으로 반환한 값이 완성된 분석 결과입니다.
+    
+    Raises:
+        AnalysisStreamError: API 호출이나 남은 항목 보완에 실패한 경우 (오류 메시지는 출력됨)
+    """
+    status, extracted = extract_with_rules(meeting_text)
+    if status == "complete":
+        yield finish_extraction(extracted)
+        return
+    
+    human_msg = build_analysis_prompt(meeting_text)
+    
+    if use_cache:
+        cached = get_cached_analysis(human_msg)
+        if cached is not None:
+            yield cached
+            return
+    
+    if status == "partial":
+        completed = complete_analysis(meeting_text, extracted)
+        if completed is None:
+            raise AnalysisStreamError("빠진 항목을 분석하지 못했습니다.")
+        yield completed
+        if use_cache:
+            store_analysis(human_msg, completed)
+        return
+    
+    client = get_anthropic_client()
+    analyzed_data = ""
+    # 제너레이터는 with 문 스팬으로 감쌀 수 없으므로 직접 종료
+    plan = plan_analysis_request(human_msg)
+    claude_span = start_span("claude", model=plan["model"], max_tokens=plan["max_tokens"], stream=True,
+                             estimated_input_tokens=plan["input_tokens"], payload_bytes=len(human_msg.encode("utf-8")))
     try:
-        response_message = client.messages.create(
-            model="claude-3-haiku-20240307",
-            max_tokens=2048,
-            messages=[
-                {"role": "user", "content": human_msg}
-            ]
-        )
-        analyzed_data = response_message.content[0].text.strip()
-        return analyzed_data
+        # 스트림 도중에는 재시도할 수 없으므로 요청 예산만 확보
+        acquire("anthropic")
+        with client.messages.stream(**build_request_params(human_msg, plan=plan)) as stream:
+            for event in stream:
+                if event.type == "input_json":
+                    analyzed_data += event.partial_json
+                    yield analyzed_data
+            final_message = stream.get_final_message()
+            claude_span.set(stop_reason=final_message.stop_reason)
+            record_usage(claude_span, final_message.usage)
     except Exception as e:
         print(f"Claude API 호출 중 오류 발생: {e}")
-        return None
+        claude_span.fail(e)
+        raise AnalysisStreamError(f"Claude API 호출 중 오류 발생: {e}") from e
+    finally:
+        claude_span.finish()
+    
+    completed = complete_analysis(meeting_text, response_analysis(final_message))
+    if completed is None:
+        raise AnalysisStreamError("스트리밍 응답을 완성하지 못했습니다.")
+    yield completed
+    if use_cache:
+        store_analysis(human_msg, completed)
+
+# 회의록을 비동기로 분석하는 함수
+async def analyze_meeting_notes_with_claude_async(meeting_text, use_cache=True):
+    """
+    analyze_meeting_notes_with_claude의 비동기 버전입니다.
+    같은 이벤트 루프에서 여러 회의록 분석을 동시에 진행할 수 있습니다.
+    """
+    status, extracted = extract_with_rules(meeting_text)
+    if status == "complete":
+        return finish_extraction(extracted)
+    
+    human_msg = build_analysis_prompt(meeting_text)
+    
+    if use_cache:
+        cached = get_cached_analysis(human_msg)
+        if cached is not None:
+            return cached
+    
+    if status == "partial":
+        response = extracted
+    else:
+        response = await _request_analysis_async(human_msg)
+        if response is None:
+            return None
+    analyzed_data = await complete_analysis_async(meeting_text, response)
+    if use_cache and analyzed_data:
+        store_analysis(human_msg, analyzed_data)
+    return analyzed_data
 
 # 메인 실행 블록
-if __name__ == "__main__":
+def main():
+    load_environment()
     print("Claude 회의록 분석기를 실행합니다...")
     
     # 테스트용 샘플 회의록
@@ -99,4 +473,7 @@ if __name__ == "__main__":
         print("\n--- Claude 분석 결과 (JSON 예상) ---")
         print(analysis_result)
     else:
-        print("회의록 분석에 실패했습니다.") 
\ No newline at end of file
+        print("회의록 분석에 실패했습니다.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import weakref
+import threading
+from config import get_setting
+
+# 서비스별 인증 정보 환경 변수
+CREDENTIAL_ENV = {
+    "anthropic": "ANTHROPIC_API_KEY",
+    "notion": "NOTION_API_KEY",
+}
+
+# 오류 메시지에 표시할 서비스 이름
+SERVICE_NAMES = {
+    "anthropic": "Anthropic",
+    "notion": "Notion",
+}
+
+class MissingCredentialError(RuntimeError):
+    """
+    API 키 등 인증 정보가 설정되지 않았을 때 발생합니다.
+    프로세스를 종료하지 않으므로 호출하는 쪽(Streamlit 앱 등)에서 처리할 수 있습니다.
+    """
+
+    def __init__(self, service, env_name):
+        self.service = service
+        self.env_name = env_name
+        super().__init__(
+            f"{SERVICE_NAMES.get(service, service)} API 키가 설정되지 않았습니다. "
+            f"환경 변수 {env_name}를 설정하거나 .env 파일에 추가해주세요."
+        )
+
+# 동기 클라이언트: (서비스, 인증 정보) → 클라이언트
+_clients = {}
+_clients_lock = threading.Lock()
+
+# 비동기 클라이언트는 이벤트 루프에 묶이므로 루프별로 따로 보관
+_async_clients = weakref.WeakKeyDictionary()
+
+def get_credential(service, credential=None):
+    """인자로 받은 값이나 환경 변수에서 인증 정보를 가져오고, 없으면 MissingCredentialError를 발생시킵니다."""
+    env_name = CREDENTIAL_ENV[service]
+    credential = credential or get_setting(env_name)
+    if not credential:
+        raise MissingCredentialError(service, env_name)
+    return credential
+
+def has_credential(service):
+    """해당 서비스의 인증 정보가 환경 변수에 설정되어 있는지 확인합니다."""
+    return bool(get_setting(CREDENTIAL_ENV[service]))
+
+def _get_or_create(key, factory):
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = factory()
+            _clients[key] = client
+        return client
+
+def _get_or_create_async(key, factory):
+    # asyncio는 import 비용이 커서 비동기 경로에서만 불러옴 (다른 모듈의 비동기 함수도 같은 이유로 함수 안에서 import)
+    import asyncio
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+    client = clients.get(key)
+    if client is None:
+        client = factory()
+        clients[key] = client
+    return client
+
+def get_anthropic_client(api_key=None):
+    """프로세스 전체에서 공유하는 Anthropic 클라이언트를 반환합니다 (처음 호출 시 생성)."""
+    api_key = get_credential("anthropic", api_key)
+
+    def factory():
+        import anthropic
+        # 재시도는 rate_limiter가 서비스 예산과 함께 관리하므로 SDK 자체 재시도는 끔
+        # (대체 서버 주소 ANTHROPIC_BASE_URL 환경 변수는 SDK가 직접 읽음)
+        return anthropic.Anthropic(api_key=api_key, max_retries=0)
+
+    return _get_or_create(("anthropic", api_key), factory)
+
+def get_async_anthropic_client(api_key=None):
+    """현재 이벤트 루프에서 공유하는 AsyncAnthropic 클라이언트를 반환합니다."""
+    api_key = get_credential("anthropic", api_key)
+
+    def factory():
+        import anthropic
+        return anthropic.AsyncAnthropic(api_key=api_key, max_retries=0)
+
+    return _get_or_create_async(("anthropic", api_key), factory)
+
+def _notion_options():
+    # NOTION_BASE_URL: 테스트·벤치마크용 대체 서버 주소 (기본값은 SDK의 https://api.notion.com)
+    base_url = get_setting("NOTION_BASE_URL")
+    return {"base_url": base_url} if base_url else {}
+
+def get_notion_client(api_key=None):
+    """프로세스 전체에서 공유하는 Notion 클라이언트를 반환합니다 (연결 재사용)."""
+    api_key = get_credential("notion", api_key)
+
+    def factory():
+        from notion_client import Client
+        return Client(auth=api_key, **_notion_options())
+
+    return _get_or_create(("notion", api_key), factory)
+
+def get_async_notion_client(api_key=None):
+    """현재 이벤트 루프에서 공유하는 Notion AsyncClient를 반환합니다."""
+    api_key = get_credential("notion", api_key)
+
+    def factory():
+        from notion_client import AsyncClient
+        return AsyncClient(auth=api_key, **_notion_options())
+
+    return _get_or_create_async(("notion", api_key), factory)
+
+def get_http_session():
+    """슬랙 웹훅 등 일반 HTTP 호출에 공유하는 requests.Session을 반환합니다."""
+
+    def factory():
+        import requests
+        return requests.Session()
+
+    return _get_or_create(("http", None), factory)
+
+def get_async_http_client():
+    """현재 이벤트 루프에서 공유하는 httpx.AsyncClient를 반환합니다."""
+
+    def factory():
+        import httpx
+        return httpx.AsyncClient()
+
+    return _get_or_create_async(("http", None), factory)
+
+async def aclose_async_clients():
+    """현재 이벤트 루프에 묶인 비동기 클라이언트를 모두 닫습니다. asyncio.run 종료 전에 호출합니다."""
+    import asyncio
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        close = getattr(client, "aclose", None) or getattr(client, "close", None)
+        if close is not None:
+            await close()
+
+def close_clients():
+    """동기 클라이언트를 모두 닫고 레지스트리를 비웁니다."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        close = getattr(client, "close", None)
+        if close is not None:
+            close()
+
+def _warm_up_anthropic():
+    from rate_limiter import acquire
+    acquire("anthropic")
+    # 토큰을 쓰지 않는 모델 목록 조회로 연결만 맺어 둠
+    get_anthropic_client().models.list(limit=1)
+
+def _warm_up_notion():
+    # 데이터베이스가 설정되어 있으면 연결과 함께 스키마도 미리 조회해 둠
+    if get_setting("NOTION_DATABASE_ID"):
+        from notion_connector import get_database_schema
+        get_database_schema()
+        return
+    from rate_limiter import acquire
+    acquire("notion")
+    get_notion_client().users.me()
+
+# 서비스별 예열 함수 (SDK 로딩 + 가벼운 API 호출)
+WARM_UP_CALLS = {
+    "anthropic": _warm_up_anthropic,
+    "notion": _warm_up_notion,
+}
+
+def warm_up_clients(services=None):
+    """
+    인증 정보가 설정된 서비스의 SDK를 미리 불러오고 가벼운 API 호출로 연결(TLS 핸드셰이크)을 맺어 둡니다.
+    첫 요청에서 SDK 로딩과 연결 지연을 겪지 않도록 화면을 그린 뒤 호출합니다.
+    백그라운드 데몬 스레드에서 실행되며, 실패해도 실제 요청 때 다시 연결하므로 무시합니다.
+
+    Returns:
+        threading.Thread: 예열 스레드
+    """
+    services = list(services or WARM_UP_CALLS)
+
+    def run():
+        for service in services:
+            if not has_credential(service):
+                continue
+            try:
+                WARM_UP_CALLS[service]()
+            except Exception as e:
+                print(f"{SERVICE_NAMES.get(service, service)} 연결 예열 실패 (무시): {e}")
+        get_http_session()
+
+    thread = threading.Thread(target=run, name="client-warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,41 @@
+import os
+import threading
+
+# .env 파일은 모듈을 import할 때가 아니라 설정 값을 처음 읽을 때 한 번만 로드합니다.
+# (import만으로 환경 변수가 바뀌지 않도록 해 시작 시간과 테스트 격리를 보장)
+# 모든 모듈은 설정 값을 import 시점이 아니라 사용할 때 get_setting 계열 함수로 읽으므로 .env 값이 항상 적용됩니다.
+_env_loaded = False
+_env_lock = threading.Lock()
+
+def load_environment():
+    """.env 파일이 있으면 환경 변수로 로드합니다. 여러 번 호출해도 처음 한 번만 읽습니다."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _env_lock:
+        if _env_loaded:
+            return
+        try:
+            from dotenv import load_dotenv
+            load_dotenv()
+        except ImportError:
+            # dotenv 패키지가 설치되지 않았을 경우 무시
+            pass
+        _env_loaded = True
+
+def get_setting(name, default=None):
+    """환경 변수 값을 반환합니다 (.env 파일 포함). 없으면 default를 반환합니다."""
+    load_environment()
+    return os.environ.get(name, default)
+
+def get_int_setting(name, default):
+    """정수 설정 값을 반환합니다 (.env 파일 포함)."""
+    return int(get_setting(name, default))
+
+def get_float_setting(name, default):
+    """실수 설정 값을 반환합니다 (.env 파일 포함)."""
+    return float(get_setting(name, default))
+
+def get_flag(name):
+    """1/true/yes로 설정된 환경 변수면 True를 반환합니다 (.env 파일 포함)."""
+    return (get_setting(name) or "").lower() in ("1", "true", "yes")
@@ -0,0 +1,557 @@
+import re
+import json
+import time
+import uuid
+import random
+import hashlib
+import threading
+from partial_json import parse_partial_json
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# 서비스별 기본 동작 설정
+# - latency: 응답 전 기본 지연(초), jitter: 지연에 더할 무작위 비율 (0.2 = ±20%)
+# - latency_per_kb: 요청 본문 1KB당 추가 지연(초) - 긴 회의록일수록 분석이 오래 걸리는 상황 재현
+# - error_rate: 500 응답 비율, rate_limit_rate: 429 응답 비율, retry_after: 429 응답의 Retry-After(초)
+# - malformed_rate: (Anthropic) 코드 펜스·설명 문구·쉼표 오류가 섞이거나 잘린 분석 응답 비율 (도구 사용 요청은 잘린 응답만)
+# - batch_delay: (Anthropic) 메시지 배치를 만든 뒤 처리가 끝날 때까지 걸리는 시간(초)
+DEFAULT_BEHAVIOR = {
+    "latency": 0.0,
+    "jitter": 0.0,
+    "latency_per_kb": 0.0,
+    "error_rate": 0.0,
+    "rate_limit_rate": 0.0,
+    "retry_after": 1.0,
+    "malformed_rate": 0.0,
+    "batch_delay": 1.0,
+}
+
+FAKE_MODEL_NAME = "claude-3-haiku-20240307"
+NOTION_PAGE_SIZE = 100
+
+# 가짜 노션 회의록 데이터베이스의 속성 (이름 → 타입, 선택지)
+FAKE_NOTION_PROPERTIES = {
+    "이름": ("title", None),
+    "일자": ("date", None),
+    "참석자": ("multi_select", []),
+    "회의 리드": ("rich_text", None),
+    "진행 단계": ("status", ["시작 전", "시작 후", "완료"]),
+    "회의 목적": ("rich_text", None),
+    "주요 결정 사항": ("rich_text", None),
+    "후속 액션": ("rich_text", None),
+    "최종 편집 일시": ("last_edited_time", None),
+}
+
+# 분석 응답을 만들 때 사용하는 회의록 패턴
+# 화자는 클로바 노트 헤더("김팀장 00:03")나 전처리한 발화("김팀장: ...")에서 찾음
+SPEAKER_LINE = re.compile(r"^\s*(\S+?)(?:\s+\d{1,2}:\d{2}(?::\d{2})?\s*$|:\s)", re.MULTILINE)
+AGENDA_LINE = re.compile(r"^\s*#{1,6}\s*(?:\d+[.)]\s*)?(.+?)\s*$", re.MULTILINE)
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+def _error_payload(service, status):
+    if service == "anthropic":
+        error_type = "rate_limit_error" if status == 429 else "api_error"
+        return {"type": "error", "error": {"type": error_type, "message": f"fake {error_type}"}}
+    if service == "notion":
+        code = "rate_limited" if status == 429 else "internal_server_error"
+        return {"object": "error", "status": status, "code": code, "message": f"fake {code}"}
+    return b"rate_limited" if status == 429 else b"internal_error"
+
+def fake_meeting_analysis(transcript):
+    """
+    회의록 텍스트에서 화자·안건·날짜를 뽑아 claude_analyzer 프롬프트 형식에 맞는 분석 결과를 만듭니다.
+    실제 모델 대신 결정적인 결과를 돌려주므로 같은 입력이면 항상 같은 응답이 나옵니다.
+    """
+    speakers = list(dict.fromkeys(SPEAKER_LINE.findall(transcript)))
+    agendas = list(dict.fromkeys(AGENDA_LINE.findall(transcript)))
+    date = DATE_PATTERN.search(transcript)
+    lines = [line.strip() for line in transcript.splitlines() if line.strip()]
+    lead = speakers[0] if speakers else ""
+
+    return {
+        "회의 제목": lines[0][:100] if lines else "무제 회의록",
+        "회의 리드": lead,
+        "참석자": ", ".join(speakers),
+        "일자": date.group(0) if date else "",
+        "진행 단계": "시작 후",
+        "아젠다 사전 공유": speakers[:2],
+        "회의 목적": f"{', '.join(agendas[:3])} 논의" if agendas else "",
+        "회의 아젠다": [{"항목 제목": agenda, "소요시간": "10분", "관련 자료": ""} for agenda in agendas],
+        "주요 논의 내용": [
+            {"아젠다 제목": agenda, "논의 내용": [f"{agenda} 진행 상황 공유", f"{agenda} 관련 리스크 검토"]}
+            for agenda in agendas
+        ],
+        "주요 결정 사항": [{"제목": f"{agenda} 방향 확정", "세부 내용": f"{lead}님이 정리하여 공유"} for agenda in agendas],
+        "후속 액션": [f"{speakers[i % len(speakers)] if speakers else lead}: {agenda} 후속 작업" for i, agenda in enumerate(agendas)],
+        "회의 피드백": {"좋았던 점": "안건별 논의가 빠르게 진행됨", "개선할 점": "", "다음 회의 제안 사항": ""},
+        "다음 회의 일정": {"일시": "", "장소": "", "주요 아젠다": ""},
+    }
+
+def fake_database(database_id):
+    """databases.retrieve 응답 형식의 가짜 회의록 데이터베이스를 만듭니다."""
+    properties = {}
+    for name, (prop_type, options) in FAKE_NOTION_PROPERTIES.items():
+        config = {} if options is None else {"options": [{"id": str(i), "name": option} for i, option in enumerate(options)]}
+        properties[name] = {"id": name, "name": name, "type": prop_type, prop_type: config}
+    return {"object": "database", "id": database_id, "title": [{"type": "text", "text": {"content": "회의록"}}],
+            "properties": properties}
+
+def _property_errors(properties):
+    """노션처럼 데이터베이스에 없는 속성이나 타입이 다른 값을 찾아 오류 메시지 목록을 반환합니다."""
+    errors = []
+    for name, value in (properties or {}).items():
+        prop_type, options = FAKE_NOTION_PROPERTIES.get(name, (None, None))
+        if prop_type is None:
+            errors.append(f"{name} is not a property that exists.")
+        elif not isinstance(value, dict) or prop_type not in value:
+            errors.append(f"{name} is expected to be {prop_type}.")
+        elif prop_type == "status" and value[prop_type].get("name") not in options:
+            errors.append(f"Invalid status option for {name}.")
+    return errors
+
+def malform_analysis(text, kind):
+    """
+    분석 응답 JSON을 모델이 자주 내는 형태로 망가뜨립니다.
+    kind: "fence"(코드 펜스와 설명 문구), "comma"(닫는 괄호 앞 쉼표), "truncated"(응답 뒷부분 잘림)
+    """
+    if kind == "fence":
+        return f"분석 결과입니다.\n```json\n{text}\n```\n추가로 궁금한 점이 있으면 알려주세요."
+    if kind == "comma":
+        return text.replace("\n  }", ",\n  }").replace("\n}", ",\n}")
+    return text[:len(text) * 2 // 3]
+
+MALFORMED_KINDS = ("fence", "comma", "truncated")
+
+def _message_text(body):
+    """Messages API 요청 본문에서 마지막 사용자 메시지의 텍스트를 꺼냅니다."""
+    messages = body.get("messages") or [{}]
+    content = messages[-1].get("content", "")
+    if isinstance(content, list):
+        content = "".join(block.get("text", "") for block in content if isinstance(block, dict))
+    return content
+
+def _transcript_from_prompt(prompt):
+    start = prompt.find('"""')
+    end = prompt.find('"""', start + 3)
+    return prompt[start + 3:end] if start != -1 and end != -1 else prompt
+
+def _sse(events):
+    return "".join(f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n" for name, data in events).encode("utf-8")
+
+class _Handler(BaseHTTPRequestHandler):
+    # keep-alive 응답으로 클라이언트의 연결 재사용이 실제와 같게 동작하도록 함
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeService/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, headers, payload = self.server.fake.handle(self.command, self.path, body)
+
+        if isinstance(payload, bytes):
+            data = payload
+            headers.setdefault("Content-Type", "text/plain; charset=utf-8")
+        else:
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            headers.setdefault("Content-Type", "application/json")
+
+        try:
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 타임아웃으로 먼저 연결을 끊은 경우
+            self.close_connection = True
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+class FakeServiceServer:
+    """
+    Anthropic·Notion·Slack API를 흉내 내는 로컬 HTTP 서버입니다 (벤치마크·테스트용).
+    서비스별로 응답 지연, 오류율, 429 응답 비율을 설정할 수 있고 요청 통계를 기록합니다.
+
+    사용 예:
+        with FakeServiceServer("notion", {"latency": 0.1, "rate_limit_rate": 0.05}) as server:
+            os.environ["NOTION_BASE_URL"] = server.url
+    """
+
+    def __init__(self, service, behavior=None, seed=None, host="127.0.0.1", port=0):
+        if service not in ("anthropic", "notion", "slack"):
+            raise ValueError(f"지원하지 않는 서비스입니다: {service}")
+        self.service = service
+        self.behavior = dict(DEFAULT_BEHAVIOR, **(behavior or {}))
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {}
+        self.reset_stats()
+
+        # 노션: 페이지(또는 블록) ID → 자식 블록 목록, 페이지 ID → 페이지 (databases.query 응답용)
+        self._children = {}
+        self._pages = {}
+        # Anthropic: 메시지 배치 ID → 배치 (생성 시각, 요청 목록)
+        self._batches = {}
+        # 프롬프트 캐시에 저장된 앞부분(도구 정의 + 시스템 프롬프트)의 해시
+        self._prompt_cache = set()
+
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name=f"fake-{self.service}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def reset_stats(self):
+        """요청 통계를 초기화하고 이전 값을 반환합니다."""
+        with self._lock:
+            previous = self.stats
+            self.stats = {"requests": 0, "ok": 0, "rate_limited": 0, "errors": 0, "not_found": 0, "rejected": 0, "malformed": 0}
+        return previous
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _roll(self, body_size):
+        """이번 요청의 지연 시간과 결과(정상/429/500)를 정합니다."""
+        behavior = self.behavior
+        with self._lock:
+            jitter = self._random.uniform(-behavior["jitter"], behavior["jitter"])
+            outcome = self._random.random()
+        delay = max(0.0, behavior["latency"] * (1 + jitter) + behavior["latency_per_kb"] * body_size / 1024)
+        if outcome < behavior["rate_limit_rate"]:
+            return delay, 429
+        if outcome < behavior["rate_limit_rate"] + behavior["error_rate"]:
+            return delay, 500
+        return delay, 200
+
+    def handle(self, method, path, body):
+        """요청 하나를 처리하고 (상태 코드, 헤더, 본문)을 반환합니다. 본문이 bytes가 아니면 JSON으로 보냅니다."""
+        self._count("requests")
+        delay, status = self._roll(len(body))
+        time.sleep(delay)
+
+        if status == 429:
+            self._count("rate_limited")
+            return 429, {"Retry-After": str(self.behavior["retry_after"])}, _error_payload(self.service, 429)
+        if status == 500:
+            self._count("errors")
+            return 500, {}, _error_payload(self.service, 500)
+
+        parts = urlsplit(path)
+        try:
+            data = json.loads(body) if body and self.service != "slack" else {}
+        except ValueError:
+            data = {}
+        result = getattr(self, f"_route_{self.service}")(method, parts.path.rstrip("/"), parse_qs(parts.query), data)
+        if result is None:
+            self._count("not_found")
+            return 404, {}, _error_payload(self.service, 404)
+        if result[0] < 400:
+            self._count("ok")
+        return result
+
+    # --- Anthropic ---
+
+    def _route_anthropic(self, method, path, query, body):
+        if method == "POST" and path == "/v1/messages":
+            return self._anthropic_message(body)
+        if path.startswith("/v1/messages/batches"):
+            return self._anthropic_batches(method, path.split("/")[4:], body)
+        if method == "GET" and path == "/v1/models":
+            model = {"type": "model", "id": FAKE_MODEL_NAME, "display_name": "Fake Haiku", "created_at": "2024-03-07T00:00:00Z"}
+            return 200, {}, {"data": [model], "has_more": False, "first_id": FAKE_MODEL_NAME, "last_id": FAKE_MODEL_NAME}
+        return None
+
+    def _anthropic_message(self, body):
+        message = self._anthropic_reply(body)
+        if not body.get("stream"):
+            return 200, {}, message
+        return self._anthropic_stream(message)
+
+    def _anthropic_reply(self, body):
+        """Messages API 요청 하나에 대한 응답 메시지 객체를 만듭니다."""
+        prompt = _message_text(body)
+        analysis = fake_meeting_analysis(_transcript_from_prompt(prompt))
+        tool = (body.get("tools") or [None])[0]
+        if tool:
+            # 도구 입력 스키마에 정의된 항목만 응답 (부족한 항목만 다시 요청한 경우 포함)
+            requested = tool.get("input_schema", {}).get("properties", {})
+            analysis = {key: analysis[key] for key in requested if key in analysis}
+        text = json.dumps(analysis, ensure_ascii=False, indent=2)
+        stop_reason = "tool_use" if tool else "end_turn"
+        with self._lock:
+            malformed = self._random.random() < self.behavior["malformed_rate"]
+            # 도구 입력은 항상 올바른 JSON이므로 잘린 응답만 재현
+            kind = "truncated" if tool else self._random.choice(MALFORMED_KINDS)
+        if malformed:
+            self._count("malformed")
+            text = malform_analysis(text, kind)
+            if kind == "truncated":
+                stop_reason = "max_tokens"
+        max_chars = int(body.get("max_tokens") or 0) * 2
+        if max_chars and len(text) > max_chars:
+            # max_tokens보다 긴 응답은 실제 API처럼 잘라서 반환
+            text = text[:max_chars]
+            stop_reason = "max_tokens"
+        if tool:
+            content = {"type": "tool_use", "id": f"toolu_{uuid.uuid4().hex[:24]}", "name": tool["name"],
+                       "input": parse_partial_json(text) if stop_reason == "max_tokens" else analysis}
+        else:
+            content = {"type": "text", "text": text}
+        message = {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", FAKE_MODEL_NAME),
+            "content": [content],
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": self._usage(body, prompt, text),
+        }
+        return message
+
+    def _usage(self, body, prompt, text):
+        """
+        응답의 토큰 사용량을 계산합니다. 한국어는 대략 2글자당 1토큰으로 계산합니다.
+        시스템 프롬프트에 cache_control이 있으면 도구 정의와 시스템 프롬프트를 캐시하여,
+        같은 앞부분으로 다시 요청하면 그만큼을 cache_read_input_tokens로 돌려줍니다.
+        """
+        usage = {"input_tokens": max(1, len(prompt) // 2), "output_tokens": max(1, len(text) // 2),
+                 "cache_creation_input_tokens": 0, "cache_read_input_tokens": 0}
+        system = body.get("system") or []
+        if isinstance(system, list) and any("cache_control" in block for block in system):
+            prefix = json.dumps([body.get("tools"), system], ensure_ascii=False, sort_keys=True)
+            digest = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+            with self._lock:
+                cached = digest in self._prompt_cache
+                self._prompt_cache.add(digest)
+            usage["cache_read_input_tokens" if cached else "cache_creation_input_tokens"] = len(prefix) // 2
+        return usage
+
+    def _anthropic_stream(self, message):
+        block = message["content"][0]
+        usage = message["usage"]
+        stop_reason = message["stop_reason"]
+        started = dict(message, content=[], stop_reason=None, usage=dict(usage, output_tokens=1))
+        if block["type"] == "tool_use":
+            text = json.dumps(block["input"], ensure_ascii=False)
+            start_block = dict(block, input={})
+            delta_type, delta_key = "input_json_delta", "partial_json"
+        else:
+            text = block["text"]
+            start_block = {"type": "text", "text": ""}
+            delta_type, delta_key = "text_delta", "text"
+        events = [("message_start", {"type": "message_start", "message": started}),
+                  ("content_block_start", {"type": "content_block_start", "index": 0, "content_block": start_block})]
+        for i in range(0, len(text), 64):
+            events.append(("content_block_delta", {
+                "type": "content_block_delta", "index": 0, "delta": {"type": delta_type, delta_key: text[i:i + 64]},
+            }))
+        events += [("content_block_stop", {"type": "content_block_stop", "index": 0}),
+                   ("message_delta", {"type": "message_delta", "delta": {"stop_reason": stop_reason, "stop_sequence": None},
+                                      "usage": {"output_tokens": usage["output_tokens"]}}),
+                   ("message_stop", {"type": "message_stop"})]
+        return 200, {"Content-Type": "text/event-stream"}, _sse(events)
+
+    def _batch_object(self, batch):
+        """메시지 배치 상태 객체를 만듭니다. 생성 후 batch_delay초가 지나면 처리가 끝난 것으로 봅니다."""
+        ended = time.time() >= batch["created"] + self.behavior["batch_delay"]
+        total = len(batch["requests"])
+        created_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(batch["created"]))
+        return {
+            "id": batch["id"],
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {"processing": 0 if ended else total, "succeeded": total if ended else 0,
+                               "errored": 0, "canceled": 0, "expired": 0},
+            "created_at": created_at,
+            "ended_at": time.strftime("%Y-%m-%dT%H:%M:%SZ") if ended else None,
+            "expires_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(batch["created"] + 24 * 60 * 60)),
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{self.url}/v1/messages/batches/{batch['id']}/results" if ended else None,
+        }
+
+    def _anthropic_batches(self, method, segments, body):
+        if method == "POST" and not segments:
+            batch = {"id": f"msgbatch_{uuid.uuid4().hex[:24]}", "created": time.time(), "requests": body.get("requests", [])}
+            with self._lock:
+                self._batches[batch["id"]] = batch
+            return 200, {}, self._batch_object(batch)
+
+        with self._lock:
+            batch = self._batches.get(segments[0]) if segments else None
+        if batch is None:
+            return None
+        if method == "GET" and len(segments) == 1:
+            return 200, {}, self._batch_object(batch)
+        if method == "GET" and segments[1:] == ["results"]:
+            if self._batch_object(batch)["processing_status"] != "ended":
+                return None
+            # 결과는 요청 순서와 다를 수 있으므로 실제 API처럼 섞어서 반환
+            requests = list(batch["requests"])
+            with self._lock:
+                self._random.shuffle(requests)
+            lines = [json.dumps({"custom_id": request["custom_id"],
+                                 "result": {"type": "succeeded", "message": self._anthropic_reply(request["params"])}},
+                                ensure_ascii=False)
+                     for request in requests]
+            return 200, {"Content-Type": "application/binary"}, "\n".join(lines).encode("utf-8")
+        return None
+
+    # --- Notion ---
+
+    def _new_blocks(self, parent_id, children):
+        blocks = []
+        with self._lock:
+            for child in children or []:
+                block_type = child.get("type", "paragraph")
+                block = {"object": "block", "id": str(uuid.uuid4()), "type": block_type, block_type: child.get(block_type, {})}
+                self._children.setdefault(parent_id, []).append(block)
+                blocks.append(block)
+        return blocks
+
+    def _save_page(self, page_id, database_id, properties):
+        """
+        생성·갱신한 페이지를 databases.query 응답 형식으로 보관합니다.
+        노션처럼 created_time·last_edited_time은 분 단위로 내림하고, 리치 텍스트에 plain_text를 붙입니다.
+        """
+        now = time.strftime("%Y-%m-%dT%H:%M:00.000Z", time.gmtime())
+        read_properties = {}
+        for name, value in (properties or {}).items():
+            prop_type = next(iter(value), None)
+            content = value.get(prop_type)
+            if prop_type in ("title", "rich_text"):
+                content = [dict(item, type="text", plain_text=item.get("text", {}).get("content", "")) for item in content]
+            read_properties[name] = {"id": name, "type": prop_type, prop_type: content}
+        with self._lock:
+            page = self._pages.get(page_id)
+            if page is None:
+                page = self._pages[page_id] = {
+                    "object": "page", "id": page_id, "created_time": now, "archived": False, "in_trash": False,
+                    "parent": {"type": "database_id", "database_id": database_id}, "properties": {},
+                    "url": f"https://www.notion.so/{page_id.replace('-', '')}",
+                }
+            page["properties"].update(read_properties)
+            page["last_edited_time"] = now
+            return dict(page)
+
+    def _query_pages(self, database_id, body):
+        """databases.query: last_edited_time 필터·정렬과 페이지 단위 조회(start_cursor, page_size)만 지원합니다."""
+        condition = (body.get("filter") or {}).get("last_edited_time") or {}
+        since = condition.get("on_or_after") or condition.get("after")
+        with self._lock:
+            pages = [dict(page) for page in self._pages.values() if page["parent"]["database_id"] == database_id]
+        if since:
+            # ISO 8601 문자열은 같은 형식이면 사전순 비교가 시간순 비교와 같음
+            since = since.replace("+00:00", "Z")
+            pages = [page for page in pages
+                     if page["last_edited_time"] > since or (page["last_edited_time"] == since and "on_or_after" in condition)]
+        pages.sort(key=lambda page: (page["last_edited_time"], page["id"]))
+        start = int(body.get("start_cursor") or 0)
+        size = int(body.get("page_size") or NOTION_PAGE_SIZE)
+        has_more = start + size < len(pages)
+        return {"object": "list", "results": pages[start:start + size], "has_more": has_more,
+                "next_cursor": str(start + size) if has_more else None}
+
+    def _route_notion(self, method, path, query, body):
+        segments = path.split("/")[2:]  # "/v1/..." 이후
+        if method in ("POST", "PATCH") and segments[:1] == ["pages"]:
+            errors = _property_errors(body.get("properties"))
+            if errors:
+                self._count("rejected")
+                return 400, {}, {"object": "error", "status": 400, "code": "validation_error", "message": " ".join(errors)}
+        if method == "GET" and len(segments) == 2 and segments[0] == "databases":
+            return 200, {}, fake_database(segments[1])
+        if method == "POST" and len(segments) == 3 and segments[0] == "databases" and segments[2] == "query":
+            return 200, {}, self._query_pages(segments[1], body)
+        if method == "POST" and segments == ["pages"]:
+            page_id = str(uuid.uuid4())
+            self._new_blocks(page_id, body.get("children"))
+            database_id = (body.get("parent") or {}).get("database_id")
+            return 200, {}, self._save_page(page_id, database_id, body.get("properties"))
+        if method == "PATCH" and len(segments) == 2 and segments[0] == "pages":
+            with self._lock:
+                database_id = self._pages[segments[1]]["parent"]["database_id"] if segments[1] in self._pages else None
+            return 200, {}, self._save_page(segments[1], database_id, body.get("properties"))
+        if len(segments) == 3 and segments[0] == "blocks" and segments[2] == "children":
+            block_id = segments[1]
+            if method == "PATCH":
+                return 200, {}, {"object": "list", "results": self._new_blocks(block_id, body.get("children")), "has_more": False, "next_cursor": None}
+            if method == "GET":
+                with self._lock:
+                    children = list(self._children.get(block_id, []))
+                start = int((query.get("start_cursor") or ["0"])[0])
+                size = int((query.get("page_size") or [NOTION_PAGE_SIZE])[0])
+                page = children[start:start + size]
+                has_more = start + size < len(children)
+                return 200, {}, {"object": "list", "results": page, "has_more": has_more,
+                                 "next_cursor": str(start + size) if has_more else None}
+        if method == "DELETE" and len(segments) == 2 and segments[0] == "blocks":
+            with self._lock:
+                for children in self._children.values():
+                    children[:] = [block for block in children if block["id"] != segments[1]]
+            return 200, {}, {"object": "block", "id": segments[1], "archived": True}
+        if method == "GET" and segments == ["users", "me"]:
+            return 200, {}, {"object": "user", "id": str(uuid.UUID(int=0)), "type": "bot", "name": "fake-integration"}
+        return None
+
+    # --- Slack ---
+
+    def _route_slack(self, method, path, query, body):
+        if method == "POST":
+            return 200, {}, b"ok"
+        return None
+
+def start_fake_services(behaviors=None, seed=None):
+    """
+    세 서비스의 가짜 서버를 모두 시작하고 {서비스: 서버} 딕셔너리를 반환합니다.
+    behaviors는 {서비스: 동작 설정} 형식이며, 각 서버는 seed에서 파생한 시드를 사용합니다.
+    """
+    behaviors = behaviors or {}
+    servers = {}
+    for offset, service in enumerate(("anthropic", "notion", "slack")):
+        server_seed = None if seed is None else seed + offset
+        servers[service] = FakeServiceServer(service, behaviors.get(service), seed=server_seed).start()
+    return servers
+
+def service_environment(servers):
+    """가짜 서버를 가리키도록 설정할 환경 변수 딕셔너리를 반환합니다."""
+    env = {}
+    if "anthropic" in servers:
+        env["ANTHROPIC_BASE_URL"] = servers["anthropic"].url
+        env["ANTHROPIC_API_KEY"] = "fake-anthropic-key"
+    if "notion" in servers:
+        env["NOTION_BASE_URL"] = servers["notion"].url
+        env["NOTION_API_KEY"] = "fake-notion-key"
+        env["NOTION_DATABASE_ID"] = "00000000000000000000000000000000"
+    if "slack" in servers:
+        env["SLACK_WEBHOOK_URL"] = f"{servers['slack'].url}/services/fake/webhook"
+    return env
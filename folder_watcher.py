@@ -0,0 +1,261 @@
+import os
+import time
+import fnmatch
+import sqlite3
+import hashlib
+import threading
+from config import get_setting, get_int_setting, get_float_setting
+from tracing import span
+import job_queue
+from job_queue import STATUS_SUCCEEDED, STATUS_FAILED, FINISHED_STATUSES
+
+# 폴더 감시 설정 (환경 변수로 변경 가능, 사용할 때 읽음)
+# - WATCH_STATE_PATH: 파일별 처리 기록(수정 시각, 크기, 내용 해시)을 저장하는 SQLite 파일
+# - WATCH_POLL_INTERVAL: 폴더를 다시 확인하는 간격 (초)
+# - WATCH_SETTLE_SECONDS: 마지막 수정 후 이 시간이 지나야 처리 (동기화 중인 파일을 읽지 않도록)
+# - WATCH_MAX_PENDING: 작업 큐에 동시에 올려 둘 최대 파일 수 (넘으면 다음 확인 때 제출)
+def get_state_path():
+    """파일별 처리 기록 파일 경로를 반환합니다."""
+    return get_setting("WATCH_STATE_PATH", os.path.join(".cache", "watch_state.sqlite3"))
+
+# 작업 큐에 없는 파일 상태
+STATUS_SKIPPED = "skipped"
+
+def file_digest(path):
+    """파일 내용의 SHA-256 해시를 반환합니다."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class WatchState:
+    """
+    감시 폴더의 파일 경로 → 수정 시각·크기·내용 해시·작업 상태를 기록하는 SQLite 저장소입니다.
+    데몬을 다시 시작해도 이미 처리한 파일은 다시 제출하지 않습니다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path = path or get_state_path()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    mtime REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    digest TEXT,
+                    job_id TEXT,
+                    status TEXT,
+                    page_id TEXT,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_files_status ON files (status)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def load(self):
+        """모든 기록을 {경로: 기록} 딕셔너리로 반환합니다."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT path, mtime, size, digest, job_id, status, page_id FROM files"
+            ).fetchall()
+        return {
+            row[0]: dict(zip(("path", "mtime", "size", "digest", "job_id", "status", "page_id"), row))
+            for row in rows
+        }
+
+    def record(self, path, mtime, size, digest=None, job_id=None, status=None, page_id=None):
+        """파일 기록을 추가하거나 갱신합니다. 값이 None인 digest·job_id·status·page_id는 기존 값을 유지합니다."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO files (path, mtime, size, digest, job_id, status, page_id, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    mtime = excluded.mtime,
+                    size = excluded.size,
+                    digest = COALESCE(excluded.digest, files.digest),
+                    job_id = COALESCE(excluded.job_id, files.job_id),
+                    status = COALESCE(excluded.status, files.status),
+                    page_id = COALESCE(excluded.page_id, files.page_id),
+                    updated_at = excluded.updated_at
+                """,
+                (path, mtime, size, digest, job_id, status, page_id, time.time()),
+            )
+
+    def update_status(self, path, status, page_id=None):
+        """작업이 끝난 파일의 상태와 노션 페이지 ID를 기록합니다."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE files SET status = ?, page_id = COALESCE(?, page_id), updated_at = ? WHERE path = ?",
+                (status, page_id, time.time(), path),
+            )
+
+    def reset_failed(self):
+        """
+        처리에 실패한 파일의 수정 시각과 해시를 지워 다음 확인 때 다시 제출되게 합니다.
+        실패한 파일은 같은 실행 중에는 내용이 바뀔 때까지 재시도하지 않고, 데몬을 다시 시작할 때 한 번 재시도합니다.
+        """
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE files SET mtime = 0, digest = NULL, updated_at = ? WHERE status = ?",
+                (time.time(), STATUS_FAILED),
+            )
+            return cursor.rowcount
+
+class FolderWatcher:
+    """
+    폴더를 주기적으로 확인하여 새로 생기거나 내용이 바뀐 회의록 파일을 작업 큐에 제출합니다.
+
+    - 수정 시각과 크기가 기록과 같으면 파일을 읽지 않고, 달라졌을 때만 내용 해시를 비교합니다
+      (내용이 같으면 수정 시각만 갱신).
+    - 내용이 바뀐 파일은 이전에 만든 노션 페이지를 갱신합니다.
+    - 처리 중인 파일 수가 max_pending에 이르면 나머지는 다음 확인 때 제출하여,
+      작업 큐가 감당할 수 있는 만큼만 쌓이게 합니다 (백프레셔).
+    - 분석 → 노션 등록 → 슬랙 알림은 job_queue의 작업자 풀이 workers개까지 동시에 처리합니다.
+    """
+
+    def __init__(self, directory, pattern="*.txt", workers=None, max_pending=None,
+                 poll_interval=None, settle_seconds=None, state=None, queue_path=None, force=False):
+        self.directory = directory
+        self.pattern = pattern
+        self.workers = max(1, workers or job_queue.get_default_workers())
+        # WATCH_MAX_PENDING이 0이면 작업자 수의 2배
+        self.max_pending = max_pending or get_int_setting("WATCH_MAX_PENDING", 0) or self.workers * 2
+        self.poll_interval = poll_interval if poll_interval is not None else get_float_setting("WATCH_POLL_INTERVAL", 2)
+        self.settle_seconds = settle_seconds if settle_seconds is not None else get_float_setting("WATCH_SETTLE_SECONDS", 2)
+        self.state = state or WatchState()
+        self.queue_path = queue_path
+        self.force = force
+        self._stop = threading.Event()
+        self._pool = None
+
+    def _list_files(self):
+        """감시 폴더의 대상 파일을 (경로, 수정 시각, 크기) 목록으로 반환합니다 (이름순)."""
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file() and fnmatch.fnmatch(entry.name, self.pattern):
+                    stat = entry.stat()
+                    files.append((entry.path, stat.st_mtime, stat.st_size))
+        return sorted(files)
+
+    def _pending(self, records):
+        """처리 중인 파일 경로 집합을 반환합니다. 끝난 작업은 상태를 기록하고 결과를 출력합니다."""
+        pending = set()
+        for path, record in records.items():
+            if not record["job_id"] or record["status"] not in (job_queue.STATUS_QUEUED, job_queue.STATUS_RUNNING):
+                continue
+            job = job_queue.get_job(record["job_id"], self.queue_path)
+            if job is None:
+                # 작업 큐가 초기화된 경우: 실패로 기록하여 다음 실행 때 다시 제출
+                self.state.update_status(path, STATUS_FAILED)
+                continue
+            if job["status"] not in FINISHED_STATUSES:
+                pending.add(path)
+                continue
+            self.state.update_status(path, job["status"], job["page_id"])
+            record.update(status=job["status"], page_id=job["page_id"] or record["page_id"])
+            if job["status"] == STATUS_SUCCEEDED:
+                print(f"처리 완료: {path} → https://notion.so/{(job['page_id'] or '').replace('-', '')}")
+            else:
+                print(f"처리 실패: {path} ({job['error']})")
+        return pending
+
+    def scan(self):
+        """
+        폴더를 한 번 확인하여 바뀐 파일을 작업 큐에 제출합니다.
+
+        Returns:
+            dict: {"submitted", "pending", "deferred"} - 이번에 제출한 파일 수, 처리 중인 파일 수,
+                  처리 중인 파일이 많아 다음으로 미룬 파일 수
+        """
+        records = self.state.load()
+        pending = self._pending(records)
+        counts = {"submitted": 0, "pending": len(pending), "deferred": 0}
+        now = time.time()
+
+        for path, mtime, size in self._list_files():
+            record = records.get(path)
+            if path in pending or (record and record["mtime"] == mtime and record["size"] == size):
+                continue
+            if now - mtime < self.settle_seconds:
+                # 아직 쓰는 중일 수 있는 파일은 다음 확인 때 처리
+                continue
+            if len(pending) >= self.max_pending:
+                counts["deferred"] += 1
+                continue
+
+            try:
+                digest = file_digest(path)
+                if record and record["digest"] == digest:
+                    # 내용은 같고 수정 시각만 바뀐 파일 (다시 동기화된 경우 등)
+                    self.state.record(path, mtime, size)
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    meeting_text = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"회의록 파일을 읽을 수 없습니다: {path} ({e})")
+                continue
+
+            if not meeting_text.strip():
+                self.state.record(path, mtime, size, digest, status=STATUS_SKIPPED)
+                continue
+
+            # 내용이 바뀐 파일은 이전에 만든 노션 페이지를 갱신
+            page_id = record["page_id"] if record else None
+            job_id = job_queue.submit_job(meeting_text, force=self.force, page_id=page_id, path=self.queue_path)
+            self.state.record(path, mtime, size, digest, job_id=job_id, status=job_queue.STATUS_QUEUED)
+            pending.add(path)
+            counts["submitted"] += 1
+            print(f"{'변경' if record else '새'} 회의록 제출: {path}")
+
+        counts["pending"] = len(pending)
+        return counts
+
+    def run(self, once=False):
+        """
+        감시를 시작합니다. stop()을 호출하거나 Ctrl+C를 누를 때까지 poll_interval마다 폴더를 확인합니다.
+        once=True면 한 번 확인하고 제출한 작업이 모두 끝날 때까지 기다린 뒤 반환합니다.
+        """
+        if not os.path.isdir(self.directory):
+            print(f"감시할 디렉터리가 없습니다: {self.directory}")
+            return
+        job_queue.init_queue(self.queue_path)
+        retried = self.state.reset_failed()
+        if retried:
+            print(f"이전에 실패한 회의록 {retried}건을 다시 처리합니다.")
+        self._pool = job_queue.JobWorkerPool(self.workers, self.queue_path).start()
+        print(f"{self.directory} 폴더를 감시합니다 (패턴 {self.pattern}, 작업자 {self.workers}개). "
+              f"종료하려면 Ctrl+C를 누르세요.")
+
+        try:
+            while not self._stop.is_set():
+                with span("watch", directory=self.directory) as watch_span:
+                    counts = self.scan()
+                    watch_span.set(**counts)
+                if once and counts["pending"] == 0 and counts["deferred"] == 0:
+                    break
+                self._stop.wait(self.poll_interval)
+        except KeyboardInterrupt:
+            print("\n폴더 감시를 종료합니다. 남은 작업은 다음 실행 때 이어서 처리합니다.")
+        finally:
+            self._pool.stop(timeout=5)
+
+    def stop(self):
+        self._stop.set()
+
+def watch_folder(directory, pattern="*.txt", workers=None, force=False):
+    """폴더 감시 데몬을 실행합니다."""
+    FolderWatcher(directory, pattern=pattern, workers=workers, force=force).run()
@@ -0,0 +1,416 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import argparse
+import threading
+from config import get_setting, get_int_setting, get_float_setting, load_environment
+from tracing import span, mark_error, ensure_metrics_server
+
+# 작업 큐 설정 (환경 변수로 변경 가능, 사용할 때 읽음)
+# - JOB_QUEUE_PATH: 작업 큐 SQLite 파일
+# - JOB_WORKERS: 작업자 스레드 수 (기본값 4)
+# - JOB_STALE_SECONDS: 이 시간 동안 진행이 없으면 작업을 다시 대기열로 (기본값 600초)
+# - JOB_MAX_ATTEMPTS: 작업자가 중단되어 다시 대기열에 들어간 작업을 실행할 최대 횟수 (기본값 3)
+POLL_INTERVAL = 0.5          # 대기 중인 작업이 없을 때 확인 간격 (초)
+PARTIAL_UPDATE_INTERVAL = 0.5  # 스트리밍 중간 결과를 기록하는 최소 간격 (초)
+
+def get_queue_path():
+    """작업 큐 파일 경로를 반환합니다."""
+    return get_setting("JOB_QUEUE_PATH", os.path.join(".cache", "job_queue.sqlite3"))
+
+def get_default_workers():
+    """기본 작업자 수를 반환합니다."""
+    return get_int_setting("JOB_WORKERS", 4)
+
+def get_stale_after():
+    """진행 기록이 이 시간(초)보다 오래된 실행 중 작업은 작업자가 멈춘 것으로 봅니다."""
+    return get_float_setting("JOB_STALE_SECONDS", 600)
+
+def get_max_attempts():
+    """작업 하나를 실행할 최대 횟수를 반환합니다."""
+    return get_int_setting("JOB_MAX_ATTEMPTS", 3)
+
+# 작업 상태
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+FINISHED_STATUSES = (STATUS_SUCCEEDED, STATUS_FAILED)
+
+# 화면에 표시할 단계 이름
+STAGE_LABELS = {
+    "queued": "대기 중",
+    "analyze": "회의록 분석 중",
+    "notion": "노션에 회의록 등록 중",
+    "slack": "슬랙 알림 전송 중",
+    "done": "완료",
+}
+
+JOB_COLUMNS = (
+    "id", "status", "stage", "meeting_text", "force", "partial_result", "analysis",
+    "raw_response", "page_id", "error", "attempts", "worker_id", "created_at", "updated_at",
+)
+
+# 같은 프로세스에서 작업이 추가되면 대기 중인 작업자를 바로 깨움
+_wakeup = threading.Event()
+
+def _connect(path=None):
+    conn = sqlite3.connect(path or get_queue_path(), timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def init_queue(path=None):
+    """작업 큐 테이블을 만듭니다."""
+    path = path or get_queue_path()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    conn = _connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                meeting_text TEXT NOT NULL,
+                force INTEGER NOT NULL DEFAULT 0,
+                partial_result TEXT,
+                analysis TEXT,
+                raw_response TEXT,
+                page_id TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker_id TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+    finally:
+        conn.close()
+
+def _row_to_job(row):
+    job = dict(row)
+    job["force"] = bool(job["force"])
+    job["analysis"] = json.loads(job["analysis"]) if job["analysis"] else None
+    return job
+
+def submit_job(meeting_text, force=False, page_id=None, path=None):
+    """
+    회의록 처리 작업을 대기열에 추가하고 작업 ID를 바로 반환합니다.
+    실제 처리(분석 → 노션 → 슬랙)는 작업자 풀이 수행합니다.
+    page_id를 주면 새 페이지를 만들지 않고 해당 페이지를 갱신합니다 (내용이 바뀐 회의록 파일 등).
+    """
+    init_queue(path)
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    conn = _connect(path)
+    try:
+        conn.execute(
+            "INSERT INTO jobs (id, status, stage, meeting_text, force, page_id, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, STATUS_QUEUED, "queued", meeting_text, int(force), page_id, now, now),
+        )
+    finally:
+        conn.close()
+    _wakeup.set()
+    return job_id
+
+def get_job(job_id, path=None):
+    """작업 상태를 딕셔너리로 반환합니다. 없으면 None을 반환합니다."""
+    conn = _connect(path)
+    try:
+        row = conn.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    finally:
+        conn.close()
+    return _row_to_job(row) if row else None
+
+def update_job(job_id, path=None, **fields):
+    """작업의 일부 필드를 갱신합니다. updated_at은 진행 신호(heartbeat)로도 사용됩니다."""
+    if "analysis" in fields and fields["analysis"] is not None:
+        fields["analysis"] = json.dumps(fields["analysis"], ensure_ascii=False)
+    fields["updated_at"] = time.time()
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    conn = _connect(path)
+    try:
+        conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+    finally:
+        conn.close()
+
+def touch_job(job_id, worker_id, path=None):
+    """
+    실행 중인 작업의 updated_at만 갱신합니다 (heartbeat).
+    다시 대기열에 들어가 다른 작업자가 가져간 작업은 갱신하지 않습니다.
+    """
+    conn = _connect(path)
+    try:
+        conn.execute(
+            "UPDATE jobs SET updated_at = ? WHERE id = ? AND status = ? AND worker_id = ?",
+            (time.time(), job_id, STATUS_RUNNING, worker_id),
+        )
+    finally:
+        conn.close()
+
+class JobHeartbeat:
+    """
+    작업을 실행하는 동안 별도 스레드에서 interval마다 touch_job을 호출합니다.
+    긴 회의록의 조각 분석이나 노션 블록 추가처럼 단계 하나가 오래 걸려도
+    requeue_stale_jobs가 살아 있는 작업을 다시 대기열에 넣지 않으며,
+    작업자 프로세스가 죽으면 heartbeat도 멈추므로 그 작업만 다시 처리됩니다.
+    """
+
+    def __init__(self, job_id, worker_id, path=None, interval=None):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.path = path
+        # 기본값은 JOB_STALE_SECONDS의 1/4
+        self.interval = interval or get_stale_after() / 4
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                touch_job(self.job_id, self.worker_id, self.path)
+            except sqlite3.Error as e:
+                print(f"작업 {self.job_id} 진행 기록 중 오류 발생: {e}")
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, name=f"job-heartbeat-{self.job_id[:8]}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+def claim_next_job(worker_id, path=None):
+    """
+    가장 오래된 대기 작업 하나를 원자적으로 가져와 실행 중 상태로 바꿉니다.
+    이미 최대 횟수만큼 실행한 작업(실행할 때마다 작업자가 중단된 작업)은 다시 실행하지 않고 실패로 처리합니다.
+    """
+    max_attempts = get_max_attempts()
+    conn = _connect(path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, worker_id = NULL, updated_at = ? WHERE status = ? AND attempts >= ?",
+            (STATUS_FAILED, f"작업자가 {max_attempts}번 중단되어 작업을 중단했습니다.", time.time(),
+             STATUS_QUEUED, max_attempts),
+        )
+        row = conn.execute(
+            "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (STATUS_QUEUED,)
+        ).fetchone()
+        if row is None:
+            conn.execute("COMMIT")
+            return None
+        conn.execute(
+            "UPDATE jobs SET status = ?, worker_id = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+            (STATUS_RUNNING, worker_id, time.time(), row["id"]),
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    return get_job(row["id"], path)
+
+def requeue_stale_jobs(stale_after=None, path=None):
+    """
+    작업자가 죽어 오래 진행이 없는 실행 중 작업을 다시 대기열에 넣습니다.
+    프로세스가 재시작되어도 제출된 작업이 사라지지 않습니다.
+    실행 중인 작업은 JobHeartbeat가 updated_at을 계속 갱신하므로 오래 걸려도 다시 넣지 않습니다.
+    """
+    if stale_after is None:
+        stale_after = get_stale_after()
+    conn = _connect(path)
+    try:
+        cursor = conn.execute(
+            "UPDATE jobs SET status = ?, stage = 'queued', worker_id = NULL, updated_at = ? "
+            "WHERE status = ? AND updated_at < ?",
+            (STATUS_QUEUED, time.time(), STATUS_RUNNING, time.time() - stale_after),
+        )
+        return cursor.rowcount
+    finally:
+        conn.close()
+
+def _analyze(job, path):
+    """
+    회의록을 분석하고 응답 문자열을 반환합니다. 분석을 완료하지 못하면 None을 반환합니다.
+    한 번에 분석 가능한 길이면 스트리밍 중간 결과를 partial_result에 기록하여 화면에서 점진적으로 볼 수 있게 합니다.
+    """
+    from claude_analyzer import AnalysisStreamError, stream_meeting_notes_analysis
+    from long_transcript import analysis_units, analyze_units
+
+    # 전처리와 분할은 analysis_units에서 한 번만 함
+    units = analysis_units(job["meeting_text"])
+    if len(units) > 1:
+        return analyze_units(units)
+    meeting_text = units[0]
+
+    analysis_result = None
+    last_update = 0.0
+    try:
+        for analysis_result in stream_meeting_notes_analysis(meeting_text):
+            now = time.monotonic()
+            if now - last_update >= PARTIAL_UPDATE_INTERVAL:
+                update_job(job["id"], path, partial_result=analysis_result)
+                last_update = now
+    except AnalysisStreamError:
+        # 중간에 끊긴 스트림의 마지막 조각은 잘린 JSON이므로 버림
+        return None
+    return analysis_result
+
+def run_meeting_job(job, path=None):
+    """
+    작업 하나를 처리합니다: 중복 확인 → 분석 → 노션 등록(또는 갱신) → 슬랙 알림.
+    단계마다 작업 상태를 기록하므로 화면에서 진행 상황을 조회할 수 있습니다.
+    """
+    from notion_connector import get_database_id, add_meeting_notes_to_notion, update_meeting_notes_in_notion
+    from page_index import lookup_meeting
+    from analysis_parser import validate_analysis
+    import slack_notifier
+
+    job_id = job["id"]
+    index, fingerprint, existing = lookup_meeting(job["meeting_text"], get_database_id())
+    existing_page_id = existing["page_id"] if existing else None
+
+    # 0. 이미 등록된 회의록이면 API 호출 없이 완료
+    if existing_page_id and not job["force"]:
+        update_job(job_id, path, status=STATUS_SUCCEEDED, stage="done", page_id=existing_page_id,
+                   analysis=existing["analysis"])
+        return
+
+    # 1. 분석 (노션 등록만 실패했던 회의록은 이전 분석 결과 재사용)
+    if existing and existing["analysis"] and not job["force"]:
+        meeting_data = existing["analysis"]
+    else:
+        update_job(job_id, path, stage="analyze")
+        with span("analyze", chars=len(job["meeting_text"])):
+            analysis_result = _analyze(job, path)
+        if not analysis_result:
+            update_job(job_id, path, status=STATUS_FAILED, error="회의록 분석에 실패했습니다.")
+            mark_error("회의록 분석 실패")
+            return
+        with span("parse", chars=len(analysis_result)):
+            meeting_data, reason, error = validate_analysis(analysis_result)
+        if meeting_data is None:
+            # 파싱할 수 없거나 스키마에 맞지 않는 분석 결과는 노션에 쓰지 않음
+            update_job(job_id, path, status=STATUS_FAILED, raw_response=analysis_result, error=error)
+            mark_error(reason)
+            return
+        if index:
+            index.record(fingerprint, analysis=meeting_data)
+    update_job(job_id, path, analysis=meeting_data, partial_result=None)
+
+    # 2. 노션 등록 (이미 페이지가 있거나 제출 시 갱신할 페이지를 지정했으면 갱신)
+    update_job(job_id, path, stage="notion")
+    target_page_id = existing_page_id or job["page_id"]
+    with span("notion"):
+        if target_page_id:
+            page_id = update_meeting_notes_in_notion(target_page_id, meeting_data)
+        else:
+            page_id = add_meeting_notes_to_notion(meeting_data)
+    if not page_id:
+        update_job(job_id, path, status=STATUS_FAILED, error="노션 회의록 등록에 실패했습니다.")
+        mark_error("노션 등록 실패")
+        return
+    if index:
+        index.record(fingerprint, page_id=page_id)
+    update_job(job_id, path, page_id=page_id)
+
+    # 3. 슬랙 알림 (웹훅이 설정된 경우에만, 실패해도 작업은 성공으로 처리)
+    if slack_notifier.get_webhook_url():
+        update_job(job_id, path, stage="slack")
+        slack_notifier.notify_slack_meeting_notes(meeting_data, page_id)
+
+    update_job(job_id, path, status=STATUS_SUCCEEDED, stage="done")
+
+class JobWorkerPool:
+    """
+    고정된 수의 작업자 스레드가 작업 큐를 처리합니다.
+    여러 사용자가 작업을 제출해도 동시에 실행되는 API 작업 수는 작업자 수로 제한됩니다.
+    """
+
+    def __init__(self, workers=None, path=None):
+        self.workers = max(1, workers or get_default_workers())
+        self.path = path
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        init_queue(self.path)
+        requeue_stale_jobs(path=self.path)
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, args=(f"{os.getpid()}-{i}",), name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        _wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _run(self, worker_id):
+        while not self._stop.is_set():
+            try:
+                job = claim_next_job(worker_id, self.path)
+            except sqlite3.Error as e:
+                print(f"작업 큐 조회 중 오류 발생: {e}")
+                job = None
+
+            if job is None:
+                _wakeup.wait(POLL_INTERVAL)
+                _wakeup.clear()
+                continue
+
+            try:
+                # 작업 하나를 추적 스팬으로 기록 (대기 시간 포함)
+                with span("job", job_id=job["id"], queue_wait_ms=round((time.time() - job["created_at"]) * 1000, 1)), \
+                        JobHeartbeat(job["id"], worker_id, self.path):
+                    run_meeting_job(job, self.path)
+            except Exception as e:
+                print(f"작업 {job['id']} 처리 중 오류 발생: {e}")
+                update_job(job["id"], self.path, status=STATUS_FAILED, error=str(e))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def ensure_worker_pool(workers=None):
+    """프로세스당 하나의 작업자 풀을 시작하고 반환합니다 (이미 실행 중이면 그대로 반환)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = JobWorkerPool(workers).start()
+        return _pool
+
+def main():
+    """독립 실행: 웹 앱과 별도 프로세스에서 작업자만 실행합니다."""
+    load_environment()
+    parser = argparse.ArgumentParser(description="회의록 처리 작업자 실행")
+    parser.add_argument("--workers", type=int, default=get_default_workers(), help="작업자 스레드 수")
+    args = parser.parse_args()
+
+    pool = JobWorkerPool(args.workers).start()
+    # TRACE_METRICS_PORT가 설정되어 있으면 Prometheus 지표를 제공
+    ensure_metrics_server()
+    print(f"작업자 {pool.workers}개가 작업 큐({get_queue_path()})를 처리합니다. 종료하려면 Ctrl+C를 누르세요.")
+    try:
+        while True:
+            time.sleep(get_stale_after() / 2)
+            requeue_stale_jobs()
+    except KeyboardInterrupt:
+        pool.stop(timeout=5)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+import re
+import json
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from analysis_parser import parse_json_response
+from claude_analyzer import analyze_meeting_notes_with_claude, analyze_meeting_notes_with_claude_async
+from transcript_preprocessor import compact_transcript
+from config import get_int_setting
+
+# 분할 설정 (환경 변수로 변경 가능, 사용할 때 읽음)
+def get_chunk_max_chars():
+    """한 번에 분석할 최대 글자 수 (LONG_TRANSCRIPT_CHUNK_CHARS)"""
+    return get_int_setting("LONG_TRANSCRIPT_CHUNK_CHARS", 8000)
+
+def get_chunk_concurrency():
+    """조각을 동시에 분석할 개수 (LONG_TRANSCRIPT_CONCURRENCY)"""
+    return get_int_setting("LONG_TRANSCRIPT_CONCURRENCY", 4)
+
+# 분할 경계로 사용할 줄 패턴
+# - 클로바 노트 화자 헤더 (예: "참석자 1 00:03", "김팀장 01:02:15")
+# - 안건/아젠다 제목 (예: "1. 신제품 리뷰", "## 안건", "주요 안건:")
+SPEAKER_HEADER_PATTERN = re.compile(r"^\s*\S[^\n]{0,30}?\s\d{1,2}:\d{2}(?::\d{2})?\s*$")
+AGENDA_HEADER_PATTERN = re.compile(r"^\s*(#{1,6}\s|\d+[.)]\s|(주요\s*)?(안건|아젠다|논의\s*내용|결정\s*사항)\s*[:：]?\s*$)")
+
+# 병합 시 처리 방식별 필드
+FIRST_VALUE_FIELDS = ["회의 제목", "회의 리드", "일자", "회의 목적"]
+LAST_VALUE_FIELDS = ["진행 단계"]
+LIST_FIELDS = ["아젠다 사전 공유", "회의 아젠다", "주요 결정 사항", "후속 액션"]
+
+def _is_boundary(line):
+    return not line.strip() or bool(SPEAKER_HEADER_PATTERN.match(line)) or bool(AGENDA_HEADER_PATTERN.match(line))
+
+def _split_units(text):
+    """회의록을 화자·안건·문단 경계 단위로 나눕니다."""
+    units = []
+    current = []
+    for line in text.splitlines():
+        if current and _is_boundary(line):
+            units.append("\n".join(current))
+            current = []
+        current.append(line)
+    if current:
+        units.append("\n".join(current))
+    return [unit for unit in units if unit.strip()]
+
+def _split_oversized(unit, max_chars):
+    """경계 없이 너무 긴 단위는 줄 단위로, 그래도 길면 글자 수로 자릅니다."""
+    pieces = []
+    current = ""
+    for line in unit.splitlines():
+        while len(line) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        if current and len(current) + len(line) + 1 > max_chars:
+            pieces.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        pieces.append(current)
+    return pieces
+
+def split_transcript(text, max_chars=None):
+    """
+    회의록을 max_chars 이하의 조각들로 나눕니다.
+    가능하면 화자 전환이나 안건 경계에서 자르고, 인접한 단위는 한 조각으로 묶습니다.
+    """
+    max_chars = max_chars or get_chunk_max_chars()
+    chunks = []
+    current = ""
+    for unit in _split_units(text):
+        for piece in ([unit] if len(unit) <= max_chars else _split_oversized(unit, max_chars)):
+            if current and len(current) + len(piece) + 1 > max_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = f"{current}\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _chunk_text(chunk, index, total):
+    return f"[전체 회의록 {total}개 부분 중 {index + 1}번째 부분]\n{chunk}"
+
+def _item_key(item, *title_keys):
+    if isinstance(item, dict):
+        for key in title_keys:
+            if item.get(key):
+                return str(item[key]).strip()
+        return json.dumps(item, ensure_ascii=False, sort_keys=True)
+    return str(item).strip()
+
+def _merge_list(merged, items, *title_keys):
+    seen = {_item_key(item, *title_keys) for item in merged}
+    for item in items:
+        key = _item_key(item, *title_keys)
+        if key and key not in seen:
+            merged.append(item)
+            seen.add(key)
+
+def _as_list(value):
+    if not value:
+        return []
+    return value if isinstance(value, list) else [value]
+
+def merge_partial_analyses(partials):
+    """
+    조각별 분석 결과(딕셔너리 목록)를 하나의 회의록 JSON 구조로 합칩니다.
+    """
+    merged = {
+        "회의 리드": "",
+        "참석자": "",
+        "일자": "",
+        "진행 단계": "",
+        "아젠다 사전 공유": [],
+        "회의 목적": "",
+        "회의 아젠다": [],
+        "주요 논의 내용": [],
+        "주요 결정 사항": [],
+        "후속 액션": [],
+        "회의 피드백": {},
+        "다음 회의 일정": {},
+    }
+    participants = []
+    discussions = {}
+
+    for partial in partials:
+        for field in FIRST_VALUE_FIELDS:
+            if partial.get(field) and not merged.get(field):
+                merged[field] = partial[field]
+        for field in LAST_VALUE_FIELDS:
+            if partial.get(field):
+                merged[field] = partial[field]
+
+        # 참석자: 쉼표로 구분된 이름의 합집합 (등장 순서 유지)
+        names = partial.get("참석자", "")
+        names = names if isinstance(names, list) else str(names).split(",")
+        for name in (str(name).strip() for name in names):
+            if name and name not in participants:
+                participants.append(name)
+
+        _merge_list(merged["아젠다 사전 공유"], _as_list(partial.get("아젠다 사전 공유")))
+        _merge_list(merged["회의 아젠다"], _as_list(partial.get("회의 아젠다")), "항목 제목")
+        _merge_list(merged["주요 결정 사항"], _as_list(partial.get("주요 결정 사항")), "제목")
+        _merge_list(merged["후속 액션"], _as_list(partial.get("후속 액션")))
+
+        # 주요 논의 내용: 같은 아젠다 제목의 논의 내용은 하나로 이어붙임
+        for item in _as_list(partial.get("주요 논의 내용")):
+            if not isinstance(item, dict):
+                item = {"아젠다 제목": "", "논의 내용": [item]}
+            title = str(item.get("아젠다 제목", "")).strip()
+            if title not in discussions:
+                discussions[title] = {"아젠다 제목": title, "논의 내용": []}
+                merged["주요 논의 내용"].append(discussions[title])
+            _merge_list(discussions[title]["논의 내용"], _as_list(item.get("논의 내용")))
+
+        # 회의 피드백: 항목별 텍스트를 이어붙임
+        feedback = partial.get("회의 피드백")
+        if isinstance(feedback, dict):
+            for key, value in feedback.items():
+                if value and str(value) not in str(merged["회의 피드백"].get(key, "")):
+                    previous = merged["회의 피드백"].get(key)
+                    merged["회의 피드백"][key] = f"{previous}\n{value}" if previous else value
+
+        # 다음 회의 일정: 회의 후반부 언급이 최신 정보이므로 나중 값을 우선
+        schedule = partial.get("다음 회의 일정")
+        if isinstance(schedule, dict):
+            merged["다음 회의 일정"].update({key: value for key, value in schedule.items() if value})
+
+    merged["참석자"] = ", ".join(participants)
+    return merged
+
+def _parse_partials(results):
+    partials = []
+    for index, result in enumerate(results):
+        if not result:
+            print(f"{index + 1}번째 부분 분석에 실패했습니다.")
+            continue
+        partial = parse_json_response(result)
+        if partial is None:
+            print(f"{index + 1}번째 부분 분석 결과를 JSON으로 파싱하지 못했습니다.")
+            continue
+        partials.append(partial)
+    return partials
+
+def _merged_result(results):
+    partials = _parse_partials(results)
+    if not partials:
+        return None
+    return json.dumps(merge_partial_analyses(partials), ensure_ascii=False)
+
+def analysis_units(meeting_text, max_chars=None):
+    """
+    분석 요청 하나에 담을 텍스트 목록을 반환합니다 (메시지 배치처럼 요청을 직접 만들 때 사용).
+    짧은 회의록은 전처리한 텍스트 하나, 긴 회의록은 위치 안내가 붙은 조각들입니다.
+    """
+    meeting_text = compact_transcript(meeting_text)
+    chunks = split_transcript(meeting_text, max_chars)
+    if len(chunks) <= 1:
+        return [meeting_text]
+    return [_chunk_text(chunk, i, len(chunks)) for i, chunk in enumerate(chunks)]
+
+def merge_analysis_results(results):
+    """analysis_units 순서대로 받은 분석 응답 문자열들을 병합한 JSON 문자열을 반환합니다 (모두 실패하면 None)."""
+    if len(results) == 1:
+        return results[0]
+    return _merged_result(results)
+
+def analyze_units(units, concurrency=None):
+    """
+    analysis_units가 반환한 텍스트들을 분석하고 결과를 병합한 JSON 문자열을 반환합니다.
+    이미 전처리된 텍스트를 받으므로 회의록을 다시 전처리하지 않습니다.
+    """
+    if len(units) <= 1:
+        return analyze_meeting_notes_with_claude(units[0])
+
+    print(f"긴 회의록을 {len(units)}개 부분으로 나누어 분석합니다...")
+    with ThreadPoolExecutor(max_workers=max(1, concurrency or get_chunk_concurrency())) as executor:
+        # 작업자 스레드에도 현재 추적 스팬이 이어지도록 부분마다 컨텍스트를 복사해 실행
+        futures = [executor.submit(contextvars.copy_context().run, analyze_meeting_notes_with_claude, text) for text in units]
+        results = [future.result() for future in futures]
+    return _merged_result(results)
+
+def analyze_meeting_notes_chunked(meeting_text, max_chars=None, concurrency=None):
+    """
+    긴 회의록을 조각으로 나누어 동시에 분석하고 결과를 병합합니다.
+    클로바 노트 회의록은 먼저 전처리(transcript_preprocessor)하여 줄인 뒤 나누며,
+    줄인 회의록이 max_chars 이하이면 기존처럼 한 번에 분석합니다.
+    반환값은 analyze_meeting_notes_with_claude와 같은 JSON 문자열입니다.
+    """
+    return analyze_units(analysis_units(meeting_text, max_chars), concurrency)
+
+async def analyze_meeting_notes_chunked_async(meeting_text, max_chars=None, concurrency=None):
+    """
+    analyze_meeting_notes_chunked의 비동기 버전입니다.
+    """
+    import asyncio
+    units = analysis_units(meeting_text, max_chars)
+    if len(units) <= 1:
+        return await analyze_meeting_notes_with_claude_async(units[0])
+
+    print(f"긴 회의록을 {len(units)}개 부분으로 나누어 분석합니다...")
+    semaphore = asyncio.Semaphore(max(1, concurrency or get_chunk_concurrency()))
+
+    async def bounded(text):
+        async with semaphore:
+            return await analyze_meeting_notes_with_claude_async(text)
+
+    results = await asyncio.gather(*(bounded(text) for text in units))
+    return _merged_result(results)
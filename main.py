@@ -1,45 +1,440 @@
 import os
+import sys
 import json
-from claude_analyzer import analyze_meeting_notes_with_claude
-from notion_connector import add_meeting_notes_to_notion
+import glob
+import time
+import argparse
+import asyncio
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from config import load_environment
+from long_transcript import analyze_meeting_notes_chunked, analyze_meeting_notes_chunked_async
+from notion_connector import (
+    get_database_id,
+    add_meeting_notes_to_notion,
+    add_meeting_notes_to_notion_async,
+    update_meeting_notes_in_notion,
+)
+from page_index import lookup_meeting
+from analysis_parser import validate_analysis
+import slack_notifier
+from client_registry import aclose_async_clients
+from tracing import span, traced, mark_error, ensure_metrics_server
 
-def process_meeting_notes(meeting_text):
+# 배치 모드 기본값
+DEFAULT_BATCH_WORKERS = 4
+DEFAULT_BATCH_PATTERN = "*.txt"
+
+def parse_analysis_result(analysis_result):
     """
-    회의록 텍스트를 Claude로 분석하고 Notion에 등록합니다.
+    Claude 응답 문자열을 회의록 딕셔너리로 변환하고 작업 큐·배치 백필과 같은 기준으로 스키마를 검증합니다.
+    코드 펜스나 쉼표 오류 같은 흔한 문제는 analysis_parser가 로컬에서 고칩니다.
+
+    Returns:
+        tuple: (회의록 딕셔너리, 실패 사유) - 실패하면 딕셔너리는 None
     """
-    print("클로바 노트 회의록 분석 및 노션 등록을 시작합니다...")
+    meeting_data, reason, error = validate_analysis(analysis_result)
+    if meeting_data is None:
+        print(error)
+        print("원본 응답:", analysis_result)
+        return None, reason
     
-    # 1. Claude로 회의록 분석
-    print("회의록 분석 중...")
-    analysis_result = analyze_meeting_notes_with_claude(meeting_text)
+    print("회의록 분석 완료!")
+    print(f"제목: {meeting_data.get('회의 제목', '제목 없음')}")
+    print(f"일시: {meeting_data.get('일자') or meeting_data.get('회의 일시', '일시 정보 없음')}")
+    return meeting_data, None
+
+# 회의록 처리 단계: 동기·비동기 파이프라인이 같은 단계 함수를 쓰고, API를 호출하는 부분만 다름
+# 단계 함수는 실패하면 실패 사유(추적 스팬에 기록하는 문자열)를 반환합니다.
+
+def _outcome(status, page_id=None, error=None):
+    """파이프라인 결과: status는 "success", "unchanged", "failed" 중 하나"""
+    return {"status": status, "page_id": page_id, "error": error}
+
+def _failed(reason):
+    mark_error(reason)
+    return _outcome("failed", error=reason)
+
+@contextlib.contextmanager
+def _timed(timings, stage):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = round(time.perf_counter() - started, 3)
+
+def _check_existing(meeting_text, force):
+    """
+    0단계: 페이지 인덱스에서 이미 처리한 회의록인지 확인합니다.
     
+    Returns:
+        tuple: (처리 상태 딕셔너리, 결과) - 이미 등록된 회의록이면 처리 상태 없이 "unchanged" 결과를 반환
+    """
+    index, fingerprint, existing = lookup_meeting(meeting_text, get_database_id())
+    if existing and existing["page_id"] and not force:
+        print("이미 노션에 등록된 회의록입니다. 기존 페이지를 사용합니다.")
+        print(f"노션 회의록 URL: https://notion.so/{existing['page_id'].replace('-', '')}")
+        return None, _outcome("unchanged", existing["page_id"])
+    
+    state = {"index": index, "fingerprint": fingerprint, "existing": existing, "meeting_data": None}
+    if existing and existing["analysis"] and not force:
+        # 분석은 끝났지만 노션 등록에 실패했던 회의록: 분석 결과 재사용
+        print("이전에 분석한 결과를 사용합니다.")
+        state["meeting_data"] = existing["analysis"]
+    return state, None
+
+def _record_analysis(state, analysis_result):
+    """2단계: 분석 응답을 파싱·검증하여 처리 상태에 담고 인덱스에 기록합니다. 실패하면 실패 사유를 반환합니다."""
     if not analysis_result:
         print("회의록 분석에 실패했습니다.")
-        return None
+        return "회의록 분석 실패"
     
-    # 2. JSON 분석 결과 파싱
-    try:
-        meeting_data = json.loads(analysis_result)
-        print("회의록 분석 완료!")
-        print(f"제목: {meeting_data.get('회의 제목', '제목 없음')}")
-        print(f"일시: {meeting_data.get('회의 일시', '일시 정보 없음')}")
-    except json.JSONDecodeError as e:
-        print(f"Claude 응답을 JSON으로 파싱하는 중 오류 발생: {e}")
-        print("원본 응답:", analysis_result)
-        return None
+    with span("parse", chars=len(analysis_result)):
+        meeting_data, reason = parse_analysis_result(analysis_result)
+    if meeting_data is None:
+        return reason
+    state["meeting_data"] = meeting_data
+    if state["index"]:
+        state["index"].record(state["fingerprint"], analysis=meeting_data)
+    return None
+
+def _target_page_id(state):
+    # 이미 페이지가 있으면 새로 만들지 않고 갱신
+    existing = state["existing"]
+    return existing["page_id"] if existing and existing["page_id"] else None
+
+def _record_page(state, page_id):
+    """3단계 후: 노션 페이지 ID를 인덱스에 기록합니다. 등록에 실패했으면 실패 사유를 반환합니다."""
+    if not page_id:
+        print("노션 회의록 등록에 실패했습니다.")
+        return "노션 등록 실패"
+    if state["index"]:
+        state["index"].record(state["fingerprint"], page_id=page_id)
+    print(f"노션 회의록 URL: https://notion.so/{page_id.replace('-', '')}")
+    return None
+
+@traced("meeting")
+def _run_meeting_pipeline(meeting_text, timings, force=False):
+    state, outcome = _check_existing(meeting_text, force)
+    if outcome:
+        return outcome
     
-    # 3. Notion에 회의록 등록
+    print("클로바 노트 회의록 분석 및 노션 등록을 시작합니다...")
+    if state["meeting_data"] is None:
+        # 1. Claude로 회의록 분석
+        print("회의록 분석 중...")
+        with _timed(timings, "analyze"), span("analyze", chars=len(meeting_text)):
+            analysis_result = analyze_meeting_notes_chunked(meeting_text)
+        # 2. JSON 분석 결과 파싱
+        reason = _record_analysis(state, analysis_result)
+        if reason:
+            return _failed(reason)
+    
+    # 3. Notion에 회의록 등록 (이미 페이지가 있으면 갱신)
     print("\n노션에 회의록 등록 중...")
-    page_id = add_meeting_notes_to_notion(meeting_data)
+    target_page_id = _target_page_id(state)
+    with _timed(timings, "notion"), span("notion"):
+        if target_page_id:
+            page_id = update_meeting_notes_in_notion(target_page_id, state["meeting_data"])
+        else:
+            page_id = add_meeting_notes_to_notion(state["meeting_data"])
+    reason = _record_page(state, page_id)
+    if reason:
+        return _failed(reason)
     
-    if page_id:
-        print(f"노션 회의록 URL: https://notion.so/{page_id.replace('-', '')}")
-        return page_id
+    # 4. 슬랙 알림 (웹훅이 설정된 경우에만)
+    if slack_notifier.get_webhook_url():
+        with _timed(timings, "slack"):
+            slack_notifier.notify_slack_meeting_notes(state["meeting_data"], page_id)
+    return _outcome("success", page_id)
+
+@traced("meeting")
+async def _run_meeting_pipeline_async(meeting_text, timings, notion=None, http_client=None, force=False):
+    state, outcome = _check_existing(meeting_text, force)
+    if outcome:
+        return outcome
+    
+    if state["meeting_data"] is None:
+        with _timed(timings, "analyze"), span("analyze", chars=len(meeting_text)):
+            analysis_result = await analyze_meeting_notes_chunked_async(meeting_text)
+        reason = _record_analysis(state, analysis_result)
+        if reason:
+            return _failed(reason)
+    
+    target_page_id = _target_page_id(state)
+    with _timed(timings, "notion"), span("notion"):
+        if target_page_id:
+            page_id = await asyncio.to_thread(update_meeting_notes_in_notion, target_page_id, state["meeting_data"])
+        else:
+            page_id = await add_meeting_notes_to_notion_async(state["meeting_data"], notion=notion)
+    reason = _record_page(state, page_id)
+    if reason:
+        return _failed(reason)
+    
+    if slack_notifier.get_webhook_url():
+        with _timed(timings, "slack"):
+            await slack_notifier.notify_slack_meeting_notes_async(state["meeting_data"], page_id, http_client=http_client)
+    return _outcome("success", page_id)
+
+def process_meeting_notes(meeting_text, timings=None, force=False):
+    """
+    회의록 텍스트를 Claude로 분석하고 Notion에 등록한 뒤, 슬랙 웹훅이 설정되어 있으면 알림을 보냅니다.
+    timings 딕셔너리가 주어지면 단계별 소요 시간(초)을 기록합니다.
+    
+    이미 등록된 회의록이면 API를 호출하지 않고 기존 페이지 ID를 반환합니다.
+    force=True면 다시 분석하여 새 페이지를 만들지 않고 기존 페이지를 갱신합니다.
+    """
+    return _run_meeting_pipeline(meeting_text, {} if timings is None else timings, force)["page_id"]
+
+async def process_meeting_notes_async(meeting_text, timings=None, notion=None, http_client=None, force=False):
+    """
+    process_meeting_notes의 비동기 버전입니다. 분석 → 노션 등록 → 슬랙 알림을 수행합니다.
+    notion(AsyncClient)과 http_client(httpx.AsyncClient)를 넘기면 연결을 공유합니다.
+    """
+    outcome = await _run_meeting_pipeline_async(meeting_text, {} if timings is None else timings,
+                                                notion=notion, http_client=http_client, force=force)
+    return outcome["page_id"]
+
+def collect_transcript_files(target, pattern=DEFAULT_BATCH_PATTERN):
+    """
+    배치 처리 대상 회의록 파일 목록을 반환합니다.
+    target은 디렉터리, 단일 파일 또는 glob 패턴일 수 있습니다.
+    """
+    if os.path.isdir(target):
+        paths = glob.glob(os.path.join(target, pattern))
+    elif os.path.isfile(target):
+        paths = [target]
     else:
-        print("노션 회의록 등록에 실패했습니다.")
-        return None
+        paths = glob.glob(target, recursive=True)
+    
+    return sorted(path for path in paths if os.path.isfile(path))
+
+def _new_result(**keys):
+    """보고서에 한 줄로 기록할 결과 딕셔너리를 만듭니다 (keys는 파일 경로나 레코드 id)."""
+    result = dict(keys)
+    result.update({"status": "failed", "page_id": None, "error": None, "timings": {}})
+    return result
 
-def main():
+def _skip_empty(meeting_text, result, empty_error):
+    """
+    빈 회의록은 인덱스를 조회하지 않고 "skipped"로 기록한 뒤 True를 반환합니다.
+    이미 등록된 회의록은 파이프라인이 인덱스를 한 번 조회하여 "unchanged"로 알려줍니다.
+    """
+    if meeting_text.strip():
+        return False
+    result["status"] = "skipped"
+    result["error"] = empty_error
+    return True
+
+def _apply_outcome(result, outcome):
+    """파이프라인 결과(실패하면 실패 사유 포함)를 보고서용 결과 딕셔너리에 옮깁니다."""
+    result["status"] = outcome["status"]
+    result["page_id"] = outcome["page_id"]
+    result["error"] = outcome["error"]
+
+def _read_meeting_file(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+def _finish_result(result, started):
+    result["timings"]["total"] = round(time.perf_counter() - started, 3)
+    return result
+
+def process_meeting_file(path, force=False):
+    """
+    회의록 파일 하나를 처리하고 보고서용 결과 딕셔너리를 반환합니다.
+    이미 등록된 회의록은 API를 호출하지 않고 "unchanged" 상태로 기록합니다.
+    """
+    result = _new_result(file=path)
+    started = time.perf_counter()
+    
+    try:
+        meeting_text = _read_meeting_file(path)
+        if not _skip_empty(meeting_text, result, "빈 회의록 파일"):
+            _apply_outcome(result, _run_meeting_pipeline(meeting_text, result["timings"], force))
+    except Exception as e:
+        result["error"] = str(e)
+    
+    return _finish_result(result, started)
+
+def run_batch(target, report_path, workers=DEFAULT_BATCH_WORKERS, pattern=DEFAULT_BATCH_PATTERN, force=False):
+    """
+    여러 회의록 파일을 제한된 크기의 작업자 풀로 동시에 처리합니다.
+    파일별 결과는 완료되는 즉시 JSONL 보고서에 한 줄씩 기록됩니다.
+    
+    Returns:
+        list: 파일별 결과 딕셔너리 목록 (완료 순서)
+    """
+    paths = collect_transcript_files(target, pattern)
+    if not paths:
+        print(f"처리할 회의록 파일이 없습니다: {target}")
+        return []
+    
+    print(f"{len(paths)}개의 회의록을 작업자 {workers}개로 처리합니다...")
+    started = time.perf_counter()
+    results = []
+    
+    with open(report_path, "a", encoding="utf-8") as report, \
+            ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(process_meeting_file, path, force): path for path in paths}
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            report.write(json.dumps(result, ensure_ascii=False) + "\n")
+            report.flush()
+    
+    succeeded = sum(1 for result in results if result["status"] == "success")
+    unchanged = sum(1 for result in results if result["status"] == "unchanged")
+    elapsed = time.perf_counter() - started
+    print(f"\n배치 처리 완료: 성공 {succeeded}/{len(results)}건 (변경 없음 {unchanged}건), 소요 시간 {elapsed:.1f}초")
+    print(f"결과 보고서: {report_path}")
+    return results
+
+def process_jsonl_record(line, line_number, force=False):
+    """
+    JSONL 레코드 한 줄({"id": ..., "text": ...})을 처리하고 결과 딕셔너리를 반환합니다.
+    id가 없으면 줄 번호를 id로 사용하며, 레코드에 "force": true를 넣으면 해당 회의록만 다시 분석합니다.
+    """
+    result = _new_result(id=line_number, url=None)
+    started = time.perf_counter()
+    
+    try:
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise ValueError("레코드가 JSON 객체가 아닙니다")
+        result["id"] = record.get("id", line_number)
+        meeting_text = record.get("text")
+        if not isinstance(meeting_text, str):
+            meeting_text = ""
+        force = force or bool(record.get("force"))
+        if not _skip_empty(meeting_text, result, "text 항목이 비어 있습니다"):
+            _apply_outcome(result, _run_meeting_pipeline(meeting_text, result["timings"], force))
+    except Exception as e:
+        result["error"] = str(e)
+    
+    if result["page_id"]:
+        result["url"] = f"https://notion.so/{result['page_id'].replace('-', '')}"
+    return _finish_result(result, started)
+
+def run_jsonl(input_stream=None, output_stream=None, workers=DEFAULT_BATCH_WORKERS, force=False):
+    """
+    표준 입력의 JSONL 레코드를 작업자 풀로 동시에 처리하고, 레코드마다 끝나는 즉시 결과 한 줄을 출력합니다.
+    처리 중인 레코드는 작업자 수의 2배까지만 읽어 두므로 입력이 많아도 메모리 사용량이 일정합니다.
+    진행 메시지는 결과와 섞이지 않도록 표준 오류로 출력합니다.
+    
+    Returns:
+        dict: {"total", "failed"} - 처리한 레코드 수와 실패한 레코드 수
+    """
+    input_stream = input_stream or sys.stdin
+    output_stream = output_stream or sys.stdout
+    workers = max(1, workers)
+    slots = threading.BoundedSemaphore(workers * 2)
+    output_lock = threading.Lock()
+    counts = {"total": 0, "failed": 0}
+    
+    def emit(future):
+        result = future.result()
+        with output_lock:
+            counts["total"] += 1
+            counts["failed"] += result["status"] == "failed"
+            output_stream.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output_stream.flush()
+        slots.release()
+    
+    with contextlib.redirect_stdout(sys.stderr), ThreadPoolExecutor(max_workers=workers) as executor:
+        for line_number, line in enumerate(input_stream, 1):
+            if not line.strip():
+                continue
+            # 처리 중인 레코드가 가득 차면 하나가 끝날 때까지 다음 줄을 읽지 않음
+            slots.acquire()
+            executor.submit(process_jsonl_record, line, line_number, force).add_done_callback(emit)
+    return counts
+
+async def process_meeting_file_async(path, notion=None, http_client=None, force=False):
+    """
+    process_meeting_file의 비동기 버전입니다.
+    """
+    result = _new_result(file=path)
+    started = time.perf_counter()
+    
+    try:
+        meeting_text = _read_meeting_file(path)
+        if not _skip_empty(meeting_text, result, "빈 회의록 파일"):
+            _apply_outcome(result, await _run_meeting_pipeline_async(
+                meeting_text, result["timings"], notion=notion, http_client=http_client, force=force
+            ))
+    except Exception as e:
+        result["error"] = str(e)
+    
+    return _finish_result(result, started)
+
+async def run_batch_async(target, report_path, concurrency=DEFAULT_BATCH_WORKERS, pattern=DEFAULT_BATCH_PATTERN, force=False):
+    """
+    run_batch의 asyncio 버전입니다. 하나의 이벤트 루프에서 최대 concurrency개의
+    회의록을 동시에 진행하므로, 한 회의록의 노션 등록·슬랙 알림이 다른 회의록의
+    분석과 겹쳐서 실행됩니다.
+    """
+    paths = collect_transcript_files(target, pattern)
+    if not paths:
+        print(f"처리할 회의록 파일이 없습니다: {target}")
+        return []
+    
+    print(f"{len(paths)}개의 회의록을 동시 {concurrency}개씩 비동기로 처리합니다...")
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    results = []
+    
+    async def bounded(path):
+        async with semaphore:
+            return await process_meeting_file_async(path, force=force)
+    
+    # 노션·슬랙·Claude 비동기 클라이언트는 client_registry가 이 루프 안에서 공유함
+    try:
+        with open(report_path, "a", encoding="utf-8") as report:
+            for future in asyncio.as_completed([bounded(path) for path in paths]):
+                result = await future
+                results.append(result)
+                report.write(json.dumps(result, ensure_ascii=False) + "\n")
+                report.flush()
+    finally:
+        await aclose_async_clients()
+    
+    succeeded = sum(1 for result in results if result["status"] == "success")
+    unchanged = sum(1 for result in results if result["status"] == "unchanged")
+    elapsed = time.perf_counter() - started
+    print(f"\n배치 처리 완료: 성공 {succeeded}/{len(results)}건 (변경 없음 {unchanged}건), 소요 시간 {elapsed:.1f}초")
+    print(f"결과 보고서: {report_path}")
+    return results
+
+def parse_args(argv=None):
+    """명령줄 인자를 해석합니다."""
+    parser = argparse.ArgumentParser(description="클로바 노트 → 노션 회의록 변환기")
+    parser.add_argument("--batch", metavar="PATH",
+                        help="회의록 파일이 있는 디렉터리 또는 glob 패턴 (배치 모드)")
+    parser.add_argument("--watch", metavar="DIR",
+                        help="디렉터리를 감시하여 새로 생기거나 바뀐 회의록 파일을 자동으로 처리 (데몬 모드)")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="표준 입력의 JSONL 레코드({\"id\", \"text\"})를 동시에 처리하고 결과를 표준 출력에 JSONL로 출력")
+    parser.add_argument("--pattern", default=DEFAULT_BATCH_PATTERN,
+                        help=f"디렉터리 지정 시 사용할 파일 패턴 (기본값: {DEFAULT_BATCH_PATTERN})")
+    parser.add_argument("--workers", type=int, default=DEFAULT_BATCH_WORKERS,
+                        help=f"동시에 처리할 회의록 수 (기본값: {DEFAULT_BATCH_WORKERS})")
+    parser.add_argument("--report", default="batch_report.jsonl",
+                        help="파일별 결과를 기록할 JSONL 보고서 경로")
+    parser.add_argument("--force", action="store_true",
+                        help="이미 등록된 회의록도 다시 분석하여 기존 노션 페이지를 갱신")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="스레드 풀 대신 asyncio 파이프라인(분석 → 노션 → 슬랙)으로 처리")
+    parser.add_argument("--batch-api", action="store_true",
+                        help="Anthropic 메시지 배치 API로 분석 (대량 백필용, 결과가 늦게 오는 대신 비용 절감)")
+    parser.add_argument("--slack-digest", action="store_true",
+                        help="슬랙 알림을 회의록마다 보내지 않고 모아서 다이제스트로 전송")
+    parser.add_argument("--speakers", metavar="MAP",
+                        help="클로바 노트 화자 ID를 이름으로 바꿀 매핑 (예: \"참석자 1=김팀장,참석자 2=박연구원\")")
+    return parser.parse_args(argv)
+
+def main(force=False):
     """
     메인 함수: 사용자에게 회의록 텍스트 입력을 받고 처리합니다.
     """
@@ -64,13 +459,48 @@ def main():
         return
     
     # 회의록 처리
-    page_id = process_meeting_notes(meeting_text)
+    page_id = process_meeting_notes(meeting_text, force=force)
     
     if page_id:
         print("\n처리 완료! 회의록이 성공적으로 노션에 추가되었습니다.")
     else:
         print("\n처리 실패: 회의록을 노션에 추가하는 과정에서 오류가 발생했습니다.")
 
-if __name__ == "__main__":
+def run_cli(argv=None):
+    """명령줄 진입점: .env를 한 번 로드한 뒤 인자에 따라 배치·감시·JSONL·대화형 모드를 실행합니다."""
+    load_environment()
     # 환경 변수 체크 제거
-    main() 
\ No newline at end of file
+    args = parse_args(argv)
+    # TRACE_METRICS_PORT가 설정되어 있으면 처리 중 Prometheus 지표를 제공
+    ensure_metrics_server()
+    if args.slack_digest:
+        # 남은 알림은 프로세스 종료 시 전송됨
+        slack_notifier.start_digest()
+    if args.speakers:
+        # 회의록 전처리(transcript_preprocessor)에서 읽음
+        os.environ["CLOVA_SPEAKER_NAMES"] = args.speakers
+    if args.jsonl:
+        counts = run_jsonl(workers=args.workers, force=args.force)
+        sys.exit(0 if counts["failed"] == 0 else 1)
+    if args.watch:
+        # 폴더 감시는 작업 큐 작업자 풀로 분석 → 노션 등록 → 슬랙 알림을 처리
+        from folder_watcher import watch_folder
+        watch_folder(args.watch, pattern=args.pattern, workers=args.workers, force=args.force)
+        sys.exit(0)
+    if args.batch:
+        if args.batch_api:
+            # 메시지 배치 모듈은 백필할 때만 불러옴
+            from batch_backfill import run_backfill
+            results = run_backfill(collect_transcript_files(args.batch, args.pattern), args.report,
+                                   workers=args.workers, force=args.force)
+        elif args.use_async:
+            results = asyncio.run(run_batch_async(
+                args.batch, args.report, concurrency=args.workers, pattern=args.pattern, force=args.force
+            ))
+        else:
+            results = run_batch(args.batch, args.report, workers=args.workers, pattern=args.pattern, force=args.force)
+        sys.exit(0 if results and all(r["status"] != "failed" for r in results) else 1)
+    main(force=args.force)
+
+if __name__ == "__main__":
+    run_cli()
@@ -1,55 +1,98 @@
+import re
 import json
-import os
-from notion_client import Client
-
-# .env 파일이 있는 경우에만 로드 시도
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    # dotenv 패키지가 설치되지 않았을 경우 무시
-    pass
-
-# Notion API 키 설정
-NOTION_API_KEY = os.environ.get("NOTION_API_KEY")
-# 데이터베이스 ID 설정
-DATABASE_ID = os.environ.get("NOTION_DATABASE_ID")
+import time
+import datetime
+import threading
+from config import get_setting, get_float_setting, load_environment
+from client_registry import get_notion_client, get_async_notion_client
+from rate_limiter import call_with_rate_limit, call_with_rate_limit_async
+import tracing
+
+# Notion API 키와 데이터베이스 ID는 import 시점이 아니라 사용할 때 환경 변수(.env 포함)에서 읽음
+def get_database_id():
+    """회의록을 등록할 노션 데이터베이스 ID (환경 변수 NOTION_DATABASE_ID)를 반환합니다."""
+    return get_setting("NOTION_DATABASE_ID")
+
+# 노션 API 크기 제한
+RICH_TEXT_LIMIT = 2000        # 리치 텍스트 항목당 최대 글자 수
+RICH_TEXT_MAX_ITEMS = 100     # 리치 텍스트 배열 최대 길이
+BLOCKS_PER_REQUEST = 100      # 페이지 생성/블록 추가 요청당 최대 블록 수
+
+# 요청 본문 크기 (추적 기록용)
+def payload_size(properties, blocks):
+    """페이지 속성과 본문 블록을 JSON으로 보냈을 때의 바이트 수를 반환합니다."""
+    return len(json.dumps({"properties": properties, "children": blocks}, ensure_ascii=False).encode("utf-8"))
 
 # Notion 클라이언트 초기화
 def init_notion_client():
     """Notion API 클라이언트를 초기화합니다."""
-    if not NOTION_API_KEY:
+    api_key = get_setting("NOTION_API_KEY")
+    if not api_key:
         print("Notion API 키가 설정되지 않았습니다.")
         print("환경 변수 NOTION_API_KEY를 설정하거나 .env 파일에 추가해주세요.")
         return None
         
-    if not DATABASE_ID:
+    if not get_database_id():
         print("Notion 데이터베이스 ID가 설정되지 않았습니다.")
         print("환경 변수 NOTION_DATABASE_ID를 설정하거나 .env 파일에 추가해주세요.")
         return None
         
     try:
-        notion = Client(auth=NOTION_API_KEY)
+        # 한 번 만든 클라이언트를 재사용하여 페이지마다 연결을 새로 맺지 않음
+        notion = get_notion_client(api_key)
         return notion
     except Exception as e:
         print(f"Notion 클라이언트 초기화 중 오류 발생: {e}")
         return None
 
-# 결정 사항과 액션 아이템을 노션용 리치 텍스트로 변환
-def format_items_for_notion(items):
+# Notion 비동기 클라이언트 초기화
+def init_async_notion_client():
     """
-    결정 사항이나 액션 아이템 목록을 노션 리치 텍스트 형식으로 변환합니다.
+    현재 이벤트 루프에서 공유하는 Notion API 비동기 클라이언트를 반환합니다.
+    실행 중인 이벤트 루프 안에서 호출해야 합니다.
     """
-    if not items or not isinstance(items, list):
-        return []
+    api_key = get_setting("NOTION_API_KEY")
+    if not api_key or not get_database_id():
+        print("Notion API 키 또는 데이터베이스 ID가 설정되지 않았습니다.")
+        return None
         
-    result = []
+    try:
+        return get_async_notion_client(api_key)
+    except Exception as e:
+        print(f"Notion 클라이언트 초기화 중 오류 발생: {e}")
+        return None
+
+# 리치 텍스트 분할
+def split_rich_text(text, limit=RICH_TEXT_LIMIT, max_items=RICH_TEXT_MAX_ITEMS):
+    """
+    텍스트를 노션 제한(항목당 2000자, 배열당 100개)에 맞는 리치 텍스트 배열로 나눕니다.
+    가능하면 줄바꿈 위치에서 자르고, 100개를 넘는 부분은 버립니다 (전체 내용은 페이지 본문에 기록).
+    """
+    text = "" if text is None else str(text)
+    segments = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit)
+        cut = cut + 1 if cut > 0 else limit
+        segments.append(text[:cut])
+        text = text[cut:]
+    segments.append(text)
+    
+    if len(segments) > max_items:
+        segments = segments[:max_items]
+        segments[-1] = segments[-1][:limit - 1] + "…"
+    
+    return [{"type": "text", "text": {"content": segment}} for segment in segments]
+
+# 결정 사항과 액션 아이템을 텍스트로 변환
+def format_items_text(items):
+    """결정 사항이나 액션 아이템 목록을 번호가 매겨진 여러 줄 텍스트로 변환합니다."""
+    lines = []
     
     for i, item in enumerate(items):
         # 각 항목을 번호가 매겨진 목록으로 변환
         if isinstance(item, dict):
             # 구조화된 형식인 경우 (내용, 담당자, 기한)
-            item_text = f"{i+1}. {item.get('내용', '')}"
+            item_text = f"{i+1}. {_item_text(item, '내용', '제목', '항목 제목', '아젠다 제목')}"
             if item.get('담당자'):
                 item_text += f" (담당자: {item['담당자']}"
                 if item.get('기한'):
@@ -58,22 +101,436 @@ def format_items_for_notion(items):
         else:
             # 단순 문자열인 경우
             item_text = f"{i+1}. {item}"
-            
-        # 노션 리치 텍스트 블록 구성
-        result.append({
-            "type": "text",
-            "text": {
-                "content": item_text,
-            }
-        })
+        lines.append(item_text)
+    
+    return "\n".join(lines)
+
+# 결정 사항과 액션 아이템을 노션용 리치 텍스트로 변환
+def format_items_for_notion(items):
+    """
+    결정 사항이나 액션 아이템 목록을 노션 리치 텍스트 형식으로 변환합니다.
+    항목마다 요소를 만들지 않고 한 텍스트로 합친 뒤 2000자 단위로 나누므로
+    항목이 많아도 100개 요소 제한에 걸리지 않습니다.
+    """
+    if not items or not isinstance(items, list):
+        return []
+    
+    return split_rich_text(format_items_text(items))
+
+# 페이지 본문 블록 구성
+def text_blocks(block_type, text):
+    """
+    텍스트를 지정한 형식(paragraph, bulleted_list_item 등)의 블록 목록으로 변환합니다.
+    리치 텍스트가 100개를 넘을 만큼 긴 텍스트는 여러 블록으로 나눕니다.
+    """
+    segments = split_rich_text(text, max_items=float("inf"))
+    return [
+        {
+            "object": "block",
+            "type": block_type,
+            block_type: {"rich_text": segments[i:i + RICH_TEXT_MAX_ITEMS]},
+        }
+        for i in range(0, len(segments), RICH_TEXT_MAX_ITEMS)
+    ]
+
+def _item_text(item, *keys):
+    if isinstance(item, dict):
+        for key in keys:
+            if item.get(key):
+                return str(item[key])
+        return ", ".join(f"{key}: {value}" for key, value in item.items() if value)
+    return str(item)
+
+def build_meeting_blocks(meeting_data):
+    """
+    논의 내용 등 길이가 긴 상세 내용을 페이지 본문 블록 목록으로 구성합니다.
+    속성에는 요약만 두고 전체 내용은 본문에 기록하여 노션 크기 제한을 피합니다.
+    """
+    blocks = []
+    
+    def heading(title):
+        blocks.extend(text_blocks("heading_2", title))
+    
+    # 1. 회의 목적
+    if meeting_data.get("회의 목적"):
+        heading("회의 목적")
+        blocks.extend(text_blocks("paragraph", meeting_data["회의 목적"]))
+    
+    # 2. 회의 아젠다
+    agenda_items = meeting_data.get("회의 아젠다") or meeting_data.get("주요 안건")
+    if agenda_items:
+        heading("회의 아젠다")
+        for item in agenda_items if isinstance(agenda_items, list) else [agenda_items]:
+            text = _item_text(item, "항목 제목")
+            if isinstance(item, dict) and item.get("소요시간"):
+                text += f" ({item['소요시간']})"
+            blocks.extend(text_blocks("numbered_list_item", text))
+    
+    # 3. 주요 논의 내용 (아젠다별)
+    discussions = meeting_data.get("주요 논의 내용")
+    if discussions:
+        heading("주요 논의 내용")
+        for item in discussions if isinstance(discussions, list) else [discussions]:
+            if isinstance(item, dict):
+                if item.get("아젠다 제목"):
+                    blocks.extend(text_blocks("heading_3", item["아젠다 제목"]))
+                points = item.get("논의 내용") or []
+                for point in points if isinstance(points, list) else [points]:
+                    blocks.extend(text_blocks("bulleted_list_item", point))
+            else:
+                blocks.extend(text_blocks("bulleted_list_item", item))
+    elif meeting_data.get("논의된 내용 요약"):
+        heading("논의 내용")
+        blocks.extend(text_blocks("paragraph", meeting_data["논의된 내용 요약"]))
+    
+    # 4. 주요 결정 사항
+    decisions = meeting_data.get("주요 결정 사항") or meeting_data.get("결정 사항")
+    if decisions:
+        heading("주요 결정 사항")
+        for item in decisions if isinstance(decisions, list) else [decisions]:
+            blocks.extend(text_blocks("numbered_list_item", _item_text(item, "제목", "내용")))
+            if isinstance(item, dict) and item.get("세부 내용"):
+                blocks.extend(text_blocks("paragraph", item["세부 내용"]))
+    
+    # 5. 후속 액션
+    actions = meeting_data.get("후속 액션") or meeting_data.get("다음 액션 아이템")
+    if actions:
+        heading("후속 액션")
+        if isinstance(actions, list):
+            for line in format_items_text(actions).split("\n"):
+                blocks.extend(text_blocks("to_do", line))
+        else:
+            blocks.extend(text_blocks("paragraph", actions))
+    
+    # 6. 회의 피드백 / 다음 회의 일정
+    for title in ("회의 피드백", "다음 회의 일정"):
+        value = meeting_data.get(title)
+        if isinstance(value, dict) and any(value.values()):
+            heading(title)
+            for key, item in value.items():
+                if item:
+                    blocks.extend(text_blocks("bulleted_list_item", f"{key}: {_item_text(item)}"))
+    
+    return blocks
+
+def batch_blocks(blocks, size=BLOCKS_PER_REQUEST):
+    """블록 목록을 요청당 최대 100개 단위로 나눕니다."""
+    return [blocks[i:i + size] for i in range(0, len(blocks), size)]
+
+# 회의록 데이터 정규화
+def parse_meeting_data(meeting_data):
+    """JSON 문자열이면 딕셔너리로 변환하고, 실패하면 None을 반환합니다."""
+    if isinstance(meeting_data, str):
+        try:
+            return json.loads(meeting_data)
+        except json.JSONDecodeError as e:
+            print(f"JSON 파싱 오류: {e}")
+            return None
+    return meeting_data
+
+def get_schema_ttl():
+    """노션 데이터베이스 스키마 캐시 유지 시간(초, 환경 변수 NOTION_SCHEMA_TTL로 변경 가능)"""
+    return get_float_setting("NOTION_SCHEMA_TTL", 600)
+
+# 분석 결과 → 노션 페이지 속성 매핑
+# - keys: 값을 읽을 분석 결과 키 (앞에서부터 값이 있는 첫 키 사용, 이전 프롬프트 형식의 키 포함)
+# - names: 데이터베이스에서 찾을 속성 이름 후보 (앞에서부터 스키마에 있는 첫 속성 사용)
+#   제목 속성은 데이터베이스마다 이름이 달라 names 대신 title 타입 속성을 사용
+# 값의 형식(제목, 텍스트, 날짜, 선택, 다중 선택 등)은 스키마의 속성 타입에 맞춰 변환
+MEETING_PROPERTY_MAP = [
+    {"keys": ("회의 제목",), "names": None, "default": "무제 회의록"},
+    {"keys": ("일자", "회의 일시"), "names": ("회의 일시", "일자", "날짜")},
+    {"keys": ("참석자",), "names": ("참석자",)},
+    {"keys": ("회의 리드",), "names": ("회의 리드", "리드")},
+    {"keys": ("진행 단계",), "names": ("진행 단계",)},
+    {"keys": ("회의 목적",), "names": ("회의 목적",)},
+    {"keys": ("회의 아젠다", "주요 안건"), "names": ("주요 안건", "회의 아젠다")},
+    {"keys": ("논의된 내용 요약", "주요 논의 내용"), "names": ("논의 내용 요약", "주요 논의 내용")},
+    {"keys": ("주요 결정 사항", "결정 사항"), "names": ("결정 사항", "주요 결정 사항")},
+    {"keys": ("후속 액션", "다음 액션 아이템"), "names": ("다음 액션 아이템", "후속 액션")},
+]
+
+# 스키마를 조회하지 못했을 때 사용하는 기본 회의록 템플릿 스키마
+DEFAULT_SCHEMA = {
+    "이름": {"type": "title", "options": []},
+    "회의 일시": {"type": "date", "options": []},
+    "참석자": {"type": "rich_text", "options": []},
+    "주요 안건": {"type": "rich_text", "options": []},
+    "논의 내용 요약": {"type": "rich_text", "options": []},
+    "결정 사항": {"type": "rich_text", "options": []},
+    "다음 액션 아이템": {"type": "rich_text", "options": []},
+}
+
+# API로 값을 쓸 수 있는 속성 타입 (수식, 롤업, 생성 일시 등은 노션이 계산)
+WRITABLE_TYPES = {"title", "rich_text", "date", "select", "multi_select", "status", "number", "checkbox", "url", "email", "phone_number"}
+
+DATE_TEXT = re.compile(r"(\d{4})\s*[-./년]\s*(\d{1,2})\s*[-./월]\s*(\d{1,2})\s*일?(?:\s*(?:T|\s)\s*(\d{1,2}):(\d{2}))?")
+ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:\d{2})?)?$")
+
+class PropertyValidationError(ValueError):
+    """노션에 보내기 전에 페이지 속성이 데이터베이스 스키마와 맞지 않음을 확인했을 때 발생합니다."""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        super().__init__("노션 속성 검증 실패: " + "; ".join(self.errors))
+
+class SchemaCache:
+    """
+    데이터베이스 ID → 속성 스키마를 TTL 동안 보관하는 메모리 캐시입니다.
+    페이지를 등록할 때마다 databases.retrieve를 호출하지 않도록 프로세스 안에서 공유합니다.
+    """
+
+    def __init__(self, ttl=None):
+        # None이면 저장할 때마다 NOTION_SCHEMA_TTL을 읽음 (모듈 전역 캐시가 import 시점 값에 묶이지 않도록)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+        # 여러 작업자가 동시에 스키마를 조회하지 않도록 조회를 직렬화
+        self.fetch_lock = threading.Lock()
+
+    def get(self, database_id):
+        with self._lock:
+            entry = self._entries.get(database_id)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def put(self, database_id, schema):
+        with self._lock:
+            ttl = self.ttl if self.ttl is not None else get_schema_ttl()
+            self._entries[database_id] = (time.monotonic() + ttl, schema)
+
+    def invalidate(self, database_id=None):
+        """database_id의 캐시(없으면 전체)를 비웁니다."""
+        with self._lock:
+            if database_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(database_id, None)
+
+_schema_cache = SchemaCache()
+
+def parse_database_schema(database):
+    """databases.retrieve 응답을 {속성 이름: {"type": 타입, "options": 선택지 이름 목록}} 형식으로 변환합니다."""
+    schema = {}
+    for name, prop in (database.get("properties") or {}).items():
+        prop_type = prop.get("type")
+        config = prop.get(prop_type) or {}
+        options = config.get("options", []) if isinstance(config, dict) else []
+        schema[name] = {"type": prop_type, "options": [option.get("name") for option in options]}
+    return schema
+
+def get_database_schema(notion=None, database_id=None):
+    """
+    회의록 데이터베이스의 속성 스키마를 반환합니다.
+    캐시된 스키마가 있으면 사용하고, 없거나 만료되었으면 databases.retrieve로 한 번 조회합니다.
+    조회에 실패하면 None을 반환합니다.
+    """
+    database_id = database_id or get_database_id()
+    schema = _schema_cache.get(database_id)
+    if schema is not None:
+        return schema
+    
+    with _schema_cache.fetch_lock:
+        # 기다리는 동안 다른 작업자가 조회했으면 그 결과를 사용
+        schema = _schema_cache.get(database_id)
+        if schema is not None:
+            return schema
         
-        # 줄바꿈 추가
-        result.append({
-            "type": "text", 
-            "text": {"content": "\n"}
-        })
+        notion = notion or init_notion_client()
+        if not notion:
+            return None
+        try:
+            database = call_with_rate_limit("notion", notion.databases.retrieve, database_id=database_id)
+        except Exception as e:
+            print(f"노션 데이터베이스 스키마 조회 중 오류 발생: {e}")
+            return None
         
-    return result
+        schema = parse_database_schema(database)
+        _schema_cache.put(database_id, schema)
+        return schema
+
+async def get_database_schema_async(notion, database_id=None):
+    """get_database_schema의 비동기 버전입니다. 캐시는 동기 버전과 공유합니다."""
+    database_id = database_id or get_database_id()
+    schema = _schema_cache.get(database_id)
+    if schema is not None:
+        return schema
+    
+    try:
+        database = await call_with_rate_limit_async("notion", notion.databases.retrieve, database_id=database_id)
+    except Exception as e:
+        print(f"노션 데이터베이스 스키마 조회 중 오류 발생: {e}")
+        return None
+    
+    schema = parse_database_schema(database)
+    _schema_cache.put(database_id, schema)
+    return schema
+
+def invalidate_database_schema(database_id=None):
+    """캐시된 스키마를 비워 다음 등록 때 다시 조회하게 합니다 (데이터베이스 속성을 바꾼 경우)."""
+    _schema_cache.invalidate(database_id)
+
+def _invalidate_on_validation_error(error):
+    # 노션이 속성 검증 오류를 돌려주면 캐시된 스키마가 오래되었을 수 있으므로 비움
+    if getattr(error, "code", None) == "validation_error":
+        invalidate_database_schema()
+
+# 로컬 미러(notion_mirror)는 이 모듈을 불러오므로 사용할 때 import
+def _warn_same_meetings(meeting_data):
+    # 미러에 제목과 날짜가 같은 회의록이 있으면 알림 (다른 회의일 수 있으므로 등록은 계속)
+    from notion_mirror import find_same_meetings
+    meeting_date = meeting_data.get("일자") or meeting_data.get("회의 일시")
+    for page in find_same_meetings(get_database_id(), meeting_data.get("회의 제목"), meeting_date):
+        print(f"제목과 날짜가 같은 회의록이 이미 노션에 있습니다: {page['url'] or page['page_id']}")
+
+def _record_in_mirror(page):
+    # 만들거나 갱신한 페이지를 다음 동기화 전에도 미러에서 조회할 수 있게 바로 반영
+    from notion_mirror import record_page
+    record_page(page, get_database_id())
+
+def _value_text(value):
+    if isinstance(value, list):
+        return format_items_text(value)
+    if isinstance(value, dict):
+        return _item_text(value)
+    return str(value)
+
+def _option_names(value):
+    items = value if isinstance(value, list) else re.split(r"[,、]", str(value))
+    names = [_item_text(item).strip() for item in items]
+    return list(dict.fromkeys(name for name in names if name))
+
+def _date_value(value):
+    match = DATE_TEXT.search(str(value))
+    if not match:
+        return None
+    year, month, day, hour, minute = match.groups()
+    try:
+        datetime.date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+    start = f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
+    if hour is not None and int(hour) < 24 and int(minute) < 60:
+        start += f"T{int(hour):02d}:{minute}"
+    return start
+
+def convert_property_value(prop_type, value):
+    """
+    분석 결과 값을 노션 속성 타입에 맞는 값으로 변환합니다.
+    변환할 수 없는 값이면 ValueError를 발생시킵니다.
+    """
+    if prop_type in ("title", "rich_text"):
+        return split_rich_text(_value_text(value))
+    if prop_type == "date":
+        start = _date_value(value)
+        if start is None:
+            raise ValueError(f"날짜로 변환할 수 없는 값입니다: {value!r}")
+        return {"start": start}
+    if prop_type in ("select", "status"):
+        names = _option_names(value)
+        if not names:
+            raise ValueError(f"선택지로 변환할 수 없는 값입니다: {value!r}")
+        return {"name": names[0]}
+    if prop_type == "multi_select":
+        return [{"name": name} for name in _option_names(value)]
+    if prop_type == "number":
+        try:
+            return float(str(value).replace(",", ""))
+        except ValueError:
+            raise ValueError(f"숫자로 변환할 수 없는 값입니다: {value!r}")
+    if prop_type == "checkbox":
+        return str(value).strip().lower() not in ("", "false", "no", "0", "아니오")
+    if prop_type in ("url", "email", "phone_number"):
+        return _value_text(value)
+    raise ValueError(f"값을 쓸 수 없는 속성 타입입니다: {prop_type}")
+
+def validate_properties(properties, schema):
+    """
+    페이지 속성을 데이터베이스 스키마와 비교하여 노션이 거부할 문제 목록을 반환합니다 (없으면 빈 목록).
+    속성 이름·타입, 리치 텍스트 크기, 상태 선택지, 날짜 형식을 요청 전에 확인합니다.
+    """
+    errors = []
+    for name, value in properties.items():
+        prop = schema.get(name)
+        if prop is None:
+            errors.append(f"'{name}' 속성이 데이터베이스에 없습니다")
+            continue
+        prop_type = prop["type"]
+        if prop_type not in WRITABLE_TYPES:
+            errors.append(f"'{name}' 속성({prop_type})은 값을 쓸 수 없습니다")
+            continue
+        if not isinstance(value, dict) or list(value) != [prop_type]:
+            errors.append(f"'{name}' 속성은 {prop_type} 형식이어야 합니다")
+            continue
+        
+        content = value[prop_type]
+        if prop_type in ("title", "rich_text"):
+            if len(content) > RICH_TEXT_MAX_ITEMS:
+                errors.append(f"'{name}' 속성의 리치 텍스트가 {RICH_TEXT_MAX_ITEMS}개를 넘습니다")
+            if any(len(item.get("text", {}).get("content", "")) > RICH_TEXT_LIMIT for item in content):
+                errors.append(f"'{name}' 속성에 {RICH_TEXT_LIMIT}자를 넘는 리치 텍스트가 있습니다")
+        elif prop_type == "date":
+            if not ISO_DATE.match(str((content or {}).get("start", ""))):
+                errors.append(f"'{name}' 속성의 날짜 형식이 올바르지 않습니다: {content}")
+        elif prop_type == "status":
+            # 상태 선택지는 API로 새로 만들 수 없음
+            if content.get("name") not in prop["options"]:
+                errors.append(f"'{name}' 속성에 없는 상태입니다: {content.get('name')} (선택지: {', '.join(prop['options'])})")
+        elif prop_type in ("select", "multi_select"):
+            options = content if prop_type == "multi_select" else [content]
+            if any("," in option.get("name", "") or len(option.get("name", "")) > 100 for option in options):
+                errors.append(f"'{name}' 속성의 선택지 이름은 쉼표 없이 100자 이하여야 합니다")
+    return errors
+
+def _find_property(schema, names):
+    if names is None:
+        return next((name for name, prop in schema.items() if prop["type"] == "title"), None)
+    return next((name for name in names if name in schema), None)
+
+# 회의록 데이터로 노션 페이지 속성 구성
+def build_meeting_properties(meeting_data, schema=None):
+    """
+    회의록 딕셔너리를 노션 데이터베이스 페이지 속성 형식으로 변환합니다.
+    MEETING_PROPERTY_MAP에 따라 데이터베이스 스키마에 있는 속성만 채우고, 값은 속성 타입에 맞게 변환합니다.
+    schema가 없으면 기본 회의록 템플릿 스키마(DEFAULT_SCHEMA)를 사용합니다.
+    
+    제목 외의 속성은 값을 변환할 수 없거나 스키마와 맞지 않으면 경고를 출력하고 빼므로,
+    날짜 형식이나 상태 선택지 하나 때문에 회의록 등록 전체가 실패하지 않습니다.
+    
+    Raises:
+        PropertyValidationError: 제목 속성을 만들 수 없는 경우 (요청을 보내지 않음)
+    """
+    schema = schema or DEFAULT_SCHEMA
+    properties = {}
+    errors = []
+    
+    for mapping in MEETING_PROPERTY_MAP:
+        value = next((meeting_data[key] for key in mapping["keys"] if meeting_data.get(key)), mapping.get("default"))
+        if not value:
+            continue
+        name = _find_property(schema, mapping["names"])
+        if name is None or schema[name]["type"] not in WRITABLE_TYPES:
+            continue
+        
+        prop_type = schema[name]["type"]
+        try:
+            prop_value = {prop_type: convert_property_value(prop_type, value)}
+            problems = validate_properties({name: prop_value}, schema)
+        except ValueError as e:
+            problems = [f"'{name}' 속성: {e}"]
+        
+        if not problems:
+            properties[name] = prop_value
+        elif prop_type == "title":
+            errors.extend(problems)
+        else:
+            print(f"노션 속성을 건너뜁니다: {'; '.join(problems)}")
+            tracing.increment("skipped_properties")
+    
+    if errors:
+        raise PropertyValidationError(errors)
+    return properties
 
 # 노션 데이터베이스에 회의록 추가
 def add_meeting_notes_to_notion(meeting_data):
@@ -82,12 +539,9 @@ def add_meeting_notes_to_notion(meeting_data):
     meeting_data는 JSON 형식의 문자열 또는 Python 딕셔너리 형태의 회의록 데이터입니다.
     """
     # 1. JSON 문자열이면 파이썬 딕셔너리로 변환
-    if isinstance(meeting_data, str):
-        try:
-            meeting_data = json.loads(meeting_data)
-        except json.JSONDecodeError as e:
-            print(f"JSON 파싱 오류: {e}")
-            return None
+    meeting_data = parse_meeting_data(meeting_data)
+    if meeting_data is None:
+        return None
     
     # 2. Notion 클라이언트 초기화
     notion = init_notion_client()
@@ -96,138 +550,166 @@ def add_meeting_notes_to_notion(meeting_data):
         return None
     
     try:
-        # 3. 메인 속성 (제목) 설정
-        properties = {
-            "이름": {  # 실제 노션 데이터베이스의 제목 속성 이름에 맞게 변경하세요 ("이름", "회의 제목" 등)
-                "title": [
-                    {
-                        "type": "text",
-                        "text": {
-                            "content": meeting_data.get("회의 제목", "무제 회의록")
-                        }
-                    }
-                ]
-            }
-        }
+        # 3. 페이지 속성 구성 (데이터베이스 스키마에 맞춰 변환·검증하고, 맞지 않으면 요청하지 않음)
+        properties = build_meeting_properties(meeting_data, get_database_schema(notion))
+        _warn_same_meetings(meeting_data)
         
-        # 4. 회의 일시 설정 (날짜 속성)
-        if meeting_data.get("회의 일시"):
-            properties["회의 일시"] = {  # 실제 노션 데이터베이스의 날짜 속성 이름에 맞게 변경하세요
-                "date": {
-                    "start": meeting_data["회의 일시"].replace(" ", "T")  # ISO 형식으로 변환
-                }
-            }
+        # 4. 데이터베이스에 페이지 생성 (초당 3회 제한, 429 시 재시도)
+        #    본문 블록은 처음 100개를 페이지 생성 요청에 포함하고 나머지는 100개씩 추가
+        blocks = build_meeting_blocks(meeting_data)
+        tracing.set_attributes(blocks=len(blocks))
+        tracing.increment("payload_bytes", payload_size(properties, blocks))
+        batches = batch_blocks(blocks)
+        response = call_with_rate_limit(
+            "notion",
+            notion.pages.create,
+            parent={"database_id": get_database_id()},
+            properties=properties,
+            children=batches[0] if batches else [],
+            idempotent=False
+        )
         
-        # 5. 참석자 설정 (다중 선택 또는 리치 텍스트)
-        if meeting_data.get("참석자"):
-            # 다중 선택인 경우:
-            # properties["참석자"] = {
-            #     "multi_select": [{"name": name.strip()} for name in meeting_data["참석자"].split(',')]
-            # }
-            
-            # 리치 텍스트인 경우:
-            properties["참석자"] = {
-                "rich_text": [
-                    {
-                        "type": "text",
-                        "text": {
-                            "content": meeting_data["참석자"]
-                        }
-                    }
-                ]
-            }
+        for batch in batches[1:]:
+            call_with_rate_limit(
+                "notion",
+                notion.blocks.children.append,
+                block_id=response["id"],
+                children=batch,
+                idempotent=False
+            )
         
-        # 6. 주요 안건 설정 (리치 텍스트)
-        if meeting_data.get("주요 안건"):
-            안건_내용 = ""
-            if isinstance(meeting_data["주요 안건"], list):
-                # 리스트인 경우 번호를 붙여서 텍스트로 변환
-                for i, item in enumerate(meeting_data["주요 안건"]):
-                    안건_내용 += f"{i+1}. {item}\n"
-            else:
-                안건_내용 = meeting_data["주요 안건"]
-                
-            properties["주요 안건"] = {
-                "rich_text": [
-                    {
-                        "type": "text",
-                        "text": {
-                            "content": 안건_내용
-                        }
-                    }
-                ]
-            }
+        _record_in_mirror(response)
+        print(f"노션에 회의록이 성공적으로 추가되었습니다. 페이지 ID: {response['id']}")
+        return response["id"]
         
-        # 7. 논의 내용 요약 설정 (리치 텍스트)
-        if meeting_data.get("논의된 내용 요약"):
-            properties["논의 내용 요약"] = {
-                "rich_text": [
-                    {
-                        "type": "text",
-                        "text": {
-                            "content": meeting_data["논의된 내용 요약"]
-                        }
-                    }
-                ]
-            }
+    except Exception as e:
+        print(f"노션에 회의록 추가 중 오류 발생: {e}")
+        tracing.mark_error(e)
+        _invalidate_on_validation_error(e)
+        return None
+
+# 기존 노션 회의록 페이지 갱신
+def update_meeting_notes_in_notion(page_id, meeting_data):
+    """
+    이미 등록된 회의록 페이지의 속성과 본문을 새 분석 결과로 갱신합니다.
+    같은 회의록을 다시 분석할 때 페이지를 새로 만들지 않기 위해 사용합니다.
+    새 본문 블록을 먼저 추가한 뒤 기존 블록을 삭제하므로, 갱신 도중 실패해도 페이지 본문이 사라지지 않습니다.
+    """
+    meeting_data = parse_meeting_data(meeting_data)
+    if meeting_data is None:
+        return None
+    
+    notion = init_notion_client()
+    if not notion:
+        print("Notion 클라이언트를 초기화할 수 없습니다.")
+        return None
+    
+    try:
+        # 1. 속성 갱신
+        properties = build_meeting_properties(meeting_data, get_database_schema(notion))
+        blocks = build_meeting_blocks(meeting_data)
+        tracing.set_attributes(blocks=len(blocks))
+        tracing.increment("payload_bytes", payload_size(properties, blocks))
+        page = call_with_rate_limit(
+            "notion",
+            notion.pages.update,
+            page_id=page_id,
+            properties=properties
+        )
         
-        # 8. 결정 사항 설정 (리치 텍스트)
-        if meeting_data.get("결정 사항"):
-            if isinstance(meeting_data["결정 사항"], list):
-                # 복잡한 리스트 형태의 결정 사항 처리
-                결정_내용 = format_items_for_notion(meeting_data["결정 사항"])
-                properties["결정 사항"] = {
-                    "rich_text": 결정_내용 if 결정_내용 else [{"type": "text", "text": {"content": ""}}]
-                }
-            else:
-                # 단순 문자열 형태인 경우
-                properties["결정 사항"] = {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": meeting_data["결정 사항"]
-                            }
-                        }
-                    ]
-                }
+        # 2. 기존 본문 블록 ID 수집
+        block_ids = []
+        cursor = None
+        while True:
+            kwargs = {"block_id": page_id, "page_size": 100}
+            if cursor:
+                kwargs["start_cursor"] = cursor
+            listing = call_with_rate_limit("notion", notion.blocks.children.list, **kwargs)
+            block_ids.extend(block["id"] for block in listing.get("results", []))
+            if not listing.get("has_more"):
+                break
+            cursor = listing.get("next_cursor")
         
-        # 9. 다음 액션 아이템 설정 (리치 텍스트)
-        if meeting_data.get("다음 액션 아이템"):
-            if isinstance(meeting_data["다음 액션 아이템"], list):
-                # 복잡한 리스트 형태의 액션 아이템 처리
-                액션_내용 = format_items_for_notion(meeting_data["다음 액션 아이템"])
-                properties["다음 액션 아이템"] = {
-                    "rich_text": 액션_내용 if 액션_내용 else [{"type": "text", "text": {"content": ""}}]
-                }
-            else:
-                # 단순 문자열 형태인 경우
-                properties["다음 액션 아이템"] = {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": meeting_data["다음 액션 아이템"]
-                            }
-                        }
-                    ]
-                }
+        # 3. 새 본문 블록 추가 (100개씩)
+        for batch in batch_blocks(blocks):
+            call_with_rate_limit(
+                "notion",
+                notion.blocks.children.append,
+                block_id=page_id,
+                children=batch,
+                idempotent=False
+            )
         
-        # 10. 데이터베이스에 페이지 생성
-        response = notion.pages.create(
-            parent={"database_id": DATABASE_ID},
-            properties=properties
+        # 4. 새 본문을 모두 추가한 뒤에 기존 블록 삭제
+        # (중간에 실패해도 본문이 비지 않으며, 다시 갱신하면 남은 블록도 정리됨)
+        for block_id in block_ids:
+            call_with_rate_limit("notion", notion.blocks.delete, block_id=block_id)
+        
+        _record_in_mirror(page)
+        print(f"노션 회의록이 갱신되었습니다. 페이지 ID: {page_id}")
+        return page_id
+        
+    except Exception as e:
+        print(f"노션 회의록 갱신 중 오류 발생: {e}")
+        tracing.mark_error(e)
+        _invalidate_on_validation_error(e)
+        return None
+
+# 노션 데이터베이스에 회의록 비동기 추가
+async def add_meeting_notes_to_notion_async(meeting_data, notion=None):
+    """
+    add_meeting_notes_to_notion의 비동기 버전입니다.
+    notion에 AsyncClient를 넘기면 여러 호출이 같은 연결 풀을 공유합니다.
+    """
+    meeting_data = parse_meeting_data(meeting_data)
+    if meeting_data is None:
+        return None
+    
+    if notion is None:
+        notion = init_async_notion_client()
+    if not notion:
+        print("Notion 클라이언트를 초기화할 수 없습니다.")
+        return None
+    
+    try:
+        properties = build_meeting_properties(meeting_data, await get_database_schema_async(notion))
+        _warn_same_meetings(meeting_data)
+        blocks = build_meeting_blocks(meeting_data)
+        tracing.set_attributes(blocks=len(blocks))
+        tracing.increment("payload_bytes", payload_size(properties, blocks))
+        batches = batch_blocks(blocks)
+        response = await call_with_rate_limit_async(
+            "notion",
+            notion.pages.create,
+            parent={"database_id": get_database_id()},
+            properties=properties,
+            children=batches[0] if batches else [],
+            idempotent=False
         )
         
+        # 블록 추가는 순서가 중요하므로 한 페이지 안에서는 차례대로 요청
+        for batch in batches[1:]:
+            await call_with_rate_limit_async(
+                "notion",
+                notion.blocks.children.append,
+                block_id=response["id"],
+                children=batch,
+                idempotent=False
+            )
+        
+        _record_in_mirror(response)
         print(f"노션에 회의록이 성공적으로 추가되었습니다. 페이지 ID: {response['id']}")
         return response["id"]
         
     except Exception as e:
         print(f"노션에 회의록 추가 중 오류 발생: {e}")
+        tracing.mark_error(e)
+        _invalidate_on_validation_error(e)
         return None
 
 # 테스트 코드
-if __name__ == "__main__":
+def main():
+    load_environment()
     # 샘플 회의록 데이터
     sample_meeting_data = {
         "회의 제목": "2024년 2분기 신제품 개발 회의",
@@ -268,4 +750,7 @@ if __name__ == "__main__":
     # 노션에 회의록 추가 테스트
     page_id = add_meeting_notes_to_notion(sample_meeting_data)
     if page_id:
-        print(f"회의록 페이지 URL: https://notion.so/{page_id.replace('-', '')}") 
\ No newline at end of file
+        print(f"회의록 페이지 URL: https://notion.so/{page_id.replace('-', '')}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+import os
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from config import get_setting, get_float_setting, load_environment
+from notion_connector import MEETING_PROPERTY_MAP, get_database_id, init_notion_client
+from rate_limiter import call_with_rate_limit
+from tracing import span, mark_error
+
+# 노션 미러 설정 (환경 변수로 변경 가능, 사용할 때 읽음)
+# - NOTION_MIRROR_PATH: 회의록 데이터베이스를 복제해 두는 SQLite 파일
+# - NOTION_MIRROR_FULL_SYNC_HOURS: 마지막 전체 동기화 후 이 시간이 지나면 증분 대신 전체 동기화
+#   (databases.query는 삭제·보관된 페이지를 돌려주지 않으므로 전체 동기화 때만 미러에서 지움)
+QUERY_PAGE_SIZE = 100  # databases.query 요청당 최대 페이지 수
+
+# 회의 일시로 사용할 날짜 속성 이름 후보 (노션에 쓸 때와 같은 순서)
+DATE_PROPERTY_NAMES = next(mapping["names"] for mapping in MEETING_PROPERTY_MAP if "일자" in mapping["keys"])
+
+def get_mirror_path():
+    return get_setting("NOTION_MIRROR_PATH", os.path.join(".cache", "notion_mirror.sqlite3"))
+
+def get_full_sync_interval():
+    """전체 동기화 주기(초)"""
+    return get_float_setting("NOTION_MIRROR_FULL_SYNC_HOURS", 24) * 3600
+
+PAGE_COLUMNS = ("page_id", "database_id", "title", "meeting_date", "properties", "url",
+                "created_time", "last_edited_time", "synced_at")
+
+def simplify_property(prop):
+    """
+    노션 페이지 속성 값을 검색하기 쉬운 파이썬 값으로 바꿉니다.
+    제목·텍스트는 문자열, 날짜는 시작 일시, 선택은 이름, 다중 선택·사람은 이름 목록이 됩니다.
+    """
+    prop_type = prop.get("type")
+    value = prop.get(prop_type)
+    if prop_type in ("title", "rich_text"):
+        return "".join(item.get("plain_text") or (item.get("text") or {}).get("content", "") for item in value or [])
+    if prop_type == "date":
+        return (value or {}).get("start")
+    if prop_type in ("select", "status"):
+        return (value or {}).get("name")
+    if prop_type in ("multi_select", "people"):
+        return [item.get("name") for item in value or []]
+    if prop_type == "relation":
+        return [item.get("id") for item in value or []]
+    if prop_type == "formula":
+        return (value or {}).get((value or {}).get("type"))
+    return value
+
+def page_record(page, database_id):
+    """databases.query 결과의 페이지 하나를 미러에 저장할 딕셔너리로 바꿉니다."""
+    properties = {name: simplify_property(prop) for name, prop in (page.get("properties") or {}).items()}
+    types = {name: prop.get("type") for name, prop in (page.get("properties") or {}).items()}
+    title = next((properties[name] for name, prop_type in types.items() if prop_type == "title"), "")
+    date_name = next((name for name in DATE_PROPERTY_NAMES if types.get(name) == "date"),
+                     next((name for name, prop_type in types.items() if prop_type == "date"), None))
+    return {
+        "page_id": page["id"],
+        "database_id": database_id,
+        "title": title or "",
+        "meeting_date": properties.get(date_name) if date_name else None,
+        "properties": properties,
+        "url": page.get("url"),
+        "created_time": page.get("created_time"),
+        "last_edited_time": page.get("last_edited_time"),
+    }
+
+class NotionMirror:
+    """
+    노션 회의록 데이터베이스의 페이지 속성을 복제해 두는 SQLite 저장소입니다.
+    목록 조회·검색·중복 확인을 노션 API 페이지 조회 없이 로컬에서 처리합니다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path = path or get_mirror_path()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    page_id TEXT PRIMARY KEY,
+                    database_id TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    meeting_date TEXT,
+                    properties TEXT NOT NULL,
+                    url TEXT,
+                    created_time TEXT,
+                    last_edited_time TEXT,
+                    synced_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_date ON pages (database_id, meeting_date)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_title ON pages (database_id, title)")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    database_id TEXT PRIMARY KEY,
+                    last_edited_time TEXT,
+                    full_synced_at REAL,
+                    synced_at REAL NOT NULL
+                )
+                """
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _row_to_page(row):
+        page = dict(zip(PAGE_COLUMNS, row))
+        page["properties"] = json.loads(page["properties"])
+        return page
+
+    def get_sync_state(self, database_id):
+        """데이터베이스의 동기화 기록 {"last_edited_time", "full_synced_at", "synced_at"}을 반환합니다. 없으면 None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT last_edited_time, full_synced_at, synced_at FROM sync_state WHERE database_id = ?",
+                (database_id,),
+            ).fetchone()
+        return dict(zip(("last_edited_time", "full_synced_at", "synced_at"), row)) if row else None
+
+    def save_sync_state(self, database_id, last_edited_time, full=False):
+        """동기화를 마친 시각과 지금까지 받은 가장 늦은 last_edited_time을 기록합니다."""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO sync_state (database_id, last_edited_time, full_synced_at, synced_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(database_id) DO UPDATE SET
+                    last_edited_time = COALESCE(excluded.last_edited_time, sync_state.last_edited_time),
+                    full_synced_at = COALESCE(excluded.full_synced_at, sync_state.full_synced_at),
+                    synced_at = excluded.synced_at
+                """,
+                (database_id, last_edited_time, now if full else None, now),
+            )
+
+    def upsert_pages(self, pages):
+        """page_record 형식의 페이지 목록을 저장합니다. 이미 있는 페이지는 새 값으로 바꿉니다."""
+        now = time.time()
+        rows = [
+            (page["page_id"], page["database_id"], page["title"], page["meeting_date"],
+             json.dumps(page["properties"], ensure_ascii=False), page["url"],
+             page["created_time"], page["last_edited_time"], now)
+            for page in pages
+        ]
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO pages ({', '.join(PAGE_COLUMNS)}) VALUES ({', '.join('?' * len(PAGE_COLUMNS))})",
+                rows,
+            )
+
+    def remove_missing(self, database_id, seen_page_ids):
+        """전체 동기화에서 받지 못한 페이지를 미러에서 지우고 지운 개수를 반환합니다."""
+        with self._lock, self._connect() as conn:
+            conn.execute("CREATE TEMP TABLE seen (page_id TEXT PRIMARY KEY)")
+            conn.executemany("INSERT OR IGNORE INTO seen VALUES (?)", [(page_id,) for page_id in seen_page_ids])
+            cursor = conn.execute(
+                "DELETE FROM pages WHERE database_id = ? AND page_id NOT IN (SELECT page_id FROM seen)",
+                (database_id,),
+            )
+            conn.execute("DROP TABLE seen")
+            return cursor.rowcount
+
+    def get_page(self, page_id):
+        """페이지 ID로 미러의 페이지를 찾습니다. 없으면 None을 반환합니다."""
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {', '.join(PAGE_COLUMNS)} FROM pages WHERE page_id = ?", (page_id,)).fetchone()
+        return self._row_to_page(row) if row else None
+
+    def list_pages(self, database_id, since=None, until=None, search=None, limit=None):
+        """
+        미러의 회의록을 회의 일시 최신순으로 반환합니다.
+        since·until은 "YYYY-MM-DD" 형식의 회의 일시 범위이고, search는 제목과 속성 값에서 찾을 문자열입니다.
+        """
+        conditions = ["database_id = ?"]
+        params = [database_id]
+        if since:
+            conditions.append("meeting_date >= ?")
+            params.append(since)
+        if until:
+            # 시각이 붙은 날짜("2024-04-10T14:00")도 그날에 포함
+            conditions.append("substr(meeting_date, 1, 10) <= ?")
+            params.append(until)
+        if search:
+            conditions.append("(title LIKE ? OR properties LIKE ?)")
+            params.extend([f"%{search}%"] * 2)
+        sql = (f"SELECT {', '.join(PAGE_COLUMNS)} FROM pages WHERE {' AND '.join(conditions)} "
+               "ORDER BY meeting_date DESC, last_edited_time DESC")
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [self._row_to_page(row) for row in rows]
+
+    def find_duplicates(self, database_id):
+        """제목과 회의 날짜가 같은 페이지 묶음 목록을 반환합니다 (각 묶음은 페이지 목록)."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT {', '.join(PAGE_COLUMNS)} FROM pages
+                WHERE database_id = ? AND (title, substr(COALESCE(meeting_date, ''), 1, 10)) IN (
+                    SELECT title, substr(COALESCE(meeting_date, ''), 1, 10) FROM pages
+                    WHERE database_id = ?
+                    GROUP BY title, substr(COALESCE(meeting_date, ''), 1, 10)
+                    HAVING COUNT(*) > 1
+                )
+                ORDER BY title, meeting_date, created_time
+                """,
+                (database_id, database_id),
+            ).fetchall()
+        groups = {}
+        for row in rows:
+            page = self._row_to_page(row)
+            groups.setdefault((page["title"], (page["meeting_date"] or "")[:10]), []).append(page)
+        return list(groups.values())
+
+    def count(self, database_id):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM pages WHERE database_id = ?", (database_id,)).fetchone()[0]
+
+_default_mirror = None
+_default_mirror_lock = threading.Lock()
+
+def get_default_mirror():
+    """기본 설정의 미러 인스턴스를 반환합니다. 파일을 열 수 없으면 None을 반환합니다."""
+    global _default_mirror
+    with _default_mirror_lock:
+        if _default_mirror is None:
+            try:
+                _default_mirror = NotionMirror()
+            except (sqlite3.Error, OSError) as e:
+                print(f"노션 미러를 열 수 없습니다: {e}")
+                return None
+        return _default_mirror
+
+def record_page(page, database_id):
+    """
+    노션에 만들거나 갱신한 페이지(pages.create·pages.update 응답)를 미러에 바로 반영합니다.
+    다음 동기화를 기다리지 않아도 목록 조회와 중복 확인에 새 회의록이 나타납니다.
+    미러에 기록하지 못해도 노션 등록에는 영향을 주지 않습니다.
+    """
+    mirror = get_default_mirror()
+    if mirror is None or not isinstance(page, dict) or not page.get("id"):
+        return
+    try:
+        mirror.upsert_pages([page_record(page, database_id)])
+    except (sqlite3.Error, KeyError, TypeError) as e:
+        print(f"노션 미러에 페이지를 기록할 수 없습니다: {e}")
+
+def find_same_meetings(database_id, title, meeting_date=None, mirror=None):
+    """미러에서 제목과 회의 날짜가 같은 페이지 목록을 반환합니다 (미러를 열 수 없으면 빈 목록)."""
+    mirror = mirror or get_default_mirror()
+    if mirror is None or not title:
+        return []
+    day = str(meeting_date or "")[:10]
+    try:
+        pages = mirror.list_pages(database_id, since=day or None, until=day or None, search=title)
+    except sqlite3.Error as e:
+        print(f"노션 미러를 조회할 수 없습니다: {e}")
+        return []
+    return [page for page in pages if page["title"] == title and (page["meeting_date"] or "")[:10] == day]
+
+def sync_notion_mirror(full=False, database_id=None, notion=None, mirror=None):
+    """
+    노션 회의록 데이터베이스를 로컬 미러로 동기화합니다.
+    처음이거나 full=True이거나 마지막 전체 동기화가 NOTION_MIRROR_FULL_SYNC_HOURS보다 오래되었으면 전체를 받고,
+    그렇지 않으면 마지막으로 받은 last_edited_time 이후에 수정된 페이지만 받습니다.
+    실패하면 None을 반환하며, 그때까지 받은 페이지는 미러에 남고 다음 동기화는 이전 기준 시각부터 다시 받습니다.
+
+    Returns:
+        dict: {"full", "fetched", "removed", "pages"} - 전체 동기화 여부, 받은 페이지 수, 지운 페이지 수, 미러의 페이지 수
+    """
+    database_id = database_id or get_database_id()
+    mirror = mirror or get_default_mirror()
+    if mirror is None:
+        return None
+    notion = notion or init_notion_client()
+    if not notion:
+        print("Notion 클라이언트를 초기화할 수 없습니다.")
+        return None
+
+    state = mirror.get_sync_state(database_id)
+    if state is None or not state["full_synced_at"] or time.time() - state["full_synced_at"] > get_full_sync_interval():
+        full = True
+    since = None if full else state["last_edited_time"]
+
+    query = {"page_size": QUERY_PAGE_SIZE, "sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}]}
+    if since:
+        # last_edited_time은 분 단위로 기록되므로 같은 시각에 수정된 페이지도 다시 받음 (덮어써도 결과는 같음)
+        query["filter"] = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": since}}
+
+    stats = {"full": full, "fetched": 0, "removed": 0, "pages": 0}
+    latest = since
+    seen = set()
+    with span("notion_sync", full=full) as sync_span:
+        try:
+            cursor = None
+            while True:
+                if cursor:
+                    query["start_cursor"] = cursor
+                response = call_with_rate_limit("notion", notion.databases.query, database_id=database_id, **query)
+                pages = [page_record(page, database_id) for page in response.get("results", [])]
+                mirror.upsert_pages(pages)
+                seen.update(page["page_id"] for page in pages)
+                stats["fetched"] += len(pages)
+                latest = max([latest or ""] + [page["last_edited_time"] or "" for page in pages]) or None
+                if not response.get("has_more"):
+                    break
+                cursor = response.get("next_cursor")
+        except Exception as e:
+            print(f"노션 미러 동기화 중 오류 발생: {e}")
+            mark_error(e)
+            return None
+
+        if full:
+            stats["removed"] += mirror.remove_missing(database_id, seen)
+        mirror.save_sync_state(database_id, latest, full=full)
+        stats["pages"] = mirror.count(database_id)
+        sync_span.set(fetched=stats["fetched"], removed=stats["removed"])
+
+    print(f"노션 미러 {'전체' if full else '증분'} 동기화 완료: 받은 페이지 {stats['fetched']}개, "
+          f"삭제 {stats['removed']}개, 미러 페이지 {stats['pages']}개")
+    return stats
+
+# 독립 실행: 동기화와 로컬 조회
+def main():
+    load_environment()
+    parser = argparse.ArgumentParser(description="노션 회의록 데이터베이스 로컬 미러")
+    parser.add_argument("--full", action="store_true", help="증분 대신 전체 동기화")
+    parser.add_argument("--offline", action="store_true", help="동기화하지 않고 미러만 조회")
+    parser.add_argument("--since", metavar="YYYY-MM-DD", help="이 날짜 이후 회의만 표시")
+    parser.add_argument("--until", metavar="YYYY-MM-DD", help="이 날짜 이전 회의만 표시")
+    parser.add_argument("--search", metavar="TEXT", help="제목이나 속성 값에 TEXT가 들어간 회의만 표시")
+    parser.add_argument("--limit", type=int, default=20, help="표시할 최대 회의 수 (기본값: 20)")
+    parser.add_argument("--duplicates", action="store_true", help="제목과 날짜가 같은 회의록 묶음 표시")
+    args = parser.parse_args()
+
+    database_id = get_database_id()
+    if not args.offline and sync_notion_mirror(full=args.full, database_id=database_id) is None:
+        raise SystemExit(1)
+
+    mirror = get_default_mirror()
+    if args.duplicates:
+        for group in mirror.find_duplicates(database_id):
+            print(f"{group[0]['title']} ({(group[0]['meeting_date'] or '날짜 없음')[:10]}): {len(group)}개")
+            for page in group:
+                print(f"  - {page['url'] or page['page_id']} (생성 {page['created_time']})")
+    else:
+        for page in mirror.list_pages(database_id, since=args.since, until=args.until,
+                                      search=args.search, limit=args.limit):
+            print(f"{(page['meeting_date'] or '날짜 없음')[:16]}  {page['title']}  {page['url'] or page['page_id']}")
+
+if __name__ == "__main__":
+    main()
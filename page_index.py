@@ -0,0 +1,132 @@
+import os
+import re
+import time
+import json
+import sqlite3
+import hashlib
+import threading
+from config import get_setting
+
+def get_index_path():
+    """인덱스 파일 경로 (환경 변수 PAGE_INDEX_PATH로 변경 가능, 사용할 때 읽음)"""
+    return get_setting("PAGE_INDEX_PATH", os.path.join(".cache", "page_index.sqlite3"))
+
+def transcript_fingerprint(meeting_text, database_id=None):
+    """
+    회의록 텍스트의 지문을 만듭니다.
+    줄바꿈 형식과 앞뒤·줄 끝 공백 차이는 무시하고, 대상 데이터베이스가 다르면 다른 지문이 됩니다.
+    """
+    normalized = "\n".join(line.rstrip() for line in meeting_text.replace("\r\n", "\n").strip().split("\n"))
+    normalized = re.sub(r"\n{3,}", "\n\n", normalized)
+    digest = hashlib.sha256()
+    digest.update((database_id or "").encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalized.encode("utf-8"))
+    return digest.hexdigest()
+
+class PageIndex:
+    """
+    회의록 지문 → 노션 페이지 ID·분석 결과를 기록하는 SQLite 인덱스입니다.
+    같은 회의록을 다시 처리할 때 페이지를 새로 만들지 않고 건너뛰거나 기존 페이지를 갱신하는 데 사용합니다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path = path or get_index_path()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    fingerprint TEXT PRIMARY KEY,
+                    page_id TEXT,
+                    analysis TEXT,
+                    source TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_page_id ON pages (page_id)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _row_to_entry(row):
+        fingerprint, page_id, analysis, source, created_at, updated_at = row
+        return {
+            "fingerprint": fingerprint,
+            "page_id": page_id,
+            "analysis": json.loads(analysis) if analysis else None,
+            "source": source,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+    def lookup(self, fingerprint):
+        """지문에 해당하는 기록을 반환합니다. 없으면 None을 반환합니다."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT fingerprint, page_id, analysis, source, created_at, updated_at FROM pages WHERE fingerprint = ?",
+                (fingerprint,),
+            ).fetchone()
+        return self._row_to_entry(row) if row else None
+
+    def record(self, fingerprint, page_id=None, analysis=None, source=None):
+        """
+        처리 결과를 기록합니다. 값이 None인 항목은 기존 값을 유지하므로,
+        분석만 성공하고 노션 등록에 실패한 경우에도 분석 결과를 남겨 재시도 시 재사용할 수 있습니다.
+        """
+        now = time.time()
+        analysis_json = json.dumps(analysis, ensure_ascii=False) if analysis is not None else None
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO pages (fingerprint, page_id, analysis, source, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(fingerprint) DO UPDATE SET
+                    page_id = COALESCE(excluded.page_id, pages.page_id),
+                    analysis = COALESCE(excluded.analysis, pages.analysis),
+                    source = COALESCE(excluded.source, pages.source),
+                    updated_at = excluded.updated_at
+                """,
+                (fingerprint, page_id, analysis_json, source, now, now),
+            )
+
+    def remove(self, fingerprint):
+        """기록을 삭제합니다 (노션에서 페이지를 지운 경우 등)."""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM pages WHERE fingerprint = ?", (fingerprint,))
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+def get_default_index():
+    """기본 설정의 인덱스 인스턴스를 반환합니다. 파일을 열 수 없으면 None을 반환합니다."""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            try:
+                _default_index = PageIndex()
+            except (sqlite3.Error, OSError) as e:
+                print(f"페이지 인덱스를 열 수 없어 중복 확인 없이 진행합니다: {e}")
+                return None
+        return _default_index
+
+def lookup_meeting(meeting_text, database_id=None):
+    """
+    기본 인덱스에서 같은 회의록의 처리 기록을 찾습니다.
+
+    Returns:
+        tuple: (인덱스, 지문, 기록) - 인덱스를 쓸 수 없거나 기록이 없으면 해당 값은 None
+    """
+    fingerprint = transcript_fingerprint(meeting_text, database_id)
+    index = get_default_index()
+    existing = index.lookup(fingerprint) if index else None
+    return index, fingerprint, existing
@@ -0,0 +1,80 @@
+import json
+
+# 닫히지 않은 괄호를 닫아줄 짝
+CLOSERS = {"{": "}", "[": "]"}
+
+# 한 번 파싱할 때 시도할 최대 절단 지점 수
+MAX_CUT_ATTEMPTS = 8
+
+def _scan(text):
+    """
+    JSON 접두부를 훑으면서 문자열 상태, 열린 괄호 스택, 잘라낼 수 있는 지점을 기록합니다.
+    절단 지점은 (위치, 해당 시점의 스택) 튜플이며 쉼표 앞이나 여는 괄호 뒤입니다.
+    """
+    stack = []
+    cut_points = []
+    in_string = False
+    escaped = False
+
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char in CLOSERS:
+            stack.append(char)
+            cut_points.append((i + 1, list(stack)))
+        elif char in "}]":
+            if stack:
+                stack.pop()
+        elif char == ",":
+            cut_points.append((i, list(stack)))
+
+    return in_string, stack, cut_points
+
+def _close(prefix, stack):
+    return prefix + "".join(CLOSERS[opener] for opener in reversed(stack))
+
+def parse_partial_json(text):
+    """
+    스트리밍 중인 불완전한 JSON 텍스트를 가능한 만큼 파싱합니다.
+    열린 문자열과 괄호를 닫아보고, 그래도 안 되면 마지막 완결된 값까지 잘라냅니다.
+    첫 '{' 앞의 코드 펜스나 설명 문구는 무시합니다.
+
+    Returns:
+        dict 또는 list: 지금까지 도착한 내용, 아직 파싱할 수 없으면 None
+    """
+    if not text:
+        return None
+
+    start = text.find("{")
+    if start == -1:
+        return None
+    text = text[start:]
+
+    # 이미 완결된 JSON이면 그대로 파싱 (뒤에 붙은 코드 펜스 등은 raw_decode로 무시)
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text)
+        return value
+    except json.JSONDecodeError:
+        pass
+
+    in_string, stack, cut_points = _scan(text)
+
+    candidates = [_close(text + ('"' if in_string else ""), stack)]
+    for position, cut_stack in reversed(cut_points[-MAX_CUT_ATTEMPTS:]):
+        candidates.append(_close(text[:position], cut_stack))
+
+    for candidate in candidates:
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+    return None
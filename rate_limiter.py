@@ -0,0 +1,216 @@
+import time
+import random
+import threading
+import tracing
+from config import get_int_setting, get_float_setting
+
+# 서비스별 요청 예산 (초당 요청 수, 순간 허용량). 환경 변수로 변경 가능
+# - Notion: 통합당 평균 초당 3회
+# - Anthropic: 분당 요청 수 기준 (기본 50 RPM)
+# - Slack 웹훅: 초당 1회
+def service_limit(service):
+    """서비스의 (초당 요청 수, 순간 허용량)을 환경 변수(.env 포함)에서 읽어 반환합니다."""
+    if service == "notion":
+        return get_float_setting("RATE_LIMIT_NOTION_PER_SEC", 3), get_int_setting("RATE_LIMIT_NOTION_BURST", 3)
+    if service == "anthropic":
+        return get_float_setting("RATE_LIMIT_ANTHROPIC_PER_MIN", 50) / 60, get_int_setting("RATE_LIMIT_ANTHROPIC_BURST", 5)
+    if service == "slack":
+        return get_float_setting("RATE_LIMIT_SLACK_PER_SEC", 1), get_int_setting("RATE_LIMIT_SLACK_BURST", 1)
+    raise KeyError(service)
+
+# 재시도 설정 (최대 재시도 횟수는 RATE_LIMIT_MAX_RETRIES로 변경 가능)
+def get_max_retries():
+    return get_int_setting("RATE_LIMIT_MAX_RETRIES", 5)
+
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+# 페이지 생성처럼 같은 요청을 두 번 보내면 결과가 중복되는 호출은
+# 서버가 요청을 처리하지 않았음이 확실한 경우(429, 연결 실패)에만 재시도
+NON_IDEMPOTENT_RETRYABLE_STATUS = {429}
+
+class TokenBucket:
+    """
+    스레드와 코루틴에서 함께 쓸 수 있는 토큰 버킷입니다.
+    reserve()는 토큰을 하나 예약하고 호출 전에 기다려야 할 시간(초)을 반환하므로,
+    동기 코드는 time.sleep, 비동기 코드는 asyncio.sleep으로 기다리면 됩니다.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self):
+        """토큰 하나를 예약하고 대기 시간을 반환합니다."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = self._updated - now
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return max(0.0, wait)
+
+    def pause(self, seconds):
+        """
+        429 응답을 받았을 때 호출합니다. seconds 동안 새 토큰을 주지 않고,
+        이미 예약된 요청들도 그만큼 뒤로 밀립니다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, now + seconds)
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(service):
+    """서비스별로 공유되는 토큰 버킷을 반환합니다."""
+    with _limiters_lock:
+        limiter = _limiters.get(service)
+        if limiter is None:
+            rate, capacity = service_limit(service)
+            limiter = TokenBucket(rate, capacity)
+            _limiters[service] = limiter
+        return limiter
+
+def acquire(service):
+    """서비스 예산에서 요청 하나를 허가받을 때까지 기다립니다."""
+    wait = get_limiter(service).reserve()
+    if wait > 0:
+        tracing.increment("throttle_seconds", wait)
+        time.sleep(wait)
+
+async def acquire_async(service):
+    """acquire의 비동기 버전입니다."""
+    import asyncio
+    wait = get_limiter(service).reserve()
+    if wait > 0:
+        tracing.increment("throttle_seconds", wait)
+    await asyncio.sleep(wait)
+
+def parse_retry_after(value):
+    """Retry-After 헤더 값(초 또는 HTTP 날짜)을 초 단위로 변환합니다."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    from email.utils import parsedate_to_datetime
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt):
+    """지터가 포함된 지수 백오프 대기 시간 (full jitter)"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+def _is_connection_error(error):
+    import httpx
+    import requests
+    return isinstance(error, (httpx.TransportError, requests.exceptions.ConnectionError, requests.exceptions.Timeout)) \
+        or type(error).__name__ in ("APIConnectionError", "APITimeoutError", "RequestTimeoutError")
+
+def _is_connect_error(error):
+    """요청을 보내기 전 연결 단계에서 실패한 오류인지 확인합니다 (서버가 요청을 받지 못함)."""
+    import httpx
+    import requests
+    from urllib3.exceptions import NewConnectionError
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError):
+        # 연결 후 응답을 읽다 끊긴 경우(Connection aborted 등)는 서버가 이미 처리했을 수 있음
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, NewConnectionError)
+    return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout))
+
+def _status_and_headers(source):
+    """
+    응답 객체나 SDK 예외에서 HTTP 상태 코드와 헤더를 꺼냅니다.
+    (anthropic: status_code/response.headers, notion_client: status/headers, requests/httpx: status_code/headers)
+    """
+    status = getattr(source, "status_code", None) or getattr(source, "status", None)
+    headers = getattr(source, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(source, "response", None), "headers", None)
+    return status, headers
+
+def _retry_plan(service, attempt, status, headers):
+    """재시도 대기 시간을 정하고, 429면 서비스 버킷 전체를 멈춥니다. 반환값은 직접 기다려야 할 시간입니다."""
+    retry_after = parse_retry_after(headers.get("retry-after")) if headers else None
+    delay = retry_after if retry_after is not None else backoff_delay(attempt)
+    print(f"{service} 요청 재시도 ({attempt + 1}/{get_max_retries()}), 상태 코드: {status}, {delay:.1f}초 후")
+    tracing.increment("retries")
+    if status == 429:
+        # 버킷을 멈추면 다음 예약이 알아서 기다리므로 따로 대기하지 않음
+        get_limiter(service).pause(delay)
+        return 0.0
+    return delay
+
+def _should_retry(source, attempt, idempotent=True):
+    if attempt >= get_max_retries():
+        return False, None, None
+    status, headers = _status_and_headers(source)
+    if status in (RETRYABLE_STATUS if idempotent else NON_IDEMPOTENT_RETRYABLE_STATUS):
+        return True, status, headers
+    if isinstance(source, Exception) and status is None \
+            and (_is_connection_error(source) if idempotent else _is_connect_error(source)):
+        return True, None, None
+    return False, status, headers
+
+def call_with_rate_limit(service, func, *args, idempotent=True, **kwargs):
+    """
+    서비스 예산 안에서 func를 호출합니다.
+    429/5xx 응답이나 연결 오류는 Retry-After를 따르거나 지수 백오프로 재시도하고,
+    재시도 횟수를 넘기면 마지막 예외(또는 응답)를 그대로 돌려줍니다.
+    idempotent=False인 호출(페이지 생성, 블록 추가, 슬랙 전송 등)은 중복 생성을 막기 위해
+    429 응답과 연결 실패에만 재시도합니다 (5xx·응답 대기 시간 초과는 서버가 이미 처리했을 수 있음).
+    """
+    attempt = 0
+    while True:
+        acquire(service)
+        tracing.increment("requests")
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            retry, status, headers = _should_retry(e, attempt, idempotent)
+            if not retry:
+                raise
+        else:
+            # requests/httpx 응답은 예외 없이 상태 코드로 실패를 알림
+            retry, status, headers = _should_retry(result, attempt, idempotent)
+            if not retry:
+                return result
+        time.sleep(_retry_plan(service, attempt, status, headers))
+        attempt += 1
+
+async def call_with_rate_limit_async(service, func, *args, idempotent=True, **kwargs):
+    """call_with_rate_limit의 비동기 버전입니다. func는 코루틴 함수여야 합니다."""
+    import asyncio
+    attempt = 0
+    while True:
+        await acquire_async(service)
+        tracing.increment("requests")
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as e:
+            retry, status, headers = _should_retry(e, attempt, idempotent)
+            if not retry:
+                raise
+        else:
+            retry, status, headers = _should_retry(result, attempt, idempotent)
+            if not retry:
+                return result
+        await asyncio.sleep(_retry_plan(service, attempt, status, headers))
+        attempt += 1
@@ -0,0 +1,226 @@
+import re
+import datetime
+from config import get_int_setting, get_float_setting
+
+# 규칙 기반 추출 설정 (환경 변수로 변경 가능, extract_meeting_fields를 호출할 때 읽음)
+# - RULE_EXTRACT_SKIP_CONFIDENCE: 이 신뢰도 이상이면 Claude를 호출하지 않고 추출 결과만 사용
+# - RULE_EXTRACT_MIN_CONFIDENCE: 이 신뢰도 이상이면 추출하지 못한 항목만 Claude에 요청 (미만이면 전체 분석)
+# - RULE_EXTRACT_MIN_SECTIONS: 신뢰도를 계산할 때 분모로 쓰는 최소 섹션 수
+#   (표시된 섹션이 이보다 적은 회의록은 그만큼 신뢰도가 낮아짐)
+# 섹션 제목(공백 제외) → 분석 항목
+SECTION_ALIASES = {
+    "회의 제목": ("회의제목", "제목", "회의명"),
+    "회의 리드": ("회의리드", "진행자", "주관자"),
+    "참석자": ("참석자", "참석자명단", "참석인원", "참석"),
+    "일자": ("일자", "날짜", "일시", "회의일시", "회의일자"),
+    "회의 목적": ("회의목적", "목적"),
+    "아젠다 사전 공유": ("아젠다사전공유", "사전공유"),
+    "회의 아젠다": ("회의아젠다", "아젠다", "안건", "주요안건", "회의안건"),
+    "주요 논의 내용": ("주요논의내용", "논의내용", "논의사항", "회의내용"),
+    "주요 결정 사항": ("주요결정사항", "결정사항", "결정내용", "결론"),
+    "후속 액션": ("후속액션", "후속조치", "액션아이템", "다음액션아이템", "할일", "todo"),
+    "회의 피드백": ("회의피드백", "피드백", "회고"),
+    "다음 회의 일정": ("다음회의일정", "다음회의", "차기회의"),
+}
+ALIAS_FIELDS = {alias: field for field, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+# 신뢰도 계산에 쓰는 항목 (피드백·다음 회의 일정처럼 회의록에 없는 경우가 많은 항목은 제외)
+# 이 중 회의록에 표시된 섹션만 신뢰도에 반영하므로, 회의 리드·회의 목적처럼 원래 없는 항목은 감점되지 않음
+CORE_FIELDS = ["회의 제목", "회의 리드", "참석자", "일자", "회의 목적",
+               "회의 아젠다", "주요 논의 내용", "주요 결정 사항", "후속 액션"]
+# 분석 결과에 항상 들어가는 항목 (claude_analyzer.ANALYSIS_FIELDS 순서)
+RESULT_FIELDS = ["회의 제목", "회의 리드", "참석자", "일자", "진행 단계", "아젠다 사전 공유", "회의 목적",
+                 "회의 아젠다", "주요 논의 내용", "주요 결정 사항", "후속 액션", "회의 피드백", "다음 회의 일정"]
+
+# "참석자: ...", "## 주요 안건", "1. 결정 사항:" 같은 섹션 제목 줄
+SECTION_LINE = re.compile(r"^\s*(?:#{1,6}\s*)?(?:\d+[.)]\s*)?(?P<name>[^:：\n]{1,20}?)\s*(?:[:：]\s*(?P<value>.*?))?\s*$")
+LIST_MARKER = re.compile(r"^\s*(?:[-*•·▪]|\d+[.)]|\[[ xX]?\])\s*")
+# 줄 끝의 "(담당자: 김팀장, 기한: 4월 15일)" 주석
+ANNOTATION = re.compile(r"\s*[(（](?P<body>[^()（）]*(?:담당|기한|마감)[^()（）]*)[)）]\s*$")
+ANNOTATION_KEYS = {"담당자": "담당자", "담당": "담당자", "기한": "기한", "마감": "기한", "마감일": "기한"}
+# "박연구원: 데모 점검" 처럼 담당자가 앞에 붙은 액션
+OWNER_PREFIX = re.compile(r"^(?P<owner>[^\s:：]{1,15})\s*[:：]\s*(?P<task>.+)$")
+DURATION = re.compile(r"\s*[(（](?P<minutes>\d+\s*분)[)）]\s*$")
+PARTICIPANT_SEPARATOR = re.compile(r"\s*[,、/·]\s*")
+
+FULL_DATE = re.compile(r"(?P<year>\d{4})\s*[-./년]\s*(?P<month>\d{1,2})\s*[-./월]\s*(?P<day>\d{1,2})")
+MONTH_DAY = re.compile(r"(?P<month>\d{1,2})\s*월\s*(?P<day>\d{1,2})\s*일")
+
+def parse_date(text, default_year=None):
+    """
+    "2024년 4월 10일", "2024.04.10", "2024-4-10" 형식의 날짜를 "YYYY-MM-DD"로 바꿉니다.
+    default_year를 주면 "4월 15일"처럼 연도가 없는 날짜도 바꾸며, 날짜가 없으면 None을 반환합니다.
+    """
+    match = FULL_DATE.search(text or "")
+    year = int(match.group("year")) if match else default_year
+    if not match:
+        match = MONTH_DAY.search(text or "")
+    if not match or year is None:
+        return None
+    try:
+        return datetime.date(year, int(match.group("month")), int(match.group("day"))).isoformat()
+    except ValueError:
+        return None
+
+def split_sections(text):
+    """
+    회의록을 {분석 항목: 내용 줄 목록}으로 나눕니다.
+    SECTION_ALIASES에 있는 제목 줄에서 새 섹션이 시작되고, 제목 줄의 콜론 뒤 값도 내용에 포함합니다.
+    첫 섹션 앞의 줄은 "" 키에 모읍니다.
+    """
+    sections = {"": []}
+    current = ""
+    for line in text.splitlines():
+        match = SECTION_LINE.match(line)
+        field = ALIAS_FIELDS.get(re.sub(r"\s+", "", match.group("name")).lower()) if match else None
+        if field and (match.group("value") is not None or line.lstrip().startswith("#")):
+            current = field
+            sections.setdefault(field, [])
+            if match.group("value"):
+                sections[field].append(match.group("value"))
+        elif line.strip():
+            sections[current].append(line.strip())
+    return sections
+
+def _strip_marker(line):
+    return LIST_MARKER.sub("", line, count=1).strip()
+
+def parse_annotation(line, default_year=None):
+    """줄 끝의 담당자·기한 주석을 떼어 (본문, {"담당자", "기한"})으로 반환합니다."""
+    match = ANNOTATION.search(line)
+    if not match:
+        return line, {}
+    annotation = {}
+    for part in re.split(r"\s*[,;]\s*", match.group("body")):
+        key, _, value = part.partition(":")
+        key = ANNOTATION_KEYS.get(key.strip())
+        if key and value.strip():
+            value = value.strip()
+            annotation[key] = (parse_date(value, default_year) or value) if key == "기한" else value
+    return line[:match.start()].strip(), annotation
+
+def _agenda_items(lines):
+    items = []
+    for line in lines:
+        title = _strip_marker(line)
+        match = DURATION.search(title)
+        items.append({"항목 제목": title[:match.start()] if match else title,
+                      "소요시간": match.group("minutes") if match else "", "관련 자료": ""})
+    return items
+
+def _decision_items(lines, year):
+    items = []
+    for line in lines:
+        title, annotation = parse_annotation(_strip_marker(line), year)
+        items.append(dict({"제목": title, "세부 내용": ""}, **annotation))
+    return items
+
+def _action_items(lines, year):
+    items = []
+    for line in lines:
+        task, annotation = parse_annotation(_strip_marker(line), year)
+        owner = OWNER_PREFIX.match(task)
+        if owner and "담당자" not in annotation:
+            task = owner.group("task")
+            annotation["담당자"] = owner.group("owner")
+        items.append(dict({"내용": task}, **annotation))
+    return items
+
+def _keyed_object(lines, keys, default_key):
+    # "좋았던 점: ..." 처럼 속성 이름이 붙은 줄은 해당 속성으로, 나머지는 default_key로 모음
+    value = {key: "" for key in keys}
+    for line in lines:
+        key, _, text = _strip_marker(line).partition(":")
+        if key.strip() in value and text.strip():
+            value[key.strip()] = text.strip()
+        else:
+            value[default_key] = " ".join(filter(None, [value[default_key], _strip_marker(line)]))
+    return value
+
+def _fallback_title(data):
+    # 첫 안건 제목과 일자로 만든 제목 (안건이 없으면 빈 문자열)
+    agenda = next((item["항목 제목"] for item in data["회의 아젠다"] or [] if item["항목 제목"]), "")
+    if not agenda:
+        return ""
+    return f"{agenda[:80]} ({data['일자']})" if data["일자"] else agenda[:100]
+
+def extract_meeting_notes(text):
+    """
+    "참석자:", "주요 안건:", "결정 사항:" 같은 표시가 있는 반구조화 회의록을 규칙으로 분석합니다.
+    API를 호출하지 않으며, 결과는 Claude 분석 결과와 같은 형식입니다.
+
+    Returns:
+        dict: {
+            "data": 추출한 항목 딕셔너리 (found에 없는 항목은 빈 문자열),
+            "found": 회의록에서 찾은 항목 목록,
+            "missing": 찾지 못한 항목 목록,
+            "confidence": 회의록에 표시된 CORE_FIELDS 섹션(최소 RULE_EXTRACT_MIN_SECTIONS개로 계산) 중 내용을 추출한 비율 (0~1),
+            "status": "complete"(Claude 생략, 제목이 있을 때만) / "partial"(빠진 항목만 요청) / "none"(전체 분석),
+        }
+    """
+    sections = split_sections(text or "")
+    preamble = sections.pop("")
+    data = {field: "" for field in RESULT_FIELDS}
+
+    # 일자는 섹션이 없어도 머리말의 날짜를 사용
+    date_text = " ".join(sections.get("일자") or preamble[:5])
+    meeting_date = parse_date(date_text)
+    year = int(meeting_date[:4]) if meeting_date else datetime.date.today().year
+    if meeting_date:
+        data["일자"] = meeting_date
+
+    def joined(field):
+        return " ".join(sections.get(field) or [])
+
+    if joined("회의 제목"):
+        data["회의 제목"] = joined("회의 제목")
+    data["회의 리드"] = joined("회의 리드")
+    data["참석자"] = ", ".join(filter(None, PARTICIPANT_SEPARATOR.split(joined("참석자"))))
+    data["회의 목적"] = joined("회의 목적")
+    if sections.get("아젠다 사전 공유"):
+        data["아젠다 사전 공유"] = list(filter(None, PARTICIPANT_SEPARATOR.split(joined("아젠다 사전 공유"))))
+    if sections.get("회의 아젠다"):
+        data["회의 아젠다"] = _agenda_items(sections["회의 아젠다"])
+    if sections.get("주요 논의 내용"):
+        data["주요 논의 내용"] = [{"아젠다 제목": "전체 논의", "논의 내용": [_strip_marker(line) for line in sections["주요 논의 내용"]]}]
+    if sections.get("주요 결정 사항"):
+        data["주요 결정 사항"] = _decision_items(sections["주요 결정 사항"], year)
+    if sections.get("후속 액션"):
+        data["후속 액션"] = _action_items(sections["후속 액션"], year)
+    if sections.get("회의 피드백"):
+        data["회의 피드백"] = _keyed_object(sections["회의 피드백"], ("좋았던 점", "개선할 점", "다음 회의 제안 사항"), "좋았던 점")
+    if sections.get("다음 회의 일정"):
+        data["다음 회의 일정"] = _keyed_object(sections["다음 회의 일정"], ("일시", "장소", "주요 아젠다"), "일시")
+
+    found = [field for field in RESULT_FIELDS if data[field]]
+    # 진행 단계는 논의·결정 내용이 있으면 회의가 끝난 것으로 봄
+    if any(field in found for field in ("주요 논의 내용", "주요 결정 사항", "후속 액션")):
+        data["진행 단계"] = "시작 후"
+        found.append("진행 단계")
+    elif "회의 아젠다" in found:
+        data["진행 단계"] = "시작 전"
+        found.append("진행 단계")
+
+    if not data["회의 제목"]:
+        # 제목 표시가 없으면 첫 줄(없으면 첫 안건과 일자)을 제목으로 쓰되, 찾은 항목으로 세지는 않음
+        data["회의 제목"] = preamble[0][:100] if preamble else _fallback_title(data)
+
+    # 섹션 제목이 있는 항목(머리말에서 찾은 날짜 포함)만 평가하고, 섹션이 적으면 RULE_EXTRACT_MIN_SECTIONS로 나눠 신뢰도를 낮춤
+    labelled = [field for field in CORE_FIELDS if field in sections or (field == "일자" and meeting_date)]
+    extracted = sum(1 for field in labelled if field in found)
+    min_sections = get_int_setting("RULE_EXTRACT_MIN_SECTIONS", 4)
+    confidence = round(extracted / max(len(labelled), min_sections, 1), 2)
+    if confidence >= get_float_setting("RULE_EXTRACT_SKIP_CONFIDENCE", 0.8):
+        # 제목을 만들지 못한 회의록은 Claude에 제목을 요청해야 하므로 complete로 보지 않음
+        status = "complete" if data["회의 제목"] else "partial"
+    elif confidence >= get_float_setting("RULE_EXTRACT_MIN_CONFIDENCE", 0.3):
+        status = "partial"
+    else:
+        status = "none"
+    return {
+        "data": data,
+        "found": [field for field in RESULT_FIELDS if field in found],
+        "missing": [field for field in RESULT_FIELDS if field not in found],
+        "confidence": confidence,
+        "status": status,
+    }
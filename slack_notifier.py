@@ -1,157 +1,446 @@
-import os
 import json
-import requests
+import atexit
+import threading
+from config import get_setting, get_int_setting, get_float_setting, load_environment
+from client_registry import get_http_session, get_async_http_client
+from rate_limiter import call_with_rate_limit, call_with_rate_limit_async
+from tracing import traced, set_attributes, increment, mark_error
 from datetime import datetime
 
-# Slack API 웹훅 URL 설정
-SLACK_WEBHOOK_URL = os.environ.get("SLACK_WEBHOOK_URL")
+# 슬랙 block-kit 제한
+SLACK_MAX_BLOCKS = 50          # 메시지당 최대 블록 수
+HEADER_TEXT_LIMIT = 150        # header 블록 텍스트 최대 글자 수
+SECTION_TEXT_LIMIT = 3000      # section 블록 텍스트 최대 글자 수
+FIELD_TEXT_LIMIT = 2000        # section 필드 텍스트 최대 글자 수
 
-def notify_slack_meeting_notes(meeting_data, notion_page_id=None):
+# 요청 타임아웃 (초): 응답 없는 연결 때문에 작업자가 무한히 기다리지 않도록 제한 (환경 변수로 변경 가능)
+def get_timeouts():
+    """(연결 타임아웃, 응답 타임아웃)을 반환합니다 (SLACK_CONNECT_TIMEOUT, SLACK_READ_TIMEOUT)."""
+    return get_float_setting("SLACK_CONNECT_TIMEOUT", 3.05), get_float_setting("SLACK_READ_TIMEOUT", 10)
+
+# 다이제스트 모드: 여러 회의록 알림을 메시지 하나로 묶어 웹훅 제한(초당 1회)을 넘지 않게 함
+# - 회의록당 블록 2개(요약 section + context)와 제목 header 1개를 사용하므로 메시지당 최대 24건
+# - SLACK_DIGEST_SIZE건이 모이거나 첫 알림 후 SLACK_DIGEST_MAX_WAIT초가 지나면 전송
+DIGEST_BLOCKS_PER_MEETING = 2
+DIGEST_MAX_MEETINGS = (SLACK_MAX_BLOCKS - 1) // DIGEST_BLOCKS_PER_MEETING
+
+# Slack API 웹훅 URL 설정 (import 시점이 아니라 사용할 때 환경 변수에서 읽음)
+def get_webhook_url():
+    """슬랙 웹훅 URL (환경 변수 SLACK_WEBHOOK_URL)을 반환합니다."""
+    return get_setting("SLACK_WEBHOOK_URL")
+
+def truncate_text(text, limit):
+    """슬랙 글자 수 제한에 맞게 텍스트를 자릅니다 (잘린 경우 말줄임표 추가)."""
+    text = str(text)
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+def build_slack_message(meeting_data, notion_page_id=None):
     """
-    노션 회의록이 생성되었을 때 슬랙으로 알림을 보냅니다.
+    회의록 데이터로 슬랙 block-kit 메시지 본문을 구성합니다.
     
     Args:
         meeting_data (dict): 회의록 데이터
         notion_page_id (str, optional): 노션 페이지 ID
     
     Returns:
-        bool: 알림 전송 성공 여부
+        dict: 웹훅으로 전송할 메시지 데이터
     """
-    if not SLACK_WEBHOOK_URL:
-        print("Slack 웹훅 URL이 설정되지 않았습니다.")
-        print("PowerShell에서 $env:SLACK_WEBHOOK_URL=\"여러분의_웹훅_URL\" 명령으로 설정해주세요.")
-        return False
+    # 회의 제목 및 일시 정보 가져오기
+    meeting_title = meeting_data.get("회의 제목", "무제 회의록")
+    meeting_date = meeting_data.get("일자", "")
+    meeting_lead = meeting_data.get("회의 리드", "")
+    participants = meeting_data.get("참석자", "")
     
-    try:
-        # 회의 제목 및 일시 정보 가져오기
-        meeting_title = meeting_data.get("회의 제목", "무제 회의록")
-        meeting_date = meeting_data.get("일자", "")
-        meeting_lead = meeting_data.get("회의 리드", "")
-        participants = meeting_data.get("참석자", "")
-        
-        # 결정 사항 및 액션 아이템 준비
-        decisions = meeting_data.get("주요 결정 사항", [])
-        action_items = meeting_data.get("후속 액션", [])
-        
-        # 슬랙 메시지 본문 구성
-        blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"📝 새 회의록: {meeting_title}",
-                    "emoji": True
-                }
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*일시:*\n{meeting_date}"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*진행자:*\n{meeting_lead}"
-                    }
-                ]
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*참석자:*\n{participants}"
-                    }
-                ]
-            },
-            {
-                "type": "divider"
+    # 결정 사항 및 액션 아이템 준비
+    decisions = meeting_data.get("주요 결정 사항", [])
+    action_items = meeting_data.get("후속 액션", [])
+    
+    # 슬랙 메시지 본문 구성
+    blocks = [
+        {
+            "type": "header",
+            "text": {
+                "type": "plain_text",
+                "text": truncate_text(f"📝 새 회의록: {meeting_title}", HEADER_TEXT_LIMIT),
+                "emoji": True
             }
-        ]
-        
-        # 결정 사항이 있을 경우 추가
-        if decisions:
-            decision_text = "*주요 결정 사항:*\n"
-            
-            if isinstance(decisions, list):
-                for i, decision in enumerate(decisions):
-                    if isinstance(decision, dict) and "제목" in decision:
-                        decision_text += f"• {decision['제목']}\n"
-                    else:
-                        decision_text += f"• {decision}\n"
-            else:
-                decision_text += f"{decisions}\n"
-                
-            blocks.append({
-                "type": "section",
-                "text": {
+        },
+        {
+            "type": "section",
+            "fields": [
+                {
                     "type": "mrkdwn",
-                    "text": decision_text
-                }
-            })
-        
-        # 액션 아이템이 있을 경우 추가
-        if action_items:
-            action_text = "*후속 액션:*\n"
-            
-            if isinstance(action_items, list):
-                for i, action in enumerate(action_items):
-                    action_text += f"• {action}\n"
-            else:
-                action_text += f"{action_items}\n"
-                
-            blocks.append({
-                "type": "section",
-                "text": {
+                    "text": truncate_text(f"*일시:*\n{meeting_date}", FIELD_TEXT_LIMIT)
+                },
+                {
                     "type": "mrkdwn",
-                    "text": action_text
+                    "text": truncate_text(f"*진행자:*\n{meeting_lead}", FIELD_TEXT_LIMIT)
                 }
-            })
-        
-        # 노션 링크가 있을 경우 추가
-        if notion_page_id:
-            notion_url = f"https://notion.so/{notion_page_id.replace('-', '')}"
-            blocks.append({
-                "type": "section",
-                "text": {
+            ]
+        },
+        {
+            "type": "section",
+            "fields": [
+                {
                     "type": "mrkdwn",
-                    "text": "자세한 내용은 노션 회의록에서 확인하세요:"
+                    "text": truncate_text(f"*참석자:*\n{participants}", FIELD_TEXT_LIMIT)
                 }
-            })
-            blocks.append({
-                "type": "section",
-                "text": {
+            ]
+        },
+        {
+            "type": "divider"
+        }
+    ]
+    
+    # 결정 사항이 있을 경우 추가
+    if decisions:
+        decision_text = "*주요 결정 사항:*\n"
+    
+        if isinstance(decisions, list):
+            for i, decision in enumerate(decisions):
+                if isinstance(decision, dict) and "제목" in decision:
+                    decision_text += f"• {decision['제목']}\n"
+                else:
+                    decision_text += f"• {decision}\n"
+        else:
+            decision_text += f"{decisions}\n"
+    
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": truncate_text(decision_text, SECTION_TEXT_LIMIT)
+            }
+        })
+    
+    # 액션 아이템이 있을 경우 추가
+    if action_items:
+        action_text = "*후속 액션:*\n"
+    
+        if isinstance(action_items, list):
+            for i, action in enumerate(action_items):
+                action_text += f"• {action}\n"
+        else:
+            action_text += f"{action_items}\n"
+    
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": truncate_text(action_text, SECTION_TEXT_LIMIT)
+            }
+        })
+    
+    # 노션 링크가 있을 경우 추가
+    if notion_page_id:
+        notion_url = f"https://notion.so/{notion_page_id.replace('-', '')}"
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": "자세한 내용은 노션 회의록에서 확인하세요:"
+            }
+        })
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"<{notion_url}|📋 노션에서 회의록 보기>"
+            }
+        })
+    
+    # 슬랙 메시지 전체 구성
+    slack_data = {
+        "blocks": blocks
+    }
+    
+    return slack_data
+
+def build_digest_message(items):
+    """
+    여러 회의록 알림을 block-kit 메시지 하나로 구성합니다.
+    
+    Args:
+        items (list): (회의록 데이터, 노션 페이지 ID) 튜플 목록 (최대 DIGEST_MAX_MEETINGS개)
+    
+    Returns:
+        dict: 웹훅으로 전송할 메시지 데이터
+    """
+    blocks = [
+        {
+            "type": "header",
+            "text": {
+                "type": "plain_text",
+                "text": f"📝 새 회의록 {len(items)}건",
+                "emoji": True
+            }
+        }
+    ]
+    
+    for meeting_data, notion_page_id in items[:DIGEST_MAX_MEETINGS]:
+        meeting_title = meeting_data.get("회의 제목") or "무제 회의록"
+        if notion_page_id:
+            title_text = f"*<https://notion.so/{notion_page_id.replace('-', '')}|{meeting_title}>*"
+        else:
+            title_text = f"*{meeting_title}*"
+        details = " · ".join(value for value in [
+            meeting_data.get("일자", ""),
+            f"진행자 {meeting_data['회의 리드']}" if meeting_data.get("회의 리드") else "",
+        ] if value)
+        
+        decisions = meeting_data.get("주요 결정 사항") or []
+        action_items = meeting_data.get("후속 액션") or []
+        decision_count = len(decisions) if isinstance(decisions, list) else 1
+        action_count = len(action_items) if isinstance(action_items, list) else 1
+        
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": truncate_text(f"{title_text}\n{details}" if details else title_text, SECTION_TEXT_LIMIT)
+            }
+        })
+        blocks.append({
+            "type": "context",
+            "elements": [
+                {
                     "type": "mrkdwn",
-                    "text": f"<{notion_url}|📋 노션에서 회의록 보기>"
+                    "text": f"결정 사항 {decision_count}건 · 후속 액션 {action_count}건"
                 }
-            })
+            ]
+        })
+    
+    # 블록을 표시할 수 없는 알림(모바일 푸시 등)에 사용되는 대체 텍스트
+    return {"text": f"새 회의록 {len(items)}건이 등록되었습니다.", "blocks": blocks}
+
+@traced("slack")
+def send_slack_message(slack_data):
+    """
+    block-kit 메시지를 웹훅으로 보냅니다.
+    공유 세션으로 연결을 재사용하고, 429(Retry-After)·5xx·연결 오류·타임아웃 재시도는 rate_limiter가 처리합니다.
+    
+    Args:
+        slack_data (dict): 전송할 메시지 데이터
+    
+    Returns:
+        bool: 전송 성공 여부
+    """
+    webhook_url = get_webhook_url()
+    if not webhook_url:
+        print("Slack 웹훅 URL이 설정되지 않았습니다.")
+        print("PowerShell에서 $env:SLACK_WEBHOOK_URL=\"여러분의_웹훅_URL\" 명령으로 설정해주세요.")
+        return False
+    
+    try:
+        payload = json.dumps(slack_data)
+        increment("payload_bytes", len(payload))
+        set_attributes(blocks=len(slack_data.get("blocks", [])))
         
-        # 슬랙 메시지 전체 구성
-        slack_data = {
-            "blocks": blocks
-        }
+        # Slack API 호출 (공유 세션으로 연결 재사용, 연결·응답 대기 시간 제한)
+        response = call_with_rate_limit(
+            "slack",
+            get_http_session().post,
+            webhook_url,
+            data=payload,
+            headers={'Content-Type': 'application/json'},
+            timeout=get_timeouts(),
+            idempotent=False
+        )
+        set_attributes(status_code=response.status_code)
         
-        # Slack API 호출
-        response = requests.post(
-            SLACK_WEBHOOK_URL,
-            data=json.dumps(slack_data),
-            headers={'Content-Type': 'application/json'}
+        if response.status_code == 200:
+            print("슬랙 알림이 성공적으로 전송되었습니다.")
+            return True
+        else:
+            print(f"슬랙 알림 전송 실패. 상태 코드: {response.status_code}, 응답: {response.text}")
+            mark_error(f"상태 코드 {response.status_code}")
+            return False
+    
+    except Exception as e:
+        print(f"슬랙 알림 전송 중 오류 발생: {e}")
+        mark_error(e)
+        return False
+
+@traced("slack")
+async def send_slack_message_async(slack_data, http_client=None):
+    """
+    send_slack_message의 비동기 버전입니다.
+    
+    Args:
+        slack_data (dict): 전송할 메시지 데이터
+        http_client (httpx.AsyncClient, optional): 사용할 비동기 HTTP 클라이언트 (기본값: 루프별 공유 클라이언트)
+    
+    Returns:
+        bool: 전송 성공 여부
+    """
+    webhook_url = get_webhook_url()
+    if not webhook_url:
+        print("Slack 웹훅 URL이 설정되지 않았습니다.")
+        return False
+    
+    try:
+        import httpx
+        connect_timeout, read_timeout = get_timeouts()
+        if http_client is None:
+            http_client = get_async_http_client()
+        increment("payload_bytes", len(json.dumps(slack_data, ensure_ascii=False).encode("utf-8")))
+        set_attributes(blocks=len(slack_data.get("blocks", [])))
+        response = await call_with_rate_limit_async(
+            "slack",
+            http_client.post,
+            webhook_url,
+            json=slack_data,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            idempotent=False
         )
+        set_attributes(status_code=response.status_code)
         
         if response.status_code == 200:
             print("슬랙 알림이 성공적으로 전송되었습니다.")
             return True
         else:
             print(f"슬랙 알림 전송 실패. 상태 코드: {response.status_code}, 응답: {response.text}")
+            mark_error(f"상태 코드 {response.status_code}")
             return False
-            
+    
     except Exception as e:
         print(f"슬랙 알림 전송 중 오류 발생: {e}")
+        mark_error(e)
         return False
 
+class SlackDigest:
+    """
+    회의록 알림을 모아 다이제스트 메시지 하나로 보냅니다.
+    size건이 모이거나 첫 알림 후 max_wait초가 지나면 전송하고, close() 시 남은 알림을 모두 보냅니다.
+    배치 처리처럼 짧은 시간에 많은 회의록이 등록될 때 웹훅 제한(초당 1회)을 넘지 않게 합니다.
+    """
+    
+    def __init__(self, size=None, max_wait=None, send=None):
+        if size is None:
+            size = get_int_setting("SLACK_DIGEST_SIZE", DIGEST_MAX_MEETINGS)
+        self.size = max(1, min(size, DIGEST_MAX_MEETINGS))
+        self.max_wait = max_wait if max_wait is not None else get_float_setting("SLACK_DIGEST_MAX_WAIT", 60)
+        self._send = send or send_slack_message
+        self._items = []
+        self._timer = None
+        self._lock = threading.Lock()
+    
+    def add(self, meeting_data, notion_page_id=None):
+        """
+        알림을 다이제스트에 추가합니다. size건이 모이면 바로 전송합니다.
+        
+        Returns:
+            bool: 추가 성공 여부 (이번 호출에서 전송했다면 전송 성공 여부)
+        """
+        with self._lock:
+            self._items.append((meeting_data, notion_page_id))
+            if len(self._items) >= self.size:
+                items = self._take()
+            else:
+                items = None
+                if self._timer is None and self.max_wait > 0:
+                    self._timer = threading.Timer(self.max_wait, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+        return self._deliver(items) if items else True
+    
+    def flush(self):
+        """모인 알림을 바로 전송합니다. 보낼 알림이 없으면 True를 반환합니다."""
+        with self._lock:
+            items = self._take()
+        return self._deliver(items) if items else True
+    
+    def close(self):
+        """남은 알림을 전송하고 타이머를 정리합니다."""
+        return self.flush()
+    
+    def pending(self):
+        """아직 전송하지 않은 알림 수"""
+        with self._lock:
+            return len(self._items)
+    
+    def _take(self):
+        items, self._items = self._items, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return items
+    
+    def _deliver(self, items):
+        print(f"슬랙 다이제스트 전송: 회의록 {len(items)}건")
+        return self._send(build_digest_message(items))
+
+# 현재 프로세스에서 사용 중인 다이제스트 (None이면 회의록마다 바로 전송)
+_digest = None
+_digest_lock = threading.Lock()
+
+def start_digest(size=None, max_wait=None):
+    """다이제스트 모드를 켭니다. 이미 켜져 있으면 기존 다이제스트를 반환합니다."""
+    global _digest
+    with _digest_lock:
+        if _digest is None:
+            _digest = SlackDigest(size, max_wait)
+            # 프로세스 종료 시 남은 알림 전송
+            atexit.register(_digest.close)
+        return _digest
+
+def stop_digest():
+    """다이제스트 모드를 끄고 남은 알림을 전송합니다."""
+    global _digest
+    with _digest_lock:
+        digest, _digest = _digest, None
+    if digest is not None:
+        atexit.unregister(digest.close)
+        digest.close()
+
+def get_active_digest():
+    """
+    사용 중인 다이제스트를 반환합니다.
+    환경 변수 SLACK_DIGEST=1이면 처음 호출할 때 다이제스트 모드를 켭니다 (작업 큐 작업자 등).
+    """
+    if _digest is None and (get_setting("SLACK_DIGEST") or "").lower() in ("1", "true", "yes"):
+        return start_digest()
+    return _digest
+
+def notify_slack_meeting_notes(meeting_data, notion_page_id=None):
+    """
+    노션 회의록이 생성되었을 때 슬랙으로 알림을 보냅니다.
+    다이제스트 모드에서는 알림을 모아 두었다가 한 번에 보냅니다.
+    
+    Args:
+        meeting_data (dict): 회의록 데이터
+        notion_page_id (str, optional): 노션 페이지 ID
+    
+    Returns:
+        bool: 알림 전송(다이제스트 모드에서는 추가) 성공 여부
+    """
+    digest = get_active_digest()
+    if digest is not None:
+        return digest.add(meeting_data, notion_page_id)
+    return send_slack_message(build_slack_message(meeting_data, notion_page_id))
+
+async def notify_slack_meeting_notes_async(meeting_data, notion_page_id=None, http_client=None):
+    """
+    notify_slack_meeting_notes의 비동기 버전입니다.
+    
+    Args:
+        meeting_data (dict): 회의록 데이터
+        notion_page_id (str, optional): 노션 페이지 ID
+        http_client (httpx.AsyncClient, optional): 사용할 비동기 HTTP 클라이언트 (기본값: 루프별 공유 클라이언트)
+    
+    Returns:
+        bool: 알림 전송(다이제스트 모드에서는 추가) 성공 여부
+    """
+    digest = get_active_digest()
+    if digest is not None:
+        # 다이제스트가 가득 차면 전송이 일어나므로 이벤트 루프를 막지 않도록 스레드에서 실행
+        import asyncio
+        return await asyncio.to_thread(digest.add, meeting_data, notion_page_id)
+    return await send_slack_message_async(build_slack_message(meeting_data, notion_page_id), http_client=http_client)
+
 # 테스트 코드
-if __name__ == "__main__":
+def main():
+    load_environment()
     # 샘플 회의 데이터로 테스트
     sample_meeting_data = {
         "회의 제목": "2024년 2분기 신제품 개발 회의",
@@ -172,4 +461,7 @@ if __name__ == "__main__":
     fake_notion_page_id = "1234abcd5678efgh9012ijkl"
     
     # 슬랙 알림 테스트
-    notify_slack_meeting_notes(sample_meeting_data, fake_notion_page_id) 
\ No newline at end of file
+    notify_slack_meeting_notes(sample_meeting_data, fake_notion_page_id)
+
+if __name__ == "__main__":
+    main()
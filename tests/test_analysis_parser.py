@@ -0,0 +1,64 @@
+import json
+
+from analysis_parser import ANALYSIS_SCHEMA, extract_analysis, parse_json_response, repair_json, validate_analysis
+
+VALID = {
+    "회의 제목": "주간 회의",
+    "회의 리드": "김팀장",
+    "참석자": "김팀장, 이대리",
+    "일자": "2024-04-10",
+    "진행 단계": "시작 후",
+    "아젠다 사전 공유": [],
+    "회의 목적": "일정 점검",
+    "회의 아젠다": [{"항목 제목": "일정"}],
+    "주요 논의 내용": [{"아젠다 제목": "일정", "논의 내용": ["출시일 확정"]}],
+    "주요 결정 사항": [{"제목": "5월 출시", "세부 내용": ""}],
+    "후속 액션": ["데모 준비"],
+    "회의 피드백": {"좋았던 점": "", "개선할 점": "", "다음 회의 제안 사항": ""},
+    "다음 회의 일정": "",
+}
+
+def test_repair_trailing_commas_and_comments():
+    text = '{"a": [1, 2,], // 주석\n "b": True, /* 설명 */ "c": None,}'
+    assert json.loads(repair_json(text)) == {"a": [1, 2], "b": True, "c": None}
+
+def test_repair_control_characters_and_quotes():
+    text = '{"a": "첫 줄\n둘째 줄", "b": "그가 "좋다"고 했다"}'
+    assert json.loads(repair_json(text)) == {"a": "첫 줄\n둘째 줄", "b": '그가 "좋다"고 했다'}
+
+def test_repair_missing_commas():
+    text = '{"a": {"c": 1}\n "b": [1] "d": [{"e": 1} {"f": 2}]}'
+    assert json.loads(repair_json(text)) == {"a": {"c": 1}, "b": [1], "d": [{"e": 1}, {"f": 2}]}
+
+def test_parse_code_fence_and_trailing_text():
+    text = f"분석 결과입니다.\n```json\n{json.dumps(VALID, ensure_ascii=False)}\n```\n궁금한 점이 있으면 알려주세요."
+    assert parse_json_response(text) == VALID
+    assert parse_json_response("JSON이 없습니다") is None
+
+def test_extract_valid_analysis():
+    meeting_data, fields = extract_analysis(json.dumps(VALID, ensure_ascii=False))
+    assert meeting_data == VALID and fields == []
+
+def test_extract_drops_invalid_fields():
+    data = dict(VALID, 일자="4월 10일")
+    del data["회의 목적"]
+    meeting_data, fields = extract_analysis(json.dumps(data, ensure_ascii=False))
+    assert fields == ["일자", "회의 목적"]
+    assert "일자" not in meeting_data and meeting_data["회의 리드"] == "김팀장"
+
+def test_extract_truncated_response_requests_last_field():
+    text = json.dumps(VALID, ensure_ascii=False)
+    cut = text.index('"후속 액션"') + len('"후속 액션": ["데모')
+    meeting_data, fields = extract_analysis(text[:cut])
+    assert meeting_data["회의 리드"] == "김팀장"
+    assert "후속 액션" in fields and "후속 액션" not in meeting_data
+    assert "회의 피드백" in fields and "다음 회의 일정" in fields
+
+def test_extract_without_object():
+    assert extract_analysis("") == (None, ANALYSIS_SCHEMA["required"])
+
+def test_validate_analysis_is_strict():
+    assert validate_analysis(json.dumps(VALID, ensure_ascii=False)) == (VALID, None, None)
+    meeting_data, reason, error = validate_analysis(json.dumps(dict(VALID, 일자="4월 10일"), ensure_ascii=False))
+    assert meeting_data is None and reason == "분석 결과 스키마 검증 실패" and "일자" in error
+    assert validate_analysis("JSON이 없습니다")[:2] == (None, "분석 결과 JSON 파싱 실패")
@@ -0,0 +1,15 @@
+from job_queue import (STATUS_FAILED, STATUS_QUEUED, claim_next_job, get_job,
+                       requeue_stale_jobs, submit_job)
+
+def test_job_that_keeps_killing_workers_fails(tmp_path, monkeypatch):
+    monkeypatch.setenv("JOB_MAX_ATTEMPTS", "2")
+    path = str(tmp_path / "queue.sqlite3")
+    job_id = submit_job("회의록", path=path)
+    for attempt in range(2):
+        assert claim_next_job("worker", path)["id"] == job_id
+        # 작업자가 죽으면 진행 기록이 멈추고 다시 대기열에 들어감
+        assert requeue_stale_jobs(stale_after=-1, path=path) == 1
+        assert get_job(job_id, path)["status"] == STATUS_QUEUED
+    assert claim_next_job("worker", path) is None
+    job = get_job(job_id, path)
+    assert job["status"] == STATUS_FAILED and job["attempts"] == 2 and "중단" in job["error"]
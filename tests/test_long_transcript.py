@@ -0,0 +1,44 @@
+from long_transcript import merge_partial_analyses, split_transcript
+
+def test_short_transcript_is_one_chunk():
+    assert split_transcript("김팀장 00:01\n안녕하세요", max_chars=100) == ["김팀장 00:01\n안녕하세요"]
+
+def test_split_at_speaker_boundaries():
+    turns = [f"화자{i} 00:{i:02d}\n" + "발화 " * 10 for i in range(6)]
+    chunks = split_transcript("\n".join(turns), max_chars=120)
+    assert all(len(chunk) <= 120 for chunk in chunks)
+    assert len(chunks) > 1
+    # 화자 헤더는 항상 조각 안에서 발화와 함께 있음
+    assert all(chunk.startswith("화자") for chunk in chunks)
+    assert "".join(chunks).count("발화") == 60
+
+def test_split_oversized_unit():
+    chunks = split_transcript("가" * 250, max_chars=100)
+    assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+
+def test_merge_partial_analyses():
+    merged = merge_partial_analyses([
+        {
+            "회의 제목": "신제품 회의", "참석자": "김팀장, 이대리", "진행 단계": "시작 전",
+            "회의 아젠다": [{"항목 제목": "일정"}],
+            "주요 논의 내용": [{"아젠다 제목": "일정", "논의 내용": ["출시일 논의"]}],
+            "주요 결정 사항": [{"제목": "5월 출시"}],
+            "다음 회의 일정": {"일시": "4월 17일", "장소": ""},
+        },
+        {
+            "회의 제목": "다른 제목", "참석자": ["이대리", "박연구원"], "진행 단계": "시작 후",
+            "회의 아젠다": [{"항목 제목": "일정"}, {"항목 제목": "예산"}],
+            "주요 논의 내용": [{"아젠다 제목": "일정", "논의 내용": ["출시일 논의", "데모 준비"]}],
+            "주요 결정 사항": [{"제목": "5월 출시"}],
+            "후속 액션": ["데모 준비"],
+            "다음 회의 일정": {"일시": "4월 18일", "장소": "본사"},
+        },
+    ])
+    assert merged["회의 제목"] == "신제품 회의"
+    assert merged["진행 단계"] == "시작 후"
+    assert merged["참석자"] == "김팀장, 이대리, 박연구원"
+    assert [item["항목 제목"] for item in merged["회의 아젠다"]] == ["일정", "예산"]
+    assert merged["주요 논의 내용"] == [{"아젠다 제목": "일정", "논의 내용": ["출시일 논의", "데모 준비"]}]
+    assert merged["주요 결정 사항"] == [{"제목": "5월 출시"}]
+    assert merged["후속 액션"] == ["데모 준비"]
+    assert merged["다음 회의 일정"] == {"일시": "4월 18일", "장소": "본사"}
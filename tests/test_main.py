@@ -0,0 +1,40 @@
+import json
+import pytest
+import main
+
+VALID = {
+    "회의 제목": "예산 회의", "회의 리드": "김팀장", "참석자": "김팀장", "일자": "2024-04-10",
+    "진행 단계": "시작 후", "아젠다 사전 공유": "", "회의 목적": "", "회의 아젠다": "",
+    "주요 논의 내용": "", "주요 결정 사항": "", "후속 액션": "", "회의 피드백": "", "다음 회의 일정": "",
+}
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    # 페이지 인덱스와 API 호출 없이 파이프라인을 실행
+    monkeypatch.setattr(main, "lookup_meeting", lambda text, database_id: (None, None, None))
+    monkeypatch.setattr(main, "add_meeting_notes_to_notion", lambda meeting_data: None)
+    return monkeypatch
+
+@pytest.mark.parametrize("analysis, reason", [
+    (None, "회의록 분석 실패"),
+    ("JSON이 아닌 응답", "분석 결과 JSON 파싱 실패"),
+    (json.dumps(dict(VALID, 일자="4월 10일"), ensure_ascii=False), "분석 결과 스키마 검증 실패"),
+    (json.dumps(VALID, ensure_ascii=False), "노션 등록 실패"),
+])
+def test_failure_reason_in_result(pipeline, analysis, reason):
+    pipeline.setattr(main, "analyze_meeting_notes_chunked", lambda text: analysis)
+    result = main.process_jsonl_record(json.dumps({"id": "a", "text": "회의록"}), 1)
+    assert result["status"] == "failed" and result["error"] == reason
+
+def test_file_report_has_failure_reason(pipeline, tmp_path):
+    pipeline.setattr(main, "analyze_meeting_notes_chunked", lambda text: None)
+    path = tmp_path / "meeting.txt"
+    path.write_text("회의록", encoding="utf-8")
+    assert main.process_meeting_file(str(path))["error"] == "회의록 분석 실패"
+
+def test_empty_text_skips_lookup(monkeypatch):
+    def no_lookup(*args):
+        raise AssertionError("빈 회의록은 인덱스를 조회하면 안 됩니다")
+    monkeypatch.setattr(main, "lookup_meeting", no_lookup)
+    result = main.process_jsonl_record(json.dumps({"text": "  "}), 3)
+    assert result["status"] == "skipped" and result["id"] == 3
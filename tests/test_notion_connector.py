@@ -0,0 +1,38 @@
+from notion_connector import RICH_TEXT_LIMIT, RICH_TEXT_MAX_ITEMS, batch_blocks, split_rich_text, text_blocks
+
+def _contents(rich_text):
+    return [item["text"]["content"] for item in rich_text]
+
+def test_short_text_is_one_item():
+    assert _contents(split_rich_text("회의 요약")) == ["회의 요약"]
+    assert _contents(split_rich_text(None)) == [""]
+
+def test_long_text_splits_at_newline():
+    line = "가" * 1500 + "\n"
+    segments = _contents(split_rich_text(line * 3))
+    # 2000자 안에서 줄바꿈 위치로 잘려 한 줄씩 들어감
+    assert segments == [line, line, line]
+    assert "".join(segments) == line * 3
+
+def test_text_without_newline_is_cut_at_limit():
+    segments = _contents(split_rich_text("a" * (RICH_TEXT_LIMIT * 2 + 10)))
+    assert [len(segment) for segment in segments] == [RICH_TEXT_LIMIT, RICH_TEXT_LIMIT, 10]
+
+def test_too_many_items_are_truncated():
+    segments = _contents(split_rich_text("a" * RICH_TEXT_LIMIT * (RICH_TEXT_MAX_ITEMS + 5)))
+    assert len(segments) == RICH_TEXT_MAX_ITEMS
+    assert segments[-1].endswith("…") and len(segments[-1]) == RICH_TEXT_LIMIT
+
+def test_text_blocks_keep_all_text():
+    text = "a" * RICH_TEXT_LIMIT * (RICH_TEXT_MAX_ITEMS + 5)
+    blocks = text_blocks("paragraph", text)
+    assert len(blocks) == 2
+    assert "".join("".join(_contents(block["paragraph"]["rich_text"])) for block in blocks) == text
+
+def test_batch_blocks():
+    blocks = list(range(250))
+    batches = batch_blocks(blocks)
+    assert [len(batch) for batch in batches] == [100, 100, 50]
+    assert sum(batches, []) == blocks
+    assert batch_blocks([]) == []
+    assert batch_blocks(blocks[:3], size=2) == [[0, 1], [2]]
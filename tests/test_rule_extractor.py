@@ -0,0 +1,107 @@
+import json
+import claude_analyzer
+from rule_extractor import extract_meeting_notes, parse_annotation, parse_date
+
+# claude_analyzer.py의 테스트용 샘플 회의록과 같은 형식
+SAMPLE_NOTES = """
+회의 제목: 2024년 2분기 신제품 개발 회의
+날짜: 2024년 4월 10일 오후 2시
+참석자: 이대표, 김팀장, 박연구원, 최디자이너
+
+주요 안건:
+1. 신제품 '알파' 프로토타입 리뷰
+2. 출시 일정 및 마케팅 전략 논의
+3. 다음 주 시연 준비 사항 점검
+
+논의 내용:
+이대표는 '알파' 프로토타입의 완성도에 만족감을 표하며, 사용자 피드백을 빠르게 반영할 것을 주문했다.
+김팀장은 현재까지의 개발 진척 상황을 보고하고, 5월 중순 출시 목표를 제시했다.
+
+결정 사항:
+1. '알파' 프로토타입 사용자 테스트 그룹 모집 시작 (담당자: 김팀장, 기한: 4월 15일)
+2. 패키징 디자인은 B안으로 최종 결정하고, 세부 수정 진행 (담당자: 최디자이너, 기한: 4월 12일)
+
+다음 액션 아이템:
+- 박연구원: 시연용 데모 안정화 및 최종 점검 (기한: 4월 17일)
+"""
+
+CLOVA_TRANSCRIPT = """신제품 회의
+2024-04-10 오후 2:00
+
+김팀장 00:03
+네 시작하겠습니다. 오늘은 알파 일정 얘기를 하죠.
+
+박연구원 00:15
+음 데모는 다음 주까지 준비됩니다.
+"""
+
+def test_sample_notes_skip_claude():
+    result = extract_meeting_notes(SAMPLE_NOTES)
+    assert result["status"] == "complete"
+    assert result["confidence"] == 1.0
+    # 회의록에 없는 항목은 신뢰도를 깎지 않고 missing으로만 표시
+    assert "회의 리드" in result["missing"] and "회의 목적" in result["missing"]
+
+def test_sample_notes_fields():
+    data = extract_meeting_notes(SAMPLE_NOTES)["data"]
+    assert data["회의 제목"] == "2024년 2분기 신제품 개발 회의"
+    assert data["일자"] == "2024-04-10"
+    assert data["참석자"] == "이대표, 김팀장, 박연구원, 최디자이너"
+    assert data["진행 단계"] == "시작 후"
+    assert [item["항목 제목"] for item in data["회의 아젠다"]][0] == "신제품 '알파' 프로토타입 리뷰"
+    assert data["주요 결정 사항"][0]["담당자"] == "김팀장"
+    assert data["주요 결정 사항"][0]["기한"] == "2024-04-15"
+    assert data["후속 액션"] == [{"내용": "시연용 데모 안정화 및 최종 점검", "기한": "2024-04-17", "담당자": "박연구원"}]
+
+def test_sample_notes_validate_without_api(monkeypatch):
+    def no_api(*args, **kwargs):
+        raise AssertionError("Claude를 호출하면 안 됩니다")
+    monkeypatch.setattr(claude_analyzer, "_request_analysis", no_api)
+    status, extracted = claude_analyzer.extract_with_rules(SAMPLE_NOTES)
+    assert status == "complete"
+    assert claude_analyzer.complete_analysis(SAMPLE_NOTES, extracted) is not None
+
+def test_few_sections_lower_confidence():
+    result = extract_meeting_notes("주간 회의\n참석자: 김팀장, 이대리\n예산 이야기를 했다")
+    assert result["status"] == "none"
+    result = extract_meeting_notes("참석자: 김팀장\n날짜: 2024-04-01\n안건:\n- 예산\n")
+    assert result["status"] == "partial"
+
+def test_partial_requests_unlabelled_title(monkeypatch):
+    requested = []
+
+    def fake_request(human_msg, fields=None, attempt=0, **attributes):
+        requested.extend(fields)
+        return {field: "" for field in fields} | {"회의 제목": "예산 회의"}
+    monkeypatch.setattr(claude_analyzer, "_request_analysis", fake_request)
+    text = "참석자: 김팀장\n날짜: 2024-04-01\n안건:\n- 예산\n"
+    status, extracted = claude_analyzer.extract_with_rules(text)
+    assert status == "partial" and "회의 제목" not in extracted
+    result = claude_analyzer.complete_analysis(text, extracted)
+    assert "회의 제목" in requested
+    assert '"회의 제목": "예산 회의"' in result
+
+def test_clova_transcript_is_not_rule_extracted():
+    assert extract_meeting_notes(CLOVA_TRANSCRIPT)["status"] == "none"
+
+def test_parse_date_and_annotation():
+    assert parse_date("2024년 4월 10일 오후 2시") == "2024-04-10"
+    assert parse_date("4월 15일") is None
+    assert parse_date("4월 15일", 2024) == "2024-04-15"
+    assert parse_annotation("데모 점검 (담당자: 박연구원, 기한: 4월 17일)", 2024) == (
+        "데모 점검", {"담당자": "박연구원", "기한": "2024-04-17"})
+
+def test_complete_without_title_skips_claude(monkeypatch):
+    def no_api(*args, **kwargs):
+        raise AssertionError("Claude를 호출하면 안 됩니다")
+    monkeypatch.setattr(claude_analyzer, "_request_analysis", no_api)
+    monkeypatch.setattr(claude_analyzer, "get_cached_analysis", no_api)
+    text = ("참석자: 김팀장, 박연구원\n날짜: 2024-04-01\n안건:\n- 예산 검토\n"
+            "결정 사항:\n- 예산 확정 (담당자: 김팀장)\n후속 조치:\n- 보고서 작성 (박연구원)\n")
+    result = json.loads(claude_analyzer.analyze_meeting_notes_with_claude(text))
+    assert result["회의 제목"] == "예산 검토 (2024-04-01)"
+
+def test_untitled_without_agenda_is_partial():
+    text = "참석자: 김팀장\n날짜: 2024-04-01\n결정 사항:\n- 예산 확정 (담당자: 김팀장)\n후속 조치:\n- 보고서 작성\n"
+    result = extract_meeting_notes(text)
+    assert result["confidence"] >= 0.8 and result["status"] == "partial"
@@ -0,0 +1,53 @@
+from transcript_preprocessor import clean_utterance, is_clova_transcript, merge_turns, parse_clova_transcript, preprocess_transcript
+
+TRANSCRIPT = """신제품 회의
+2024-04-10 오후 2:00
+
+참석자 1 00:03
+음 네 시작하겠습니다. 어 오늘은 알파 일정 얘기를 하죠.
+
+참석자 1 00:10
+그... 데모 데모 일정부터요.
+
+참석자 2 00:15
+음
+
+참석자 2 00:18
+데모는 다음 주까지 준비됩니다.
+"""
+
+def test_clean_utterance_removes_fillers():
+    assert clean_utterance("음 네 어 시작하겠습니다") == "네 시작하겠습니다"
+    assert clean_utterance("그... 데모 데모 일정부터요.") == "데모 일정부터요."
+    assert clean_utterance("음, 어... 아") == ""
+    # 단어 안의 글자는 지우지 않음
+    assert clean_utterance("음식 얘기 어제 했죠") == "음식 얘기 어제 했죠"
+
+def test_detect_clova_transcript():
+    assert is_clova_transcript(TRANSCRIPT)
+    assert not is_clova_transcript("회의 제목: 주간 회의\n날짜: 2024-04-10 14:00")
+
+def test_merge_turns_joins_same_speaker():
+    header, utterances = parse_clova_transcript(TRANSCRIPT)
+    assert header == ["신제품 회의", "2024-04-10 오후 2:00"]
+    assert len(utterances) == 4
+    turns = merge_turns(utterances, {"참석자 1": "김팀장", "참석자 2": "박연구원"})
+    assert turns == [
+        {"speaker": "김팀장", "text": "네 시작하겠습니다. 오늘은 알파 일정 얘기를 하죠. 데모 일정부터요."},
+        {"speaker": "박연구원", "text": "데모는 다음 주까지 준비됩니다."},
+    ]
+
+def test_preprocess_transcript():
+    compact, stats = preprocess_transcript(TRANSCRIPT, {"참석자 1": "김팀장"})
+    assert compact.splitlines() == [
+        "신제품 회의",
+        "2024-04-10 오후 2:00",
+        "김팀장: 네 시작하겠습니다. 오늘은 알파 일정 얘기를 하죠. 데모 일정부터요.",
+        "참석자 2: 데모는 다음 주까지 준비됩니다.",
+    ]
+    assert stats["utterances"] == 4 and stats["turns"] == 2
+    assert stats["saved_tokens"] > 0
+
+def test_plain_notes_are_unchanged():
+    text = "회의 제목: 주간 회의\n참석자: 김팀장"
+    assert preprocess_transcript(text)[0] == text
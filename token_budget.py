@@ -0,0 +1,94 @@
+import re
+import math
+from config import get_setting, get_int_setting, get_float_setting
+
+# 분석 요청의 토큰 예산 설정 (환경 변수로 변경 가능, 요청을 계획할 때 읽음)
+# - ANALYSIS_MODEL_TIERS: "모델:최대 입력 토큰"을 쉼표로 구분한 목록 (마지막 모델은 한도 없이 사용)
+#   회의록 추정 토큰 수가 한도 이하이고 예상 출력이 모델의 최대 출력에 들어가는 첫 번째 모델을 사용
+# - ANALYSIS_OUTPUT_BASE: 회의록 길이와 관계없이 필요한 출력 토큰 수 (항목 이름과 JSON 구조)
+# - ANALYSIS_OUTPUT_RATIO: 회의록 토큰 1개당 예상 출력 토큰 수
+# - ANALYSIS_OUTPUT_MARGIN: 예상 출력에 곱하는 여유 배수
+# - ANALYSIS_MIN_MAX_TOKENS: max_tokens 최솟값
+# - ANALYSIS_CONTINUATIONS: 응답이 max_tokens로 잘렸을 때 남은 항목을 이어 받는 최대 횟수
+DEFAULT_MODEL_TIERS = "claude-3-haiku-20240307:12000,claude-3-5-haiku-20241022"
+
+def get_max_continuations():
+    """잘린 응답을 이어 받는 최대 횟수 (ANALYSIS_CONTINUATIONS)"""
+    return get_int_setting("ANALYSIS_CONTINUATIONS", 2)
+
+# 모델별 최대 출력 토큰 수 (목록에 없는 모델은 DEFAULT_OUTPUT_LIMIT)
+MODEL_OUTPUT_LIMITS = {
+    "claude-3-haiku-20240307": 4096,
+    "claude-3-5-haiku-20241022": 8192,
+    "claude-3-5-sonnet-20241022": 8192,
+    "claude-3-7-sonnet-20250219": 8192,
+}
+DEFAULT_OUTPUT_LIMIT = 4096
+
+# 한글·한자·가나는 대략 글자당 1토큰, 그 밖의 문자는 4글자당 1토큰으로 추정 (공백은 앞뒤 단어에 포함)
+WIDE_CHARS = re.compile(r"[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u9fff\uac00-\ud7af\uf900-\ufaff]")
+NON_SPACE = re.compile(r"\S")
+
+def estimate_tokens(text):
+    """API를 호출하지 않고 텍스트의 토큰 수를 추정합니다 (실제보다 약간 많게 계산)."""
+    if not text:
+        return 0
+    wide = len(WIDE_CHARS.findall(text))
+    other = len(NON_SPACE.findall(text)) - wide
+    return wide + math.ceil(other / 4)
+
+def parse_model_tiers(spec):
+    """
+    "모델:최대 입력 토큰,모델" 형식의 문자열을 [(모델, 최대 입력 토큰 또는 None)] 목록으로 바꿉니다.
+
+    Raises:
+        ValueError: 모델이 하나도 없거나 토큰 한도가 숫자가 아닌 경우
+    """
+    tiers = []
+    for entry in spec.split(","):
+        model, _, limit = entry.strip().partition(":")
+        if not model:
+            continue
+        tiers.append((model, int(limit) if limit.strip() else None))
+    if not tiers:
+        raise ValueError(f"ANALYSIS_MODEL_TIERS에 모델이 없습니다: {spec!r}")
+    return tiers
+
+def get_model_tiers():
+    """ANALYSIS_MODEL_TIERS 설정을 파싱한 모델 목록을 반환합니다."""
+    return parse_model_tiers(get_setting("ANALYSIS_MODEL_TIERS", DEFAULT_MODEL_TIERS))
+
+def output_limit(model):
+    """모델의 최대 출력 토큰 수를 반환합니다."""
+    return MODEL_OUTPUT_LIMITS.get(model, DEFAULT_OUTPUT_LIMIT)
+
+def select_model(input_tokens, expected_output_tokens=0, tiers=None):
+    """입력 토큰 한도와 최대 출력 토큰에 맞는 첫 번째 모델을 반환합니다 (맞는 모델이 없으면 마지막 모델)."""
+    tiers = tiers or get_model_tiers()
+    for model, max_input in tiers:
+        if (max_input is None or input_tokens <= max_input) and expected_output_tokens <= output_limit(model):
+            return model
+    return tiers[-1][0]
+
+def plan_request(prompt, field_share=1.0, attempt=0):
+    """
+    요청 전에 프롬프트의 토큰 수를 추정하여 모델과 max_tokens를 정합니다.
+    field_share는 일부 항목만 요청할 때 전체 항목 중 요청하는 비율이고,
+    attempt는 잘린 응답을 이어 받는 횟수로 한 번 이어 받을 때마다 예상 출력을 두 배로 늘립니다.
+
+    Returns:
+        dict: {"model", "max_tokens", "input_tokens", "expected_output_tokens"}
+    """
+    input_tokens = estimate_tokens(prompt)
+    base = get_int_setting("ANALYSIS_OUTPUT_BASE", 400)
+    ratio = get_float_setting("ANALYSIS_OUTPUT_RATIO", 0.4)
+    margin = get_float_setting("ANALYSIS_OUTPUT_MARGIN", 1.3)
+    expected = (base + ratio * input_tokens) * field_share * margin * (2 ** attempt)
+    expected = math.ceil(expected)
+    model = select_model(input_tokens, expected)
+    return {
+        "model": model,
+        "max_tokens": max(get_int_setting("ANALYSIS_MIN_MAX_TOKENS", 512), min(expected, output_limit(model))),
+        "input_tokens": input_tokens,
+        "expected_output_tokens": expected,
+    }
@@ -0,0 +1,408 @@
+import os
+import json
+import time
+import functools
+import threading
+import contextlib
+import contextvars
+from collections import deque
+from config import get_setting, get_int_setting, get_flag
+
+# 추적 설정 (환경 변수로 변경 가능, 사용할 때 읽음)
+# - TRACE_PATH: 스팬을 JSON Lines로 기록할 파일 (빈 값이면 파일에 기록하지 않음)
+# - TRACE_MAX_BYTES: 파일이 이 크기를 넘으면 .1 파일로 옮기고 새로 시작
+# - TRACE_RECENT_SPANS: 화면 요약에 사용할 최근 스팬 보관 수
+# - TRACE_DISABLED: 1/true/yes면 스팬을 기록하지 않음
+def get_trace_path():
+    return get_setting("TRACE_PATH", os.path.join(".cache", "traces.jsonl"))
+
+def get_recent_spans():
+    return get_int_setting("TRACE_RECENT_SPANS", 2000)
+
+# 소요 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# 합계를 Prometheus 카운터로 내보낼 숫자 속성: 속성 이름 → (지표 이름, 추가 레이블)
+COUNTER_ATTRIBUTES = {
+    "input_tokens": ("meeting_tokens_total", {"type": "input"}),
+    "output_tokens": ("meeting_tokens_total", {"type": "output"}),
+    "cache_read_tokens": ("meeting_tokens_total", {"type": "cache_read"}),
+    "cache_write_tokens": ("meeting_tokens_total", {"type": "cache_write"}),
+    "requests": ("meeting_api_requests_total", {}),
+    "retries": ("meeting_api_retries_total", {}),
+    "throttle_seconds": ("meeting_throttle_seconds_total", {}),
+    "payload_bytes": ("meeting_payload_bytes_total", {}),
+    "saved_tokens": ("meeting_preprocess_saved_tokens_total", {}),
+}
+
+# 화면 요약에 표시할 스팬 이름
+SPAN_LABELS = {
+    "meeting": "회의록 처리 전체",
+    "job": "작업 전체",
+    "watch": "폴더 확인",
+    "app.submit": "버튼 처리",
+    "preprocess": "회의록 전처리",
+    "rule_extract": "규칙 기반 추출",
+    "analyze": "분석",
+    "claude": "Claude 호출",
+    "batch": "메시지 배치",
+    "parse": "JSON 파싱",
+    "notion": "노션 등록",
+    "notion_sync": "노션 미러 동기화",
+    "slack": "슬랙 알림",
+}
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+class Span:
+    """
+    처리 단계 하나의 소요 시간과 속성(토큰 수, 재시도 횟수, 전송 크기 등)을 기록합니다.
+    같은 최상위 스팬 아래의 스팬은 trace_id를 공유합니다.
+    """
+
+    def __init__(self, name, parent=None, attributes=None):
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.trace_id = parent.trace_id if parent else os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = dict(attributes or {})
+        self.status = "ok"
+        self.error = None
+        self.start_time = time.time()
+        self.duration = None
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def set(self, **attributes):
+        """속성을 설정합니다."""
+        with self._lock:
+            self.attributes.update(attributes)
+
+    def increment(self, key, amount=1):
+        """숫자 속성에 값을 더합니다 (분할 분석처럼 여러 스레드에서 호출해도 안전)."""
+        with self._lock:
+            self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def fail(self, message):
+        """예외 없이 실패한 경우(None 반환 등) 스팬을 실패로 표시합니다."""
+        self.status = "error"
+        self.error = str(message)[:500]
+
+    def finish(self):
+        """스팬을 종료하고 기록합니다. 여러 번 호출해도 한 번만 기록됩니다."""
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self._started
+        get_tracer().record(self)
+
+    def to_dict(self):
+        with self._lock:
+            attributes = dict(self.attributes)
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start_time, 6),
+            "duration_ms": round((self.duration or 0) * 1000, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": attributes,
+        }
+
+class _NoopSpan:
+    """추적이 꺼져 있을 때 사용하는 아무 일도 하지 않는 스팬입니다."""
+
+    def set(self, **attributes):
+        pass
+
+    def increment(self, key, amount=1):
+        pass
+
+    def fail(self, message):
+        pass
+
+    def finish(self):
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class Tracer:
+    """
+    종료된 스팬을 JSON Lines 파일로 내보내고, 최근 스팬과 Prometheus 지표용 집계를 메모리에 유지합니다.
+    """
+
+    def __init__(self, path=None, max_bytes=None, recent=None):
+        self.path = path if path is not None else get_trace_path()
+        self.max_bytes = max_bytes if max_bytes is not None else get_int_setting("TRACE_MAX_BYTES", 10 * 1024 * 1024)
+        self._recent = deque(maxlen=max(1, recent or get_recent_spans()))
+        self._durations = {}   # 스팬 이름 → [구간별 개수..., 합계, 개수]
+        self._errors = {}      # 스팬 이름 → 실패 수
+        self._counters = {}    # (지표 이름, 스팬 이름, 추가 레이블) → 합계
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+
+    def record(self, span):
+        entry = span.to_dict()
+        seconds = span.duration or 0.0
+        with self._lock:
+            self._recent.append(entry)
+            histogram = self._durations.setdefault(span.name, [0] * len(LATENCY_BUCKETS) + [0.0, 0])
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    histogram[i] += 1
+            histogram[-2] += seconds
+            histogram[-1] += 1
+            if span.status != "ok":
+                self._errors[span.name] = self._errors.get(span.name, 0) + 1
+            for key, value in entry["attributes"].items():
+                if key in COUNTER_ATTRIBUTES and isinstance(value, (int, float)):
+                    metric, labels = COUNTER_ATTRIBUTES[key]
+                    counter_key = (metric, span.name, tuple(sorted(labels.items())))
+                    self._counters[counter_key] = self._counters.get(counter_key, 0) + value
+        if self.path:
+            self._write(entry)
+
+    def _write(self, entry):
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        try:
+            with self._file_lock:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                if self.max_bytes and os.path.exists(self.path) and os.path.getsize(self.path) > self.max_bytes:
+                    os.replace(self.path, self.path + ".1")
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+        except OSError as e:
+            print(f"추적 기록을 파일에 쓰는 중 오류 발생: {e}")
+
+    def recent(self, limit=None):
+        """최근 종료된 스팬 목록 (오래된 것부터)"""
+        with self._lock:
+            spans = list(self._recent)
+        return spans[-limit:] if limit else spans
+
+    def render_prometheus(self):
+        """집계를 Prometheus 텍스트 형식으로 반환합니다."""
+        with self._lock:
+            durations = {name: list(values) for name, values in self._durations.items()}
+            errors = dict(self._errors)
+            counters = dict(self._counters)
+
+        lines = [
+            "# HELP meeting_span_duration_seconds 처리 단계별 소요 시간",
+            "# TYPE meeting_span_duration_seconds histogram",
+        ]
+        for name, histogram in sorted(durations.items()):
+            label = _escape(name)
+            for bound, count in zip(LATENCY_BUCKETS, histogram):
+                lines.append(f'meeting_span_duration_seconds_bucket{{span="{label}",le="{bound}"}} {count}')
+            lines.append(f'meeting_span_duration_seconds_bucket{{span="{label}",le="+Inf"}} {histogram[-1]}')
+            lines.append(f'meeting_span_duration_seconds_sum{{span="{label}"}} {histogram[-2]:.6f}')
+            lines.append(f'meeting_span_duration_seconds_count{{span="{label}"}} {histogram[-1]}')
+
+        lines += ["# HELP meeting_span_errors_total 실패한 처리 단계 수", "# TYPE meeting_span_errors_total counter"]
+        for name, count in sorted(errors.items()):
+            lines.append(f'meeting_span_errors_total{{span="{_escape(name)}"}} {count}')
+
+        by_metric = {}
+        for (metric, name, labels), value in counters.items():
+            by_metric.setdefault(metric, []).append((name, labels, value))
+        for metric in sorted(by_metric):
+            lines.append(f"# TYPE {metric} counter")
+            for name, labels, value in sorted(by_metric[metric]):
+                extra = "".join(f',{key}="{_escape(val)}"' for key, val in labels)
+                lines.append(f'{metric}{{span="{_escape(name)}"{extra}}} {value:g}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """메모리의 집계와 최근 스팬을 비웁니다 (파일은 그대로 둠)."""
+        with self._lock:
+            self._recent.clear()
+            self._durations.clear()
+            self._errors.clear()
+            self._counters.clear()
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+def get_tracer():
+    """기본 설정의 Tracer 인스턴스를 반환합니다."""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer()
+    return _tracer
+
+def current_span():
+    """현재 실행 중인 스팬을 반환합니다. 없으면 아무 일도 하지 않는 스팬을 반환합니다."""
+    return _current_span.get() or _NOOP_SPAN
+
+def set_attributes(**attributes):
+    """현재 스팬에 속성을 설정합니다."""
+    current_span().set(**attributes)
+
+def increment(key, amount=1):
+    """현재 스팬의 숫자 속성에 값을 더합니다 (토큰 수, 재시도 횟수 등)."""
+    current_span().increment(key, amount)
+
+def mark_error(message):
+    """현재 스팬을 실패로 표시합니다."""
+    current_span().fail(message)
+
+def start_span(name, **attributes):
+    """
+    현재 스팬의 하위 스팬을 만들되 현재 스팬으로 설정하지는 않습니다.
+    제너레이터처럼 with 문으로 감쌀 수 없는 구간에 사용하고, 끝나면 finish()를 호출합니다.
+    """
+    if get_flag("TRACE_DISABLED"):
+        return _NOOP_SPAN
+    return Span(name, _current_span.get(), attributes)
+
+@contextlib.contextmanager
+def span(name, **attributes):
+    """
+    with 문 구간을 스팬으로 기록합니다. 구간 안에서 호출하는 함수의 스팬은 이 스팬의 하위 스팬이 됩니다.
+    예외가 발생하면 실패로 기록하고 예외는 그대로 전달합니다.
+    """
+    if get_flag("TRACE_DISABLED"):
+        yield _NOOP_SPAN
+        return
+    current = Span(name, _current_span.get(), attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except Exception as e:
+        current.fail(f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current_span.reset(token)
+        current.finish()
+
+def traced(name, **attributes):
+    """함수 전체를 스팬으로 기록하는 데코레이터입니다 (코루틴 함수도 지원)."""
+
+    def decorator(func):
+        import inspect
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name, **attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+def read_spans(path=None, limit=None):
+    """
+    추적 파일에서 최근 스팬을 최대 limit개 읽습니다.
+    작업자를 별도 프로세스로 실행하는 경우 화면 요약에 사용합니다.
+    """
+    path = path if path is not None else get_trace_path()
+    limit = limit or get_recent_spans()
+    if not path or not os.path.exists(path):
+        return []
+    spans = deque(maxlen=limit)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                continue
+    return list(spans)
+
+def _percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return None
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+def summarize_spans(spans):
+    """
+    스팬 목록을 이름별로 요약합니다.
+
+    Returns:
+        dict: 스팬 이름 → {count, errors, p50_ms, p95_ms, input_tokens, output_tokens, retries}
+    """
+    grouped = {}
+    for entry in spans:
+        grouped.setdefault(entry["name"], []).append(entry)
+
+    summary = {}
+    for name, entries in grouped.items():
+        durations = [entry["duration_ms"] for entry in entries]
+        totals = {}
+        for key in ("input_tokens", "output_tokens", "retries"):
+            totals[key] = sum(entry["attributes"].get(key, 0) for entry in entries)
+        summary[name] = {
+            "count": len(entries),
+            "errors": sum(1 for entry in entries if entry["status"] != "ok"),
+            "p50_ms": _percentile(durations, 50),
+            "p95_ms": _percentile(durations, 95),
+            **totals,
+        }
+    return summary
+
+_metrics_server = None
+_metrics_server_lock = threading.Lock()
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """
+    GET /metrics 요청에 Prometheus 텍스트 형식 지표를 응답하는 HTTP 서버를 백그라운드 스레드로 시작합니다.
+    프로세스당 하나만 실행되며, 이미 실행 중이면 기존 서버를 반환합니다.
+    기본값은 같은 호스트에서만 접근할 수 있는 127.0.0.1이며, 다른 호스트의 수집기에 열려면 host를 지정합니다.
+    """
+    global _metrics_server
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = get_tracer().render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    with _metrics_server_lock:
+        if _metrics_server is None:
+            server = ThreadingHTTPServer((host, int(port)), MetricsHandler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+            _metrics_server = server
+        return _metrics_server
+
+def ensure_metrics_server():
+    """
+    환경 변수 TRACE_METRICS_PORT가 설정되어 있으면 지표 서버를 시작합니다. 실패하면 None을 반환합니다.
+    TRACE_METRICS_HOST(기본값 127.0.0.1)로 바인딩할 주소를 정하며, 0.0.0.0은 명시적으로 설정한 경우에만 사용합니다.
+    """
+    port = get_setting("TRACE_METRICS_PORT")
+    if not port:
+        return None
+    host = get_setting("TRACE_METRICS_HOST") or "127.0.0.1"
+    try:
+        return start_metrics_server(int(port), host)
+    except (OSError, ValueError) as e:
+        print(f"지표 서버를 시작할 수 없습니다 ({host}:{port}): {e}")
+        return None
@@ -0,0 +1,160 @@
+import re
+from config import get_setting
+from token_budget import estimate_tokens
+from tracing import span
+
+# 클로바 노트 화자 헤더 (예: "참석자 1 00:03", "김팀장 01:02:15")
+SPEAKER_HEADER = re.compile(r"^\s*(?P<speaker>\S[^\n]{0,30}?)\s+(?P<time>\d{1,2}:\d{2}(?::\d{2})?)\s*$")
+# 화자 헤더처럼 보이지만 회의 일시인 줄 (예: "2024-04-10 오후 2:00")
+DATE_LIKE = re.compile(r"\d{4}[-./년]|오전|오후")
+
+# 뜻 없이 들어가는 추임새 (단어 단위로만 제거)
+FILLER_WORDS = re.compile(r"(?<!\S)(?:음+|으+음*|어+|아+|에+|흠+|엄+)(?:[,.…~]+|(?=\s|$))\s*")
+# 쉼표나 말줄임표가 붙었을 때만 추임새로 보는 말 ("그, 그 부분은", "뭐... 괜찮습니다")
+HESITATIONS = re.compile(r"(?<!\S)(?:그|저|뭐|이제|그러니까|그니까|막|약간)(?:[,…~]+|\.{2,})\s*")
+# 같은 말을 연달아 반복한 더듬거림 ("네 네 네", "그 그 부분")
+REPEATED_WORD = re.compile(r"(?<!\S)([가-힣]+)(?:\s+\1)+(?=\s|$)")
+SPACES = re.compile(r"\s+")
+
+# 클로바 노트 형식으로 볼 최소 화자 헤더 수
+MIN_SPEAKER_HEADERS = 2
+
+def parse_speaker_names(spec):
+    """"참석자 1=김팀장, 참석자 2=박연구원" 형식의 문자열을 {화자 ID: 이름} 딕셔너리로 바꿉니다."""
+    names = {}
+    for entry in (spec or "").split(","):
+        speaker, _, name = entry.partition("=")
+        if speaker.strip() and name.strip():
+            names[speaker.strip()] = name.strip()
+    return names
+
+def get_speaker_names():
+    """CLOVA_SPEAKER_NAMES 환경 변수(.env 포함)에 설정한 화자 이름 매핑을 반환합니다."""
+    return parse_speaker_names(get_setting("CLOVA_SPEAKER_NAMES"))
+
+def _speaker_header(line):
+    match = SPEAKER_HEADER.match(line)
+    if match is None or DATE_LIKE.search(match.group("speaker")):
+        return None
+    return match
+
+def is_clova_transcript(text):
+    """화자 헤더가 MIN_SPEAKER_HEADERS개 이상이면 클로바 노트 형식으로 봅니다."""
+    count = 0
+    for line in text.splitlines():
+        if _speaker_header(line):
+            count += 1
+            if count >= MIN_SPEAKER_HEADERS:
+                return True
+    return False
+
+def parse_clova_transcript(text):
+    """
+    클로바 노트 회의록을 (머리말 줄 목록, 발화 목록)으로 나눕니다.
+    발화는 {"speaker", "time", "text"} 딕셔너리이며, 화자 블록 밖의 줄(안건 제목 등)은 speaker가 None인 항목입니다.
+    첫 화자 헤더 앞의 줄(회의 제목, 일시 등)은 머리말로 그대로 둡니다.
+    """
+    header = []
+    utterances = []
+    current = None
+    for line in text.splitlines():
+        match = _speaker_header(line)
+        if match:
+            current = {"speaker": match.group("speaker"), "time": match.group("time"), "lines": []}
+            utterances.append(current)
+        elif not line.strip():
+            # 빈 줄에서 발화가 끝나고, 다음 화자 헤더 전까지의 줄은 별도 항목으로 둠
+            current = None
+        elif current is not None:
+            current["lines"].append(line.strip())
+        elif utterances:
+            utterances.append({"speaker": None, "time": None, "lines": [line.strip()]})
+        else:
+            header.append(line.strip())
+    for utterance in utterances:
+        utterance["text"] = " ".join(utterance.pop("lines"))
+    return header, utterances
+
+def clean_utterance(text):
+    """발화에서 추임새와 더듬거림을 지우고 공백을 정리합니다."""
+    text = FILLER_WORDS.sub("", text)
+    text = HESITATIONS.sub("", text)
+    text = REPEATED_WORD.sub(r"\1", text)
+    return SPACES.sub(" ", text).strip()
+
+def merge_turns(utterances, speaker_names=None):
+    """
+    시각을 버리고 화자 ID를 이름으로 바꾼 뒤, 같은 화자가 연달아 말한 발화를 한 차례로 합칩니다.
+    추임새만 있던 발화는 버립니다.
+
+    Returns:
+        list: {"speaker", "text"} 딕셔너리 목록
+    """
+    speaker_names = speaker_names or {}
+    turns = []
+    for utterance in utterances:
+        speaker = utterance["speaker"]
+        if speaker is None:
+            turns.append({"speaker": None, "text": utterance["text"]})
+            continue
+        text = clean_utterance(utterance["text"])
+        if not text:
+            continue
+        speaker = speaker_names.get(speaker, speaker)
+        if turns and turns[-1]["speaker"] == speaker:
+            turns[-1]["text"] += " " + text
+        else:
+            turns.append({"speaker": speaker, "text": text})
+    return turns
+
+def render_turns(header, turns):
+    """머리말과 발화 차례를 "화자: 내용" 한 줄씩으로 이어 붙입니다."""
+    lines = [line for line in header if line]
+    for turn in turns:
+        lines.append(f"{turn['speaker']}: {turn['text']}" if turn["speaker"] else turn["text"])
+    return "\n".join(lines)
+
+def preprocess_transcript(text, speaker_names=None):
+    """
+    클로바 노트 회의록을 분석 프롬프트에 넣기 좋게 줄입니다.
+    화자 헤더와 시각을 지우고, 추임새를 빼고, 같은 화자의 연속 발화를 합치고, 화자 ID를 이름으로 바꿉니다.
+    클로바 노트 형식이 아니면 원문을 그대로 반환합니다.
+
+    Returns:
+        tuple: (전처리한 텍스트, {"utterances", "turns", "original_tokens", "compact_tokens", "saved_tokens"})
+    """
+    original_tokens = estimate_tokens(text)
+    stats = {"utterances": 0, "turns": 0, "original_tokens": original_tokens,
+             "compact_tokens": original_tokens, "saved_tokens": 0}
+    if not is_clova_transcript(text):
+        return text, stats
+
+    header, utterances = parse_clova_transcript(text)
+    turns = merge_turns(utterances, speaker_names)
+    compact = render_turns(header, turns)
+    compact_tokens = estimate_tokens(compact)
+    stats.update(
+        utterances=sum(1 for utterance in utterances if utterance["speaker"] is not None),
+        turns=sum(1 for turn in turns if turn["speaker"] is not None),
+        compact_tokens=compact_tokens,
+        saved_tokens=original_tokens - compact_tokens,
+    )
+    return compact, stats
+
+def compact_transcript(meeting_text):
+    """
+    분석 전에 회의록을 전처리하고 줄어든 토큰 수를 출력·기록합니다.
+    CLOVA_PREPROCESS를 0으로 설정하면 원문을 그대로 반환합니다.
+    """
+    if (get_setting("CLOVA_PREPROCESS") or "1").lower() in ("0", "false", "no"):
+        return meeting_text
+
+    with span("preprocess", chars=len(meeting_text)) as preprocess_span:
+        compact, stats = preprocess_transcript(meeting_text, get_speaker_names())
+        preprocess_span.set(**stats)
+    if stats["saved_tokens"] > 0:
+        percent = stats["saved_tokens"] / stats["original_tokens"] * 100
+        print(f"회의록 전처리: 발화 {stats['utterances']}개 → {stats['turns']}개, "
+              f"추정 토큰 {stats['original_tokens']:,} → {stats['compact_tokens']:,} "
+              f"({stats['saved_tokens']:,}개, {percent:.0f}% 절약)")
+    return compact